@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Benchmark for the nightly flush of the simulation information into the session database.
+
+A year of synthetic visits is collected night by night through SocsDatabase.append_data and
+SocsDatabase.append_columns and flushed with SocsDatabase.write, like the simulator does. The total
+flush time, i.e. the time the night loop waits on SocsDatabase.write, is reported for the row and
+columnar collection with the SQLite default settings and each of the bulk-load profiles, with the
+background writer and with the indexes deferred to the finalize. The total time includes the
+collection and the finalize, since the background writer moves the inserts off the night loop and
+the deferred indexes move the index maintenance to the end of the run rather than removing them.
+
+Usage: python benchmarks/bench_nightly_flush.py [number of nights] [visits per night]
+"""
+from __future__ import division, print_function
+import logging
+import numpy
+import shutil
+import sys
+import tempfile
+import time
+
+from lsst.sims.ocs.database import SocsDatabase
+from SALPY_scheduler import scheduler_observationC, scheduler_targetC
+
+def make_topics(visit_id, night):
+    target = scheduler_targetC()
+    target.targetId = visit_id
+    target.fieldId = visit_id % 5000
+    target.filter = "r"
+    target.ra = (visit_id * 0.37) % 360.0
+    target.dec = -30.0
+    target.num_exposures = 2
+    target.exposure_times[0] = 15
+    target.exposure_times[1] = 15
+    observation = scheduler_observationC()
+    observation.observationId = visit_id
+    observation.targetId = visit_id
+    observation.fieldId = target.fieldId
+    observation.night = night
+    observation.filter = target.filter
+    observation.ra = target.ra
+    observation.dec = target.dec
+    observation.num_exposures = 2
+    observation.exposure_times[0] = 15
+    observation.exposure_times[1] = 15
+    return target, observation
+
+def run(num_nights, visits_per_night, columnar, bulk_load, asynchronous, defer_indexes):
+    save_path = tempfile.mkdtemp()
+    try:
+        start_run = time.time()
+        db = SocsDatabase(sqlite_save_path=save_path, columnar=columnar, bulk_load=bulk_load,
+                          asynchronous=asynchronous, defer_indexes=defer_indexes)
+        db.create_db()
+        db.new_session("Nightly flush benchmark")
+        flush_time = 0.0
+        for night in range(1, num_nights + 1):
+            first_id = (night - 1) * visits_per_night + 1
+            visit_ids = numpy.arange(first_id, first_id + visits_per_night)
+            for visit_id in visit_ids.tolist():
+                target, observation = make_topics(visit_id, night)
+                db.append_data("target_history", target)
+                db.append_data("observation_history", observation)
+            exposures = {"exposureId": numpy.arange(2 * first_id - 1, 2 * visit_ids[-1] + 1),
+                         "exposureNum": numpy.tile([1, 2], visits_per_night),
+                         "exposureTime": numpy.full(2 * visits_per_night, 15.0)}
+            target_exposures = dict(exposures, TargetHistory_targetId=numpy.repeat(visit_ids, 2))
+            observation_exposures = dict(exposures, ObsHistory_observationId=numpy.repeat(visit_ids, 2),
+                                         exposureStartTime=exposures["exposureId"] * 17.0)
+            db.append_columns("target_exposures", target_exposures)
+            db.append_columns("observation_exposures", observation_exposures)
+            start = time.time()
+            db.write()
+            flush_time += time.time() - start
+            db.clear_data()
+        start = time.time()
+        db.finalize()
+        finalize_time = time.time() - start
+        total_time = time.time() - start_run
+    finally:
+        shutil.rmtree(save_path)
+    return flush_time, finalize_time, total_time
+
+def main(num_nights, visits_per_night):
+    logging.getLogger().setLevel(logging.WARN)
+    print("Nightly flush of {} nights with {} visits per night:".format(num_nights, visits_per_night))
+    for columnar in (False, True):
+        for bulk_load, asynchronous, defer_indexes in ((None, False, False), ("wal", False, False),
+                                                       ("off", False, False), (None, True, False),
+                                                       (None, False, True), ("off", False, True)):
+            flush_time, finalize_time, total_time = run(num_nights, visits_per_night, columnar, bulk_load,
+                                                        asynchronous, defer_indexes)
+            print("  {:8s} {:7s} {:5s} {:8s} flush: {:7.2f} s ({:6.2f} ms/night)  finalize: {:6.3f} s  "
+                  "total: {:7.2f} s".format("columnar" if columnar else "rows", bulk_load or "default",
+                                            "async" if asynchronous else "sync",
+                                            "deferred" if defer_indexes else "indexed", flush_time,
+                                            flush_time / num_nights * 1.0e3, finalize_time, total_time))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 365, int(sys.argv[2]) if len(sys.argv) > 2 else 800)
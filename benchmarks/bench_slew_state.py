@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Microbenchmark for the observatory state copies made in MainObservatory.slew.
+
+Each slew copies the observatory state before and after the move. This compares the per-slew
+cost of the previous full deep copies against the :class:`.StateSnapshot` copies and also times
+the full MainObservatory.slew call.
+
+Usage: python benchmarks/bench_slew_state.py [number of repetitions]
+
+No results are recorded yet. The benchmark needs the observatory model and SAL packages and has
+not been run against a full stack, so the speedup of the StateSnapshot copies is unmeasured.
+"""
+from __future__ import division, print_function
+import copy
+import logging
+import sys
+import timeit
+
+from lsst.sims.ocs.configuration import Observatory, ObservingSite
+from lsst.sims.ocs.observatory import MainObservatory, StateSnapshot
+from SALPY_scheduler import scheduler_targetC
+
+def make_target():
+    target = scheduler_targetC()
+    target.targetId = 1
+    target.fieldId = 300
+    target.filter = "r"
+    target.ra = 1.0
+    target.dec = -30.0
+    target.angle = 0.5
+    target.num_exposures = 2
+    target.exposure_times[0] = 15
+    target.exposure_times[1] = 15
+    return target
+
+def main(number):
+    logging.getLogger().setLevel(logging.WARN)
+    observatory = MainObservatory(ObservingSite())
+    observatory.configure(Observatory())
+    observatory.slew(make_target())
+    state = observatory.model.current_state
+
+    deepcopy_time = timeit.timeit(lambda: copy.deepcopy(state), number=number) * 2 / number
+    snapshot_time = timeit.timeit(lambda: StateSnapshot(state), number=number) * 2 / number
+    slew_time = timeit.timeit(lambda: observatory.slew(make_target()), number=number) / number
+
+    print("State copies per slew (two copies):")
+    print("  copy.deepcopy: {:8.2f} us".format(deepcopy_time * 1.0e6))
+    print("  StateSnapshot: {:8.2f} us".format(snapshot_time * 1.0e6))
+    print("  speedup:       {:8.1f} x".format(deepcopy_time / snapshot_time))
+    print("Full MainObservatory.slew: {:8.2f} us".format(slew_time * 1.0e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
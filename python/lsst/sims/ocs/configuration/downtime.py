@@ -13,6 +13,9 @@ class Downtime(pexConfig.Config):
     unscheduled_downtime_random_seed = pexConfig.Field('A placeholder for the random seed used when one is '
                                                        'requested. This is only available in the saved '
                                                        'config.', int)
+    unscheduled_downtime_vectorized = pexConfig.Field('Draw the unscheduled downtime at once from a numpy '
+                                                      'random generator instead of night by night. This '
+                                                      'gives different downtimes for the same seed.', bool)
 
     def setDefaults(self):
         """Set defaults for the downtime configuration.
@@ -20,3 +23,4 @@ class Downtime(pexConfig.Config):
         self.scheduled_downtime_db = ""
         self.unscheduled_downtime_use_random_seed = False
         self.unscheduled_downtime_random_seed = -1
+        self.unscheduled_downtime_vectorized = False
@@ -10,6 +10,8 @@ class Environment(pexConfig.Config):
                                 'internal database.', str)
     cloud_db = pexConfig.Field('Alternate database file for the seeing. Must have same format as '
                                'internal database.', str)
+    cloud_map_file = pexConfig.Field('Cloud map file for spatially resolved cloud. Replaces the cloud '
+                                     'database when set.', str)
     telescope_seeing = pexConfig.Field('Design value of the telescope contribution to the seeing '
                                        '(units=arcseconds).', float)
     optical_design_seeing = pexConfig.Field('Design value of the optical path contribution to the seeing '
@@ -19,14 +21,37 @@ class Environment(pexConfig.Config):
     scale_to_eff = pexConfig.Field('Scale factor to convert seeing to effective.', float)
     geom_eff_factor = pexConfig.Field('Scale factor to convert geometric seeing to effective seeing.',
                                       float)
+    airmass_correction_step = pexConfig.Field('Airmass grid step for the seeing airmass correction lookup '
+                                              'table. Zero calculates the correction for each visit.',
+                                              float)
+    synthetic_weather = pexConfig.Field('Replace the cloud and seeing information with series synthesized '
+                                        'from their statistics, so long surveys do not repeat the weather.',
+                                        bool)
+    stream_window = pexConfig.Field('Window (units=days) of cloud and seeing information kept in memory '
+                                    'when streaming it from the database, CSV or numpy file. Zero loads all '
+                                    'of the information.', float)
+    weather_random_seed = pexConfig.Field('Seed for the synthetic weather. The cloud uses the seed and the '
+                                          'seeing uses the seed plus one.', int)
 
     def setDefaults(self):
         """Set defaults for the seeing and cloud model configurations.
         """
         self.seeing_db = ""
         self.cloud_db = ""
+        self.cloud_map_file = ""
         self.telescope_seeing = 0.25
         self.optical_design_seeing = 0.08
         self.camera_seeing = 0.3
         self.scale_to_eff = 1.16
         self.geom_eff_factor = 1.04
+        self.airmass_correction_step = 0.0
+        self.stream_window = 0.0
+        self.synthetic_weather = False
+        self.weather_random_seed = 1516231120
+
+    def validate(self):
+        """Validate configuration parameters.
+        """
+        pexConfig.Config.validate(self)
+        if self.synthetic_weather and self.cloud_map_file != "":
+            raise ValueError("Synthetic weather is not available with a cloud map file.")
@@ -11,6 +11,8 @@ class ObservatoryVariation(pexConfig.Config):
                                        'the life of the survey.', float)
     dome_change = pexConfig.Field('Change (units=percent) in the dome kinematic parameters over the life of '
                                   'the survey.', float)
+    tolerance = pexConfig.Field('Change (units=percent) in the kinematic parameters since the last '
+                                'reconfiguration needed before the observatory model is reconfigured.', float)
 
     def setDefaults(self):
         """Defaults for the observatory variational model configuration.
@@ -18,3 +20,4 @@ class ObservatoryVariation(pexConfig.Config):
         self.apply_variation = False
         self.telescope_change = 0.0
         self.dome_change = 0.0
+        self.tolerance = 0.0
@@ -2,4 +2,7 @@
 Module for classes that handle the interaction with the simulation database.
 """
 from .tables import *
+from .columnar_writer import *
+from .database_writer import *
+from .table_buffer import *
 from .socs_db import *
@@ -0,0 +1,280 @@
+from builtins import object
+from builtins import str
+from builtins import zip
+import collections
+import json
+import logging
+import numpy
+import os
+from sqlalchemy import create_engine, DateTime, Float, Integer, MetaData, select, String
+
+from lsst.sims.ocs.setup import LoggingLevel
+
+__all__ = ["ColumnarWriter", "read_columnar_table"]
+
+INDEX_FILE = "_index.json"
+"""The name of the table index file."""
+
+def read_columnar_table(directory, table_name, columns=None, nights=None):
+    """Read a table from the columnar output.
+
+    The columns are memory-mapped, so only the information used is read from disk. String columns
+    are returned as UTF-8 encoded bytes arrays.
+
+    Parameters
+    ----------
+    directory : str
+        The columnar output directory.
+    table_name : str
+        The name of the table, e.g. ObsHistory.
+    columns : list[str], optional
+        The names of the columns to read. Default is all of the columns.
+    nights : tuple(int, int), optional
+        The first and last night of the row groups to read. Only the row groups with a night within
+        the range are read. Default is all of the row groups.
+
+    Returns
+    -------
+    collections.OrderedDict(str : numpy.ndarray)
+        The column names and values.
+    """
+    table_dir = os.path.join(directory, table_name)
+    with open(os.path.join(table_dir, INDEX_FILE)) as ifile:
+        index = json.load(ifile)
+
+    start = 0
+    stop = index["num_rows"]
+    if nights is not None:
+        row_groups = [group for group in index["row_groups"]
+                      if group["night"] is not None and nights[0] <= group["night"] <= nights[1]]
+        if row_groups:
+            start = row_groups[0]["start"]
+            stop = row_groups[-1]["start"] + row_groups[-1]["length"]
+        else:
+            stop = start
+
+    dtypes = collections.OrderedDict((column["name"], column["dtype"]) for column in index["columns"])
+    output = collections.OrderedDict()
+    for name in (columns if columns is not None else list(dtypes.keys())):
+        if index["num_rows"]:
+            values = numpy.memmap(os.path.join(table_dir, "{}.bin".format(name)), dtype=dtypes[name],
+                                  mode="r", shape=(index["num_rows"],))
+        else:
+            values = numpy.zeros(0, dtype=dtypes[name])
+        output[name] = values[start:stop]
+    return output
+
+class ColumnarWriter(object):
+    """Write the simulation tables in a columnar format.
+
+    Each table is a directory in the output directory named after the table. Every column is a file
+    of little-endian binary values (<column>.bin) that can be memory-mapped, and an index file holds
+    the column types and the row groups. Each write adds a row group, so the simulation output has a
+    row group for every night. The column names and types come from the SQLAlchemy tables, so they
+    are the same as the session database. Integers are stored as int64, floats as float64 and
+    strings as UTF-8 bytes with the length of the SQL column.
+
+    Attributes
+    ----------
+    directory : str
+        The columnar output directory.
+    indexes : dict(str : dict)
+        The index information of each table written.
+    changed : set(str)
+        The names of the tables with row groups not yet in their index files.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    DATETIME_LENGTH = 26
+    """The string length for date and time columns (ISO format with microseconds)."""
+    FORMAT_VERSION = 1
+    """The version of the columnar output format."""
+
+    def __init__(self, directory):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        directory : str
+            The columnar output directory.
+        """
+        self.directory = directory
+        self.indexes = {}
+        self.changed = set()
+        self.log = logging.getLogger("database.ColumnarWriter")
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    @classmethod
+    def column_dtype(cls, column):
+        """Get the numpy type for a SQL column.
+
+        Parameters
+        ----------
+        column : sqlalchemy.Column
+            The SQL column.
+
+        Returns
+        -------
+        str
+
+        Raises
+        ------
+        TypeError
+            If the SQL column type has no columnar type.
+        """
+        if isinstance(column.type, Integer):
+            dtype = "<i8"
+        elif isinstance(column.type, Float):
+            dtype = "<f8"
+        elif isinstance(column.type, DateTime):
+            dtype = "S{}".format(cls.DATETIME_LENGTH)
+        elif isinstance(column.type, String):
+            dtype = "S{}".format(column.type.length)
+        else:
+            raise TypeError("No columnar type for {} column {}.".format(column.type, column.name))
+        return dtype
+
+    @classmethod
+    def convert(cls, db_file, directory):
+        """Convert a session database into the columnar format.
+
+        The tables with a night column get a row group for every night, like the simulation output.
+
+        Parameters
+        ----------
+        db_file : str
+            The full path to the session database.
+        directory : str
+            The columnar output directory.
+
+        Returns
+        -------
+        :class:`.ColumnarWriter`
+            The instance that wrote the tables.
+        """
+        writer = cls(directory)
+        engine = create_engine("sqlite:///{}".format(db_file))
+        metadata = MetaData()
+        metadata.reflect(engine)
+        with engine.connect() as conn:
+            for table in metadata.sorted_tables:
+                rows = conn.execute(select([table])).fetchall()
+                names = [column.name for column in table.c]
+                values = list(zip(*rows)) if rows else [()] * len(names)
+                columns = collections.OrderedDict(zip(names, values))
+                if "night" in columns and rows:
+                    nights = numpy.array(columns["night"])
+                    bounds = [0] + (numpy.flatnonzero(numpy.diff(nights)) + 1).tolist() + [len(rows)]
+                else:
+                    bounds = [0, len(rows)]
+                for start, stop in zip(bounds[:-1], bounds[1:]):
+                    writer.write_table(table, collections.OrderedDict((name, value[start:stop])
+                                                                      for name, value in columns.items()))
+                writer.log.log(LoggingLevel.EXTENSIVE.value,
+                               "Converted {} rows of {}.".format(len(rows), table.name))
+        writer.flush()
+        return writer
+
+    def finalize(self):
+        """Write the index files and report the tables written.
+        """
+        self.flush()
+        for table_name, index in sorted(self.indexes.items()):
+            self.log.info("Columnar table {}: {} rows in {} row groups.".format(table_name,
+                                                                                index["num_rows"],
+                                                                                len(index["row_groups"])))
+
+    def flush(self):
+        """Write the index files of the tables with new row groups.
+
+        The column files are appended by each write, but a reader only uses the rows listed in the
+        index file, so the tables are consistent up to the last flush.
+        """
+        for table_name in sorted(self.changed):
+            index_file = os.path.join(self.directory, table_name, INDEX_FILE)
+            with open(index_file + ".tmp", "w") as ofile:
+                json.dump(self.indexes[table_name], ofile, indent=1)
+            os.rename(index_file + ".tmp", index_file)
+        self.changed.clear()
+
+    def to_array(self, values, dtype, name):
+        """Make an array of a column type from column values.
+
+        Strings longer than the column length are truncated, like a VARCHAR in most databases. A
+        missing string is stored as empty.
+
+        Parameters
+        ----------
+        values : list or numpy.ndarray
+            The column values.
+        dtype : str
+            The numpy type of the column.
+        name : str
+            The column name for messages.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        kind = numpy.dtype(dtype).kind
+        if kind == "S":
+            length = numpy.dtype(dtype).itemsize
+            encoded = []
+            for value in values:
+                if value is None:
+                    value = b""
+                elif not isinstance(value, bytes):
+                    value = str(value).encode("utf-8")
+                if len(value) > length:
+                    self.log.warning("Truncating {} value to {} bytes.".format(name, length))
+                    value = value[:length]
+                encoded.append(value)
+            return numpy.array(encoded, dtype=dtype)
+        else:
+            return numpy.asarray(values).astype(dtype)
+
+    def write_table(self, table, columns):
+        """Add a row group to a table.
+
+        The first write of a table in this instance replaces any files of the table already in the
+        output directory. The index file is updated by :meth:`flush`.
+
+        Parameters
+        ----------
+        table : sqlalchemy.Table
+            The SQL table for the column types.
+        columns : dict(str : list or numpy.ndarray)
+            The column names and values. Must have the same columns for every row group of the table.
+        """
+        table_dir = os.path.join(self.directory, table.name)
+        try:
+            index = self.indexes[table.name]
+        except KeyError:
+            if not os.path.exists(table_dir):
+                os.makedirs(table_dir)
+            index = {"version": self.FORMAT_VERSION, "table": table.name, "num_rows": 0, "row_groups": [],
+                     "columns": [{"name": name, "dtype": self.column_dtype(table.c[name])}
+                                 for name in columns]}
+            # A table left by an earlier run in the same directory is replaced.
+            index_file = os.path.join(table_dir, INDEX_FILE)
+            if os.path.exists(index_file):
+                os.remove(index_file)
+            for column in index["columns"]:
+                open(os.path.join(table_dir, "{}.bin".format(column["name"])), "wb").close()
+            self.indexes[table.name] = index
+            self.changed.add(table.name)
+
+        length = len(next(iter(columns.values()))) if columns else 0
+        if not length:
+            return
+        for column in index["columns"]:
+            values = self.to_array(columns[column["name"]], column["dtype"], column["name"])
+            with open(os.path.join(table_dir, "{}.bin".format(column["name"])), "ab") as ofile:
+                ofile.write(values.tobytes())
+
+        night = int(columns["night"][0]) if "night" in columns else None
+        index["row_groups"].append({"start": index["num_rows"], "length": length, "night": night})
+        index["num_rows"] += length
+        self.changed.add(table.name)
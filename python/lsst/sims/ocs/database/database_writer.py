@@ -0,0 +1,155 @@
+from builtins import object
+import logging
+import queue
+import threading
+
+from lsst.sims.ocs.setup import LoggingLevel
+
+__all__ = ["DatabaseWriter"]
+
+class DatabaseWriter(object):
+    """Run database writes on a background thread.
+
+    The writes are handed to a dedicated thread through a bounded queue, so the caller only waits
+    when the thread is more than the queue size behind. The thread owns the database connection, so
+    every write, including closing the connection, must go through this class. An error from a write
+    is kept and raised by the next call to :meth:`submit` or :meth:`stop`.
+
+    Attributes
+    ----------
+    queue_size : int
+        The maximum number of writes waiting for the thread.
+    writes_done : int
+        Counter for the number of writes run by the thread.
+    error : Exception or None
+        The first error from a write that is not yet raised.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    def __init__(self, queue_size=2):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        queue_size : int, optional
+            The maximum number of writes waiting for the thread.
+        """
+        self.queue_size = queue_size
+        self.writes_done = 0
+        self.error = None
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.lock = threading.Lock()
+        self.log = logging.getLogger("database.DatabaseWriter")
+
+    def _put(self, func, *args):
+        """Hand a write to the writer thread without checking for previous errors.
+
+        Parameters
+        ----------
+        func : callable
+            The function doing the write.
+        args
+            The arguments for the function.
+        """
+        self.start()
+        self.queue.put((func, args))
+
+    def _run(self):
+        """Run the writes from the queue until the stop marker.
+        """
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+                func, args = item
+                try:
+                    func(*args)
+                    self.writes_done += 1
+                except Exception as err:
+                    self.log.error("Background database write failed: {}".format(err))
+                    with self.lock:
+                        if self.error is None:
+                            self.error = err
+            finally:
+                self.queue.task_done()
+
+    def check_error(self):
+        """Raise the error from a previous write if there is one.
+
+        Raises
+        ------
+        Exception
+            The error from the failed write.
+        """
+        with self.lock:
+            error = self.error
+            self.error = None
+        if error is not None:
+            raise error
+
+    def drain(self):
+        """Wait for all of the submitted writes to finish.
+
+        Raises
+        ------
+        Exception
+            The error from a failed write.
+        """
+        self.queue.join()
+        self.check_error()
+
+    def start(self):
+        """Start the writer thread if it is not running.
+        """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="DatabaseWriter")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def stop(self, func=None, *args):
+        """Drain the writes and stop the writer thread.
+
+        Parameters
+        ----------
+        func : callable, optional
+            A last function to run on the writer thread, e.g. to close the database connection.
+        args
+            The arguments for the last function.
+
+        Raises
+        ------
+        Exception
+            The error from a failed write.
+        """
+        if func is not None:
+            self._put(func, *args)
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+            self.log.log(LoggingLevel.EXTENSIVE.value,
+                         "Database writer stopped after {} writes.".format(self.writes_done))
+        self.check_error()
+
+    def submit(self, func, *args):
+        """Hand a write to the writer thread.
+
+        The call waits if the queue is full.
+
+        Parameters
+        ----------
+        func : callable
+            The function doing the write.
+        args
+            The arguments for the function.
+
+        Raises
+        ------
+        Exception
+            The error from a previous failed write.
+        """
+        self.check_error()
+        self._put(func, *args)
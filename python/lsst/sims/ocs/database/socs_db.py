@@ -5,10 +5,15 @@ from datetime import datetime
 import logging
 import numpy
 import os
-from sqlalchemy import create_engine, desc, exc, MetaData
+import sqlite3
+import time
+from sqlalchemy import create_engine, desc, exc, inspect, MetaData
 
 from lsst.sims.ocs.setup import LoggingLevel
 from . import tables
+from .columnar_writer import ColumnarWriter
+from .database_writer import DatabaseWriter
+from .table_buffer import TableBuffer
 from lsst.sims.ocs.utilities import expand_path, get_hostname, get_user, get_version
 from lsst.sims.ocs.utilities.socs_exceptions import SocsDatabaseError
 
@@ -39,9 +44,42 @@ class SocsDatabase(object):
         The instance for holding the session specific tables. SQLite only.
     session_start : int
         A new starting session Id for counting new simulations.
+    columnar : bool
+        Flag for collecting the information in columnar buffers that are written with the sqlite3
+        module instead of SQLAlchemy.
+    buffers : collections.OrderedDict(str : :class:`.TableBuffer`)
+        The columnar buffers for each table.
+    pragmas : collections.OrderedDict(str : str or int)
+        The SQLite pragma settings for the session database connection.
+    session_conn : sqlalchemy.engine.Connection
+        The persistent connection to the session database.
+    writer : :class:`.DatabaseWriter` or None
+        The background writer that owns the session database connection. None if the writes are
+        synchronous.
+    output_writers : list
+        Extra outputs that get all of the information written into the session database, e.g.
+        :class:`.ColumnarWriter`. An output writer has write_table(table, columns), flush() and
+        finalize() methods.
+    defer_indexes : bool
+        Flag for creating the session database tables without their non-unique indexes. The indexes
+        are built in one pass by :meth:`finalize`.
     """
 
-    def __init__(self, sqlite_save_path=None, session_id_start=None, sqlite_session_save_path=None):
+    SESSION_COLUMN = "Session_sessionId"
+    """The name of the session Id column."""
+    BULK_LOAD_PROFILES = {
+        "wal": collections.OrderedDict([("journal_mode", "WAL"), ("synchronous", "NORMAL"),
+                                        ("cache_size", -65536), ("temp_store", "MEMORY")]),
+        "off": collections.OrderedDict([("journal_mode", "OFF"), ("synchronous", "OFF"),
+                                        ("cache_size", -65536), ("temp_store", "MEMORY")])
+    }
+    """The SQLite pragma settings for the bulk-load profiles. A negative cache size is in KiB."""
+    SAFE_PRAGMAS = collections.OrderedDict([("journal_mode", "DELETE"), ("synchronous", "FULL")])
+    """The SQLite pragma settings restored when the session database is finalized."""
+
+    def __init__(self, sqlite_save_path=None, session_id_start=None, sqlite_session_save_path=None,
+                 columnar=False, bulk_load=None, asynchronous=False, columnar_output=False,
+                 defer_indexes=False):
         """Initialize the class.
 
         Parameters
@@ -50,6 +88,25 @@ class SocsDatabase(object):
             A path to save all resulting database files for SQLite.
         session_id_start : int
             A new starting session Id for counting new simulations.
+        sqlite_session_save_path : str, optional
+            A path to save the SQLite session tracking database.
+        columnar : bool, optional
+            Flag for collecting the information in columnar buffers that are written with the sqlite3
+            module. The database contents are the same as the default SQLAlchemy path.
+        bulk_load : str or dict, optional
+            The name of a bulk-load profile (see BULK_LOAD_PROFILES) or a dictionary of SQLite pragma
+            settings for the session database connection. Default is the SQLite settings. The off
+            profile turns off the rollback journal, so a failed write may leave part of its
+            information in the database.
+        asynchronous : bool, optional
+            Flag for running the session database writes on a background thread. Write errors are
+            raised by the next write or by :meth:`finalize`.
+        columnar_output : bool, optional
+            Flag for also writing the session information in the columnar format (see
+            :class:`.ColumnarWriter`) into a directory next to the session database.
+        defer_indexes : bool, optional
+            Flag for building the non-unique indexes of the session database at :meth:`finalize`
+            instead of maintaining them on every write.
         """
         self.log = logging.getLogger("database.SocsDatabase")
         self.db_dialect = "sqlite"
@@ -70,12 +127,50 @@ class SocsDatabase(object):
 
         # Parameter for holding data lists
         self.data_list = collections.defaultdict(list)
+        # Parameter for holding column data
+        self.data_columns = collections.defaultdict(list)
+        # Parameters for the columnar buffers
+        self.columnar = columnar
+        self.buffers = collections.OrderedDict()
+        self.row_functions = {}
+        self.insert_statements = {}
+        # Parameters for the session database connection
+        if bulk_load is None:
+            self.pragmas = collections.OrderedDict()
+        elif isinstance(bulk_load, dict):
+            self.pragmas = collections.OrderedDict(bulk_load)
+        else:
+            self.pragmas = self.BULK_LOAD_PROFILES[bulk_load]
+        self.session_conn = None
+        self.writer = DatabaseWriter() if asynchronous else None
+        # Parameters for the extra outputs
+        self.columnar_output = columnar_output
+        self.output_writers = []
+        self.defer_indexes = defer_indexes
 
     @property
     def data_empty(self):
         """bool: Is internal data list empty
         """
-        return len(self.data_list) == 0
+        return len(self.data_list) == 0 and len(self.data_columns) == 0 and len(self.buffers) == 0
+
+    def _create_session_schema(self):
+        """Create the tables of the session database.
+
+        With deferred indexes only the unique indexes are created with the tables, since they enforce
+        constraints. The other indexes are taken off the tables for the creation, so the views and
+        the rest of the schema are created as usual.
+        """
+        deferred = {}
+        if self.defer_indexes:
+            for table in self.session_metadata.sorted_tables:
+                deferred[table] = set(index for index in table.indexes if not index.unique)
+                table.indexes.difference_update(deferred[table])
+        try:
+            self.session_metadata.create_all(self.session_engine)
+        finally:
+            for table, indexes in deferred.items():
+                table.indexes.update(indexes)
 
     def _create_tables(self, metadata=None, use_autoincrement=True, session_id_start=2000):
         """Create all the relevant tables.
@@ -99,6 +194,7 @@ class SocsDatabase(object):
         self.slew_initial_state = tables.create_slew_initial_state(metadata)
         self.slew_final_state = tables.create_slew_final_state(metadata)
         self.slew_activities = tables.create_slew_activities(metadata)
+        self.slew_activity_statistics = tables.create_slew_activity_statistics(metadata)
         self.slew_maxspeeds = tables.create_slew_maxspeeds(metadata)
         self.target_exposures = tables.create_target_exposures(metadata)
         self.observation_exposures = tables.create_observation_exposures(metadata)
@@ -134,6 +230,85 @@ class SocsDatabase(object):
             sqlite_db = os.path.join(save_path, sqlite_db)
         return create_engine("sqlite:///{}".format(sqlite_db))
 
+    def _create_buffer(self, table_name, table_data):
+        """Create the columnar buffer for a table from its first row.
+
+        The column names come from the table write function. The rows are made by the table row
+        function if there is one. Otherwise, the information is a tuple of the column values, which
+        is checked against the write function for the first row.
+
+        Parameters
+        ----------
+        table_name : str
+            The attribute name holding the sqlalchemy.Table instance.
+        table_data : topic or tuple
+            The first information for the table.
+
+        Returns
+        -------
+        callable
+            The function that makes a row of values from the table information.
+        """
+        write_func = getattr(tables, "write_{}".format(table_name))
+        values = write_func(table_data, self.session_id)
+        names = [name for name in values if name != self.SESSION_COLUMN]
+
+        row_func = getattr(tables, "row_{}".format(table_name), tuple)
+        try:
+            row_matches = list(row_func(table_data)) == [values[name] for name in names]
+        except TypeError:
+            # Topic instances cannot be made into a tuple.
+            row_matches = False
+        if not row_matches:
+            def row_func(data):
+                values = write_func(data, self.session_id)
+                return tuple(values[name] for name in names)
+
+        self.row_functions[table_name] = row_func
+        self.buffers[table_name] = TableBuffer(names)
+        return row_func
+
+    def _get_insert_statement(self, table_name, names):
+        """Get the prepared insert statement for a table.
+
+        The session Id is part of the statement, so the rows only have the buffer columns.
+
+        Parameters
+        ----------
+        table_name : str
+            The attribute name holding the sqlalchemy.Table instance.
+        names : list[str]
+            The column names of the rows.
+
+        Returns
+        -------
+        str
+        """
+        key = (table_name, tuple(names))
+        try:
+            return self.insert_statements[key]
+        except KeyError:
+            tbl = getattr(self, table_name)
+            columns = ", ".join('"{}"'.format(name) for name in list(names) + [self.SESSION_COLUMN])
+            parameters = ", ".join(["?"] * len(names) + [str(int(self.session_id))])
+            statement = 'INSERT INTO "{}" ({}) VALUES ({})'.format(tbl.name, columns, parameters)
+            self.insert_statements[key] = statement
+            return statement
+
+    def _set_pragmas(self, conn, pragmas):
+        """Apply SQLite pragma settings to a connection.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.Connection
+            The database connection.
+        pragmas : dict(str : str or int)
+            The pragma names and values.
+        """
+        for name, value in pragmas.items():
+            conn.execute("PRAGMA {} = {}".format(name, value))
+            self.log.debug("Set SQLite pragma {} = {}".format(name, value))
+
     def create_db(self):
         """Create the database tables.
 
@@ -142,6 +317,30 @@ class SocsDatabase(object):
         """
         self.metadata.create_all(self.engine)
 
+    def create_indexes(self, db_file):
+        """Create the missing indexes of a session database.
+
+        This builds the indexes of a session database from a run with deferred indexes that was not
+        finalized. Indexes that already exist are left alone.
+
+        Parameters
+        ----------
+        db_file : str
+            The full path to the session database.
+
+        Returns
+        -------
+        list[str]
+            The names of the indexes created.
+        """
+        if not self.session_metadata.tables:
+            self._create_tables(self.session_metadata, use_autoincrement=False)
+        engine = create_engine("sqlite:///{}".format(expand_path(db_file)))
+        with engine.connect() as conn:
+            created = self._create_indexes(conn, self.session_metadata)
+        engine.dispose()
+        return created
+
     def new_session(self, run_comment):
         """Log a new session to the database and return the ID.
 
@@ -184,11 +383,13 @@ class SocsDatabase(object):
         sqlite_session_db = "{}_{}.db".format(get_hostname(), self.session_id)
         self.session_engine = self._make_engine(sqlite_session_db)
         self._create_tables(self.session_metadata, use_autoincrement=False)
-        self.session_metadata.create_all(self.session_engine)
-        insert = self.session.insert()
-        conn = self.session_engine.connect()
-        result = conn.execute(insert, sessionId=self.session_id, sessionUser=user, sessionHost=hostname,
-                              sessionDate=date, version=version, runComment=run_comment)
+        self._create_session_schema()
+        if self.columnar_output:
+            columnar_dir = "{}_columns".format(os.path.splitext(self.session_engine.url.database)[0])
+            self.output_writers.append(ColumnarWriter(columnar_dir))
+        self.write_table("session", [{"sessionId": self.session_id, "sessionUser": user,
+                                      "sessionHost": hostname, "sessionDate": date, "version": version,
+                                      "runComment": run_comment}])
 
         return self.session_id
 
@@ -202,55 +403,375 @@ class SocsDatabase(object):
         table_data: topic
             The Scheduler topic data instance.
         """
-        write_func = getattr(tables, "write_{}".format(table_name))
-        result = write_func(table_data, self.session_id)
-        self.data_list[table_name].append(result)
+        if self.columnar:
+            try:
+                row_func = self.row_functions[table_name]
+            except KeyError:
+                row_func = self._create_buffer(table_name, table_data)
+            self.buffers[table_name].append(row_func(table_data))
+        else:
+            write_func = getattr(tables, "write_{}".format(table_name))
+            result = write_func(table_data, self.session_id)
+            self.data_list[table_name].append(result)
+
+    def append_columns(self, table_name, column_data):
+        """Collect column information for the provided table.
+
+        Parameters
+        ----------
+        table_name : str
+            The attribute name holding the sqlalchemy.Table instance.
+        column_data : dict(str : numpy.ndarray)
+            The set of column names and arrays of values. The session Id is added when writing.
+        """
+        if self.columnar:
+            if table_name not in self.buffers:
+                self.buffers[table_name] = TableBuffer(column_data.keys())
+            self.buffers[table_name].extend(column_data)
+        else:
+            self.data_columns[table_name].append(column_data)
 
     def clear_data(self):
         """Clear all stored data lists.
         """
         self.data_list.clear()
+        self.data_columns.clear()
+        self.buffers.clear()
+        self.row_functions.clear()
         self.log.log(LoggingLevel.EXTENSIVE.value, "After clearing: {}".format(self.data_list))
 
     def _get_conn(self):
         """Get the DB connection.
 
+        The connection is kept for the whole session and the pragma settings are applied when it is
+        opened.
+
         Returns
         -------
         sqlalchemy.engine.Connection
             The DB connection for the associated type.
         """
-        e = self.session_engine
-        return e.connect()
+        if self.session_conn is None:
+            self.session_conn = self.session_engine.connect()
+            self._set_pragmas(self.session_conn, self.pragmas)
+        return self.session_conn
+
+    def _close_conn(self):
+        """Restore the safe pragma settings and close the session database connection.
+
+        A write-ahead log is folded back into the session database file by the switch of the journal
+        mode.
+        """
+        if self.session_conn is not None:
+            self._set_pragmas(self.session_conn, self.SAFE_PRAGMAS)
+            self.session_conn.close()
+            self.session_conn = None
+
+    def _create_indexes(self, conn, metadata):
+        """Create the indexes missing from a database in a single transaction.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.Connection
+            The DB connection.
+        metadata : sqlalchemy.MetaData
+            The instance holding the tables with the indexes.
+
+        Returns
+        -------
+        list[str]
+            The names of the indexes created.
+        """
+        inspector = inspect(conn)
+        table_names = set(inspector.get_table_names())
+        created = []
+        with conn.begin():
+            for table in metadata.sorted_tables:
+                if table.name in table_names:
+                    existing = set(index["name"] for index in inspector.get_indexes(table.name))
+                    for index in sorted(table.indexes, key=lambda index: index.name):
+                        if index.name not in existing:
+                            index.create(conn)
+                            created.append(index.name)
+        return created
+
+    def _columns_from_rows(self, table_name, rows):
+        """Create column information in the table column order from table rows.
+
+        Parameters
+        ----------
+        table_name : str
+            The attribute name holding the sqlalchemy.Table instance.
+        rows : list[dict]
+            The rows of the table information.
+
+        Returns
+        -------
+        collections.OrderedDict(str : list)
+        """
+        tbl = getattr(self, table_name)
+        names = [column.name for column in tbl.c if column.name in rows[0]]
+        return collections.OrderedDict((name, [row[name] for row in rows]) for name in names)
+
+    def _finish_session(self):
+        """Build the deferred indexes and close the session database connection.
+        """
+        if self.defer_indexes and self.session_engine is not None:
+            start = time.time()
+            created = self._create_indexes(self._get_conn(), self.session_metadata)
+            self.log.info("Created {} deferred indexes in {:.2f} seconds.".format(len(created),
+                                                                                  time.time() - start))
+        self._close_conn()
+
+    def _insert(self, table_name, table_data):
+        """Insert rows into a table in a single transaction.
+
+        Parameters
+        ----------
+        table_name : str
+            The attribute name holding the sqlalchemy.Table instance.
+        table_data : list[dict]
+            The rows of the table information.
+        """
+        conn = self._get_conn()
+        tbl = getattr(self, table_name)
+        with conn.begin():
+            conn.execute(tbl.insert(), table_data)
+        if self.output_writers and len(table_data):
+            self._write_outputs({table_name: self._columns_from_rows(table_name, table_data)})
+
+    def _run_write(self, write_func, *args):
+        """Run a write on the background writer if there is one, otherwise run it directly.
+
+        Parameters
+        ----------
+        write_func : callable
+            The function doing the write.
+        args
+            The arguments for the function.
+        """
+        if self.writer is not None:
+            self.writer.submit(write_func, *args)
+        else:
+            write_func(*args)
+
+    def _write_collected(self, data_list, data_columns, buffers):
+        """Write collected information into the session database and the extra outputs.
+
+        Parameters
+        ----------
+        data_list : dict(str : list[dict])
+            The rows for each table.
+        data_columns : dict(str : list[dict])
+            The column information for each table.
+        buffers : dict(str : :class:`.TableBuffer`)
+            The columnar buffers for each table.
+        """
+        if self.columnar:
+            self.write_buffers(buffers)
+        else:
+            self.write_rows(data_list, data_columns)
+        if self.output_writers:
+            self._write_outputs(self.get_table_columns(data_list, data_columns, buffers))
+
+    def _write_outputs(self, table_columns):
+        """Write column information into the extra outputs.
+
+        Parameters
+        ----------
+        table_columns : dict(str : dict(str : list))
+            The column information for each table.
+        """
+        for output_writer in self.output_writers:
+            for table_name, columns in table_columns.items():
+                output_writer.write_table(getattr(self, table_name), columns)
+            output_writer.flush()
+
+    def finalize(self):
+        """Finish the writes and close the session database connection.
+
+        Any background writes are drained first. Then the deferred indexes are built and the safe
+        pragma settings are restored before the connection is closed. The extra outputs are
+        finalized last.
+
+        Raises
+        ------
+        :class:`.SocsDatabaseError`
+            If a background write failed.
+        """
+        try:
+            if self.writer is not None:
+                self.writer.stop(self._finish_session)
+            else:
+                self._finish_session()
+        finally:
+            for output_writer in self.output_writers:
+                output_writer.finalize()
+
+    def get_table_columns(self, data_list, data_columns, buffers):
+        """Create column information in the table column order from collected information.
+
+        Parameters
+        ----------
+        data_list : dict(str : list[dict])
+            The rows for each table.
+        data_columns : dict(str : list[dict])
+            The column information for each table.
+        buffers : dict(str : :class:`.TableBuffer`)
+            The columnar buffers for each table.
+
+        Returns
+        -------
+        collections.OrderedDict(str : collections.OrderedDict(str : list or numpy.ndarray))
+            The column names and values, including the session Id, for each table.
+        """
+        table_columns = collections.OrderedDict()
+        for table_name, rows in data_list.items():
+            if len(rows):
+                table_columns[table_name] = self._columns_from_rows(table_name, rows)
+
+        collected = []
+        for table_name, column_list in data_columns.items():
+            if len(column_list):
+                columns = dict((name, numpy.concatenate([numpy.asarray(column_data[name])
+                                                         for column_data in column_list]))
+                               for name in column_list[0])
+                collected.append((table_name, columns))
+        for table_name, buffer in buffers.items():
+            if len(buffer):
+                collected.append((table_name, dict(zip(buffer.names, buffer.columns))))
+
+        for table_name, columns in collected:
+            length = len(next(iter(columns.values())))
+            columns[self.SESSION_COLUMN] = [self.session_id] * length
+            tbl = getattr(self, table_name)
+            table_columns[table_name] = collections.OrderedDict((column.name, columns[column.name])
+                                                                for column in tbl.c
+                                                                if column.name in columns)
+        return table_columns
+
+    def rows_from_columns(self, column_data):
+        """Create table rows from column information.
+
+        Parameters
+        ----------
+        column_data : dict(str : numpy.ndarray)
+            The set of column names and arrays of values.
+
+        Returns
+        -------
+        list[dict]
+            The rows of the table information including the session Id.
+        """
+        names = list(column_data.keys())
+        rows = []
+        for values in zip(*[numpy.asarray(column_data[name]).tolist() for name in names]):
+            row = dict(zip(names, values))
+            row["Session_sessionId"] = self.session_id
+            rows.append(row)
+        return rows
 
     def write(self):
         """Write collected information into the database.
+
+        All of the information is written in a single transaction, so none of it is kept if an
+        insertion fails. The rollback is not reliable with the off bulk-load profile, since it turns
+        off the rollback journal. With the background writer, the collected information is handed to it and
+        the collection starts again empty. If a previous background write failed, its error is raised
+        and the collected information is kept.
+        """
+        self._run_write(self._write_collected, self.data_list, self.data_columns, self.buffers)
+        if self.writer is not None:
+            self.data_list = collections.defaultdict(list)
+            self.data_columns = collections.defaultdict(list)
+            self.buffers = collections.OrderedDict()
+            self.row_functions = {}
+
+    def write_buffers(self, buffers):
+        """Write columnar buffers into the database.
+
+        All of the buffers are written in a single transaction with the sqlite3 cursor of the session
+        database connection.
+
+        Parameters
+        ----------
+        buffers : dict(str : :class:`.TableBuffer`)
+            The columnar buffers for each table.
         """
         conn = self._get_conn()
+        cursor = conn.connection.cursor()
+        try:
+            with conn.begin():
+                for table_name, buffer in buffers.items():
+                    if not len(buffer):
+                        continue
+                    self.log.log(LoggingLevel.EXTENSIVE.value, "Writing {} data into DB.".format(table_name))
+                    self.log.log(LoggingLevel.EXTENSIVE.value, "Length of data: {}".format(len(buffer)))
+                    try:
+                        cursor.executemany(self._get_insert_statement(table_name, buffer.names),
+                                           buffer.get_rows())
+                    except sqlite3.IntegrityError as err:
+                        self.log.error("Database insertion failed for {}!".format(table_name))
+                        filename = "{}_{}.npz".format(table_name, self.session_id)
+                        numpy.savez(filename, **buffer.get_column_arrays())
+                        self.log.error("Dumping information into {}".format(filename))
+                        raise SocsDatabaseError(str(err))
+        finally:
+            cursor.close()
+
+    def write_rows(self, data_list, data_columns):
+        """Write rows and column information into the database.
+
+        All of the information is written in a single transaction, which is rolled back if any
+        insertion fails.
+
+        Parameters
+        ----------
+        data_list : dict(str : list[dict])
+            The rows for each table.
+        data_columns : dict(str : list[dict])
+            The column information for each table.
+
+        Raises
+        ------
+        :class:`.SocsDatabaseError`
+            If an insertion fails. The information of the table is dumped into a npz file.
+        """
+        conn = self._get_conn()
+
+        table_items = list(data_list.items())
+        for table_name, column_list in data_columns.items():
+            table_data = []
+            for column_data in column_list:
+                table_data.extend(self.rows_from_columns(column_data))
+            if len(table_data):
+                table_items.append((table_name, table_data))
 
         db_errors = []
-        for table_name, table_data in self.data_list.items():
-            try:
-                self.log.log(LoggingLevel.EXTENSIVE.value, "Writing {} data into DB.".format(table_name))
-                self.log.log(LoggingLevel.EXTENSIVE.value, "Length of data: {}".format(len(table_data)))
-                tbl = getattr(self, table_name)
-                conn.execute(tbl.insert(), table_data)
-            except exc.IntegrityError as err:
-                self.log.error("Database insertion failed for {}!".format(table_name))
-                output = collections.defaultdict(list)
-                for values in table_data:
-                    for k, v in values.items():
-                        output[k].append(v)
-
-                for k, v in output.items():
-                    output[k] = numpy.array(v)
-
-                filename = "{}_{}.npz".format(table_name, self.session_id)
-                numpy.savez(open(filename, 'w'), **output)
-                self.log.error("Dumping information into {}".format(filename))
-                db_errors.append(err.message)
-        if len(db_errors):
-            raise SocsDatabaseError(os.linesep.join(db_errors))
+        with conn.begin():
+            for table_name, table_data in table_items:
+                try:
+                    self.log.log(LoggingLevel.EXTENSIVE.value, "Writing {} data into DB.".format(table_name))
+                    self.log.log(LoggingLevel.EXTENSIVE.value, "Length of data: {}".format(len(table_data)))
+                    tbl = getattr(self, table_name)
+                    conn.execute(tbl.insert(), table_data)
+                except exc.IntegrityError as err:
+                    self.log.error("Database insertion failed for {}!".format(table_name))
+                    output = collections.defaultdict(list)
+                    for values in table_data:
+                        for k, v in values.items():
+                            output[k].append(v)
+
+                    for k, v in output.items():
+                        output[k] = numpy.array(v)
+
+                    filename = "{}_{}.npz".format(table_name, self.session_id)
+                    numpy.savez(filename, **output)
+                    self.log.error("Dumping information into {}".format(filename))
+                    db_errors.append(str(err))
+            if len(db_errors):
+                # Raising inside the transaction block rolls it back.
+                raise SocsDatabaseError(os.linesep.join(db_errors))
 
     def write_table(self, table_name, table_data):
         """Collect information for the provided table.
@@ -262,6 +783,4 @@ class SocsDatabase(object):
         table_data : list[topic]
             A set of Scheduler topic data instances.
         """
-        conn = self._get_conn()
-        tbl = getattr(self, table_name)
-        conn.execute(tbl.insert(), table_data)
+        self._run_write(self._insert, table_name, table_data)
@@ -0,0 +1,80 @@
+from builtins import object
+from builtins import zip
+import numpy
+
+__all__ = ["TableBuffer"]
+
+class TableBuffer(object):
+    """Collect the rows of a table as columns.
+
+    This class holds a list of values for each column of a table. The session ID column is not
+    stored, since it is the same for every row, and is added when the rows are written.
+
+    Attributes
+    ----------
+    names : list[str]
+        The column names.
+    columns : list[list]
+        The values of each column.
+    """
+
+    def __init__(self, names):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        names : list[str]
+            The column names.
+        """
+        self.names = list(names)
+        self.columns = [[] for _ in self.names]
+
+    def __len__(self):
+        """Return the number of rows.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.columns[0]) if self.columns else 0
+
+    def append(self, row):
+        """Add a row to the columns.
+
+        Parameters
+        ----------
+        row : tuple
+            The values of the row in the column order.
+        """
+        for column, value in zip(self.columns, row):
+            column.append(value)
+
+    def extend(self, column_data):
+        """Add the rows from column information.
+
+        Parameters
+        ----------
+        column_data : dict(str : numpy.ndarray)
+            The set of column names and arrays of values. Must have all of the columns.
+        """
+        for name, column in zip(self.names, self.columns):
+            column.extend(numpy.asarray(column_data[name]).tolist())
+
+    def get_column_arrays(self):
+        """Get the columns as arrays.
+
+        Returns
+        -------
+        dict(str : numpy.ndarray)
+        """
+        return dict((name, numpy.array(column)) for name, column in zip(self.names, self.columns))
+
+    def get_rows(self):
+        """Get an iterator over the rows.
+
+        Returns
+        -------
+        iterator
+            The tuple of values for each row in the column order.
+        """
+        return zip(*self.columns)
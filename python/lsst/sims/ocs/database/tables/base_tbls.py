@@ -5,7 +5,8 @@ from sqlalchemy import DDL, event
 __all__ = ["create_config", "create_field", "create_observation_exposures",
            "create_observation_history", "create_observation_proposal_history", "create_proposal_field",
            "create_proposal", "create_scheduled_downtime",
-           "create_session", "create_slew_activities", "create_slew_final_state",
+           "create_session", "create_slew_activities", "create_slew_activity_statistics",
+           "create_slew_final_state",
            "create_slew_history", "create_slew_initial_state", "create_slew_maxspeeds",
            "create_target_exposures", "create_target_history", "create_target_proposal_history",
            "create_unscheduled_downtime"]
@@ -562,6 +563,54 @@ def create_slew_activities(metadata):
 
     return table
 
+def create_slew_activity_statistics(metadata):
+    """Create the SlewActivityStatistics table.
+
+    This function creates the SlewActivityStatistics table for tracking the aggregated slew activities.
+
+    Table Description:
+
+    This table contains the statistics of each slew activity over a night. It replaces the
+    :ref:`database-tables-slewactivities` table when the aggregated slew activity mode is used. The
+    histogram of the activity delays is stored as a comma separated list of counts with fixed width bins
+    starting at zero. The last bin contains all delays beyond the histogram range.
+
+    Parameters
+    ----------
+    metadata : sqlalchemy.MetaData
+        The database object that collects the tables.
+
+    Returns
+    -------
+    sqlalchemy.Table
+        The SlewActivityStatistics table object.
+    """
+    table = Table("SlewActivityStatistics", metadata,
+                  Column("slewActivityStatId", Integer, primary_key=True, autoincrement=False, nullable=False,
+                         doc="Numeric identifier for a particular slew activity statistics entry."),
+                  Column("Session_sessionId", Integer, primary_key=True, autoincrement=False, nullable=False,
+                         doc="The simulation run session Id."),
+                  Column("night", Integer, nullable=False,
+                         doc="The survey night for the slew activity statistics."),
+                  Column("activity", String(20), nullable=False,
+                         doc="Short description of the slew activity."),
+                  Column("numActivities", Integer, nullable=False,
+                         doc="The number of slews containing the slew activity."),
+                  Column("numCriticalPath", Integer, nullable=False,
+                         doc="The number of slews where the slew activity was in the critical path."),
+                  Column("totalDelay", Float, nullable=False,
+                         doc="The total delay time of the slew activity (units=seconds)."),
+                  Column("maxDelay", Float, nullable=False,
+                         doc="The maximum delay time of the slew activity (units=seconds)."),
+                  Column("histogramBinWidth", Float, nullable=False,
+                         doc="The width of the delay histogram bins (units=seconds)."),
+                  Column("delayHistogram", String(500), nullable=False,
+                         doc="Comma separated counts for the delay histogram bins."))
+
+    Index("night_activity_idx", table.c.night, table.c.activity)
+
+    return table
+
 def create_slew_final_state(metadata):
     """Create the SlewFinalState tables.
 
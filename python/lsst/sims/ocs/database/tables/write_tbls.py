@@ -4,10 +4,27 @@ import collections
 __all__ = ["write_config", "write_field", "write_observation_exposures",
            "write_observation_history", "write_observation_proposal_history", "write_proposal_field",
            "write_proposal", "write_scheduled_downtime",
-           "write_slew_activities", "write_slew_history",
+           "write_slew_activities", "write_slew_activity_statistics", "write_slew_history",
            "write_slew_final_state", "write_slew_initial_state", "write_slew_maxspeeds",
            "write_target_exposures", "write_target_history", "write_target_proposal_history",
-           "write_unscheduled_downtime"]
+           "write_unscheduled_downtime", "row_observation_history", "row_target_history",
+           "OBSERVATION_HISTORY_COLUMNS", "TARGET_HISTORY_COLUMNS"]
+
+OBSERVATION_HISTORY_COLUMNS = (
+    "observationId", "Session_sessionId", "observationStartTime", "observationStartMJD",
+    "observationStartLST", "night", "TargetHistory_targetId", "Field_fieldId", "groupId", "ra", "dec",
+    "filter", "angle", "altitude", "azimuth", "numExposures", "visitTime", "visitExposureTime", "airmass",
+    "skyBrightness", "cloud", "seeingFwhm500", "seeingFwhmGeom", "seeingFwhmEff", "fiveSigmaDepth",
+    "moonRA", "moonDec", "moonAlt", "moonAz", "moonDistance", "moonPhase", "sunRA", "sunDec", "sunAlt",
+    "sunAz", "solarElong")
+"""The ObsHistory table column names."""
+
+TARGET_HISTORY_COLUMNS = (
+    "targetId", "Session_sessionId", "Field_fieldId", "groupId", "ra", "dec", "filter", "angle",
+    "numExposures", "requestedExpTime", "requestTime", "requestMJD", "airmass", "skyBrightness", "cloud",
+    "seeing", "slewTime", "cost", "rank", "propBoost", "numRequestingProps", "moonRA", "moonDec",
+    "moonAlt", "moonAz", "moonDistance", "moonPhase", "sunRA", "sunDec", "sunAlt", "sunAz", "solarElong")
+"""The TargetHistory table column names."""
 
 def ordered_dict_from_namedtuple(data, sid=None):
     """Convert a namedtuple to an OrderedDict.
@@ -98,6 +115,57 @@ def write_observation_exposures(data, sid):
     """
     return ordered_dict_from_namedtuple(data, sid=sid)
 
+def row_observation_history(data):
+    """Create a row of data for the ObsHistory table without the session ID.
+
+    Parameters
+    ----------
+    data : SALPY_scheduler.observationC
+        The SAL observation topic instance.
+
+    Returns
+    -------
+    tuple
+        The values of the table columns after the session ID.
+    """
+    return (
+        data.observationId,
+        data.observation_start_time,
+        data.observation_start_mjd,
+        data.observation_start_lst,
+        data.night,
+        data.targetId,
+        data.fieldId,
+        data.groupId,
+        data.ra,
+        data.dec,
+        data.filter,
+        data.angle,
+        data.altitude,
+        data.azimuth,
+        data.num_exposures,
+        data.visit_time,
+        sum([data.exposure_times[i] for i in range(data.num_exposures)]),
+        data.airmass,
+        data.sky_brightness,
+        data.cloud,
+        data.seeing_fwhm_500,
+        data.seeing_fwhm_geom,
+        data.seeing_fwhm_eff,
+        data.five_sigma_depth,
+        data.moon_ra,
+        data.moon_dec,
+        data.moon_alt,
+        data.moon_az,
+        data.moon_distance,
+        data.moon_phase,
+        data.sun_ra,
+        data.sun_dec,
+        data.sun_alt,
+        data.sun_az,
+        data.solar_elong
+    )
+
 def write_observation_history(data, sid):
     """Create a dictionary of data for the ObsHistory table.
 
@@ -113,45 +181,8 @@ def write_observation_history(data, sid):
     collections.OrderedDict
         A dictionary of the topic data.
     """
-    values = collections.OrderedDict([
-        ('observationId', data.observationId),
-        ('Session_sessionId', sid),
-        ('observationStartTime', data.observation_start_time),
-        ('observationStartMJD', data.observation_start_mjd),
-        ('observationStartLST', data.observation_start_lst),
-        ('night', data.night),
-        ('TargetHistory_targetId', data.targetId),
-        ('Field_fieldId', data.fieldId),
-        ('groupId', data.groupId),
-        ('ra', data.ra),
-        ('dec', data.dec),
-        ('filter', data.filter),
-        ('angle', data.angle),
-        ('altitude', data.altitude),
-        ('azimuth', data.azimuth),
-        ('numExposures', data.num_exposures),
-        ('visitTime', data.visit_time),
-        ('visitExposureTime', sum([data.exposure_times[i] for i in range(data.num_exposures)])),
-        ('airmass', data.airmass),
-        ('skyBrightness', data.sky_brightness),
-        ('cloud', data.cloud),
-        ('seeingFwhm500', data.seeing_fwhm_500),
-        ('seeingFwhmGeom', data.seeing_fwhm_geom),
-        ('seeingFwhmEff', data.seeing_fwhm_eff),
-        ('fiveSigmaDepth', data.five_sigma_depth),
-        ('moonRA', data.moon_ra),
-        ('moonDec', data.moon_dec),
-        ('moonAlt', data.moon_alt),
-        ('moonAz', data.moon_az),
-        ('moonDistance', data.moon_distance),
-        ('moonPhase', data.moon_phase),
-        ('sunRA', data.sun_ra),
-        ('sunDec', data.sun_dec),
-        ('sunAlt', data.sun_alt),
-        ('sunAz', data.sun_az),
-        ('solarElong', data.solar_elong)
-    ])
-    return values
+    row = row_observation_history(data)
+    return collections.OrderedDict(zip(OBSERVATION_HISTORY_COLUMNS, row[:1] + (sid,) + row[1:]))
 
 def write_observation_proposal_history(data, sid):
     """Create a dictionary of data for the ObsProposalHistory table.
@@ -245,6 +276,23 @@ def write_slew_activities(data, sid):
     """
     return ordered_dict_from_namedtuple(data, sid=sid)
 
+def write_slew_activity_statistics(data, sid):
+    """Create a dictionary of data for the SlewActivityStatistics table.
+
+    Parameters
+    ----------
+    data : class:`.SlewActivityStatistics`
+        The instance containing the slew activity statistics information
+    sid : int
+        The current session ID.
+
+    Returns
+    -------
+    collections.OrderedDict
+        A dictionary of the topic data.
+    """
+    return ordered_dict_from_namedtuple(data, sid=sid)
+
 def write_slew_history(data, sid):
     """Create a dictionary of data for the SlewHistory table.
 
@@ -330,6 +378,53 @@ def write_target_exposures(data, sid):
     """
     return ordered_dict_from_namedtuple(data, sid=sid)
 
+def row_target_history(data):
+    """Create a row of data for the TargetHistory table without the session ID.
+
+    Parameters
+    ----------
+    data : SALPY_scheduler.targetC
+        The SAL target topic instance.
+
+    Returns
+    -------
+    tuple
+        The values of the table columns after the session ID.
+    """
+    return (
+        data.targetId,
+        data.fieldId,
+        data.groupId,
+        data.ra,
+        data.dec,
+        data.filter,
+        data.angle,
+        data.num_exposures,
+        sum([data.exposure_times[i] for i in range(data.num_exposures)]),
+        data.request_time,
+        data.request_mjd,
+        data.airmass,
+        data.sky_brightness,
+        data.cloud,
+        data.seeing,
+        data.slew_time,
+        data.cost,
+        data.rank,
+        data.prop_boost,
+        data.num_proposals,
+        data.moon_ra,
+        data.moon_dec,
+        data.moon_alt,
+        data.moon_az,
+        data.moon_distance,
+        data.moon_phase,
+        data.sun_ra,
+        data.sun_dec,
+        data.sun_alt,
+        data.sun_az,
+        data.solar_elong
+    )
+
 def write_target_history(data, sid):
     """Create a dictionary of data for the TargetHistory table.
 
@@ -345,41 +440,8 @@ def write_target_history(data, sid):
     collections.OrderedDict
         A dictionary of the topic data.
     """
-    values = collections.OrderedDict([
-        ('targetId', data.targetId),
-        ('Session_sessionId', sid),
-        ('Field_fieldId', data.fieldId),
-        ('groupId', data.groupId),
-        ('ra', data.ra),
-        ('dec', data.dec),
-        ('filter', data.filter),
-        ('angle', data.angle),
-        ('numExposures', data.num_exposures),
-        ('requestedExpTime', sum([data.exposure_times[i] for i in range(data.num_exposures)])),
-        ('requestTime', data.request_time),
-        ('requestMJD', data.request_mjd),
-        ('airmass', data.airmass),
-        ('skyBrightness', data.sky_brightness),
-        ('cloud', data.cloud),
-        ('seeing', data.seeing),
-        ('slewTime', data.slew_time),
-        ('cost', data.cost),
-        ('rank', data.rank),
-        ('propBoost', data.prop_boost),
-        ('numRequestingProps', data.num_proposals),
-        ('moonRA', data.moon_ra),
-        ('moonDec', data.moon_dec),
-        ('moonAlt', data.moon_alt),
-        ('moonAz', data.moon_az),
-        ('moonDistance', data.moon_distance),
-        ('moonPhase', data.moon_phase),
-        ('sunRA', data.sun_ra),
-        ('sunDec', data.sun_dec),
-        ('sunAlt', data.sun_alt),
-        ('sunAz', data.sun_az),
-        ('solarElong', data.solar_elong)
-    ])
-    return values
+    row = row_target_history(data)
+    return collections.OrderedDict(zip(TARGET_HISTORY_COLUMNS, row[:1] + (sid,) + row[1:]))
 
 def write_target_proposal_history(data, sid):
     """Create a dictionary of data for the TargetProposalHistory table.
@@ -3,3 +3,4 @@ Module for classes handling the scheduled and unscheduled downtime.
 """
 from .scheduled_downtime import *
 from .unscheduled_downtime import *
+from .downtime_ensemble import *
@@ -0,0 +1,157 @@
+from builtins import object
+from builtins import range
+import logging
+import numpy
+
+from lsst.sims.ocs.downtime.unscheduled_downtime import UnscheduledDowntime
+
+__all__ = ["DowntimeEnsemble"]
+
+class DowntimeEnsemble(object):
+    """Generate many unscheduled downtime realizations at once.
+
+    This class draws a Monte-Carlo ensemble of unscheduled downtime realizations from a seeded numpy
+    random generator and keeps summary statistics for each realization. The realizations are drawn
+    in chunks to bound the memory of the random draws.
+
+    Attributes
+    ----------
+    num_realizations : int
+        The number of downtime realizations.
+    survey_length : int
+        The length of the survey in days.
+    seed : int or None
+        The seed for the random number generator.
+    events : numpy.ndarray
+        The event duration (units=days) at the start night of each event with shape (number of
+        realizations, survey length).
+    total_downtime : numpy.ndarray
+        The total downtime (units=days) of each realization.
+    num_events : numpy.ndarray
+        The number of events of each realization.
+    longest_downtime : numpy.ndarray
+        The longest run of downtime nights of each realization.
+    longest_gap : numpy.ndarray
+        The longest run of nights without downtime of each realization.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    CHUNK_SIZE = 256
+    """The number of realizations drawn at once."""
+    PERCENTILES = (5, 50, 95)
+    """The percentiles reported in the summary."""
+
+    def __init__(self, num_realizations, survey_length=7300, seed=None):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        num_realizations : int
+            The number of downtime realizations.
+        survey_length : int, optional
+            The length of the survey in days. Default is the length of a 20 year survey.
+        seed : int, optional
+            The seed for the random number generator. Default is an unpredictable seed.
+        """
+        self.num_realizations = num_realizations
+        self.survey_length = survey_length
+        self.seed = seed
+        self.events = None
+        self.total_downtime = None
+        self.num_events = None
+        self.longest_downtime = None
+        self.longest_gap = None
+        self.log = logging.getLogger("downtime.DowntimeEnsemble")
+
+    def generate(self):
+        """Draw the downtime realizations and calculate their statistics.
+        """
+        generator = numpy.random.default_rng(self.seed)
+        self.events = numpy.zeros((self.num_realizations, self.survey_length), dtype=numpy.int8)
+        self.longest_downtime = numpy.zeros(self.num_realizations, dtype=int)
+        self.longest_gap = numpy.zeros(self.num_realizations, dtype=int)
+        for start in range(0, self.num_realizations, self.CHUNK_SIZE):
+            end = min(start + self.CHUNK_SIZE, self.num_realizations)
+            events = UnscheduledDowntime.draw_events(generator, end - start, self.survey_length)
+            is_down = self.get_down_nights(events)
+            self.events[start:end] = events
+            self.longest_downtime[start:end] = self.get_longest_run(is_down)
+            self.longest_gap[start:end] = self.get_longest_run(~is_down)
+        self.total_downtime = self.events.sum(axis=1, dtype=int)
+        self.num_events = numpy.count_nonzero(self.events, axis=1)
+        self.log.debug("Generated {} downtime realizations of {} days.".format(self.num_realizations,
+                                                                               self.survey_length))
+
+    def get_down_nights(self, events):
+        """Find the nights covered by the events.
+
+        Parameters
+        ----------
+        events : numpy.ndarray
+            The event durations at the event start nights.
+
+        Returns
+        -------
+        numpy.ndarray
+            The flags for the downtime nights with the same shape as the events.
+        """
+        is_down = events > 0
+        for shift in range(1, int(events.max(initial=0))):
+            is_down[:, shift:] |= events[:, :-shift] > shift
+        return is_down
+
+    def get_downtimes(self, realization):
+        """Get the downtime list of one realization.
+
+        Parameters
+        ----------
+        realization : int
+            The index of the realization.
+
+        Returns
+        -------
+        list[tuple]
+            The (night, duration, description) of each event, like :class:`.UnscheduledDowntime`.
+        """
+        descriptions = dict((event[1], event[2]) for event in UnscheduledDowntime.EVENTS)
+        events = self.events[realization]
+        return [(int(night), int(events[night]), descriptions[events[night]])
+                for night in numpy.flatnonzero(events)]
+
+    @staticmethod
+    def get_longest_run(flags):
+        """Find the longest run of set flags in each row.
+
+        Parameters
+        ----------
+        flags : numpy.ndarray
+            The flags with shape (number of rows, number of nights).
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        counts = numpy.cumsum(flags, axis=1)
+        # Subtract the count at the last unset flag so the counts restart after each unset flag.
+        restart = numpy.maximum.accumulate(numpy.where(flags, 0, counts), axis=1)
+        return (counts - restart).max(axis=1, initial=0)
+
+    def summary(self):
+        """Summarize the statistics over the realizations.
+
+        Returns
+        -------
+        dict
+            The mean, standard deviation, minimum, maximum and percentiles of the total downtime,
+            number of events, longest downtime and longest gap.
+        """
+        results = {}
+        for name in ("total_downtime", "num_events", "longest_downtime", "longest_gap"):
+            values = getattr(self, name)
+            statistics = {"mean": float(values.mean()), "std": float(values.std()),
+                          "min": int(values.min()), "max": int(values.max())}
+            for percentile, value in zip(self.PERCENTILES, numpy.percentile(values, self.PERCENTILES)):
+                statistics["p{}".format(percentile)] = float(value)
+            results[name] = statistics
+        return results
@@ -1,5 +1,6 @@
 from builtins import object
 import logging
+import numpy
 import random
 import time
 
@@ -15,6 +16,8 @@ class UnscheduledDowntime(object):
     INTERMEDIATE_EVENT = (0.00548, 3, "intermediate event")
     MAJOR_EVENT = (0.00137, 7, "major event")
     CATASTROPHIC_EVENT = (0.000274, 14, "catastrophic event")
+    EVENTS = (CATASTROPHIC_EVENT, MAJOR_EVENT, INTERMEDIATE_EVENT, MINOR_EVENT)
+    """The events in the order their probabilities are checked each night."""
 
     def __init__(self):
         """Initialize the class.
@@ -50,7 +53,63 @@ class UnscheduledDowntime(object):
         """
         return sum([x[1] for x in self.downtimes])
 
-    def initialize(self, use_random_seed=False, random_seed=-1, survey_length=7300):
+    @classmethod
+    def draw_events(cls, generator, num_realizations, survey_length):
+        """Draw the unscheduled downtime events for a set of realizations.
+
+        Each night gets one draw from the combined event probabilities of the night by night
+        checks. A night inside an event or on the night after a multi-night event cannot start a
+        new event, so the draws for those nights are dropped. Since the draws are independent, this
+        has the same distribution as the night by night checks.
+
+        Parameters
+        ----------
+        generator : numpy.random.Generator
+            The random number generator.
+        num_realizations : int
+            The number of downtime realizations.
+        survey_length : int
+            The length of the survey in days.
+
+        Returns
+        -------
+        numpy.ndarray
+            The event duration (units=days) at the start night of each event with shape (number of
+            realizations, survey length). Nights without an event start are zero.
+        """
+        remaining = 1.0
+        thresholds = []
+        for event in cls.EVENTS:
+            thresholds.append((thresholds[-1] if thresholds else 0.0) + remaining * event[0])
+            remaining *= 1.0 - event[0]
+        durations = numpy.array([event[1] for event in cls.EVENTS] + [0], dtype=numpy.int8)
+
+        draws = generator.random((num_realizations, survey_length))
+        candidates = durations[numpy.searchsorted(thresholds, draws, side="right")].ravel()
+        del draws
+        # The flat candidate positions are sorted by realization and then by night.
+        keys = numpy.flatnonzero(candidates)
+        candidate_durations = candidates[keys]
+        row_ends = (numpy.arange(num_realizations) + 1) * survey_length
+        positions = row_ends - survey_length
+
+        # Each pass starts the next event of every realization at or after its next free night.
+        events = numpy.zeros(num_realizations * survey_length, dtype=numpy.int8)
+        while keys.size:
+            index = numpy.minimum(numpy.searchsorted(keys, positions), keys.size - 1)
+            found = keys[index] >= positions
+            found &= keys[index] < row_ends
+            if not found.any():
+                break
+            started = keys[index[found]]
+            started_durations = candidate_durations[index[found]]
+            events[started] = started_durations
+            # Multi-night events also block the check of the following night.
+            positions[found] = started + numpy.where(started_durations > 1, started_durations + 1, 1)
+            positions[~found] = row_ends[~found]
+        return events.reshape(num_realizations, survey_length)
+
+    def initialize(self, use_random_seed=False, random_seed=-1, survey_length=7300, vectorized=False):
         """Configure the set of unscheduled downtimes.
 
         This function creates the unscheduled downtimes based on a set of probabilities
@@ -76,6 +135,9 @@ class UnscheduledDowntime(object):
             Provide an alternate random seed. Only works when use_random_seed is True.
         survey_length : int, optional
             The length of the survey in days. Default is the length of a 20 year survey.
+        vectorized : bool, optional
+            Flag to draw all of the events at once from a numpy random generator. Default is the night
+            by night checks, which keep the downtimes of earlier simulations for the same seed.
         """
         if use_random_seed:
             if random_seed == -1:
@@ -83,34 +145,63 @@ class UnscheduledDowntime(object):
             else:
                 self.seed = random_seed
 
-        random.seed(self.seed)
+        if vectorized:
+            self.initialize_vectorized(survey_length)
+        else:
+            self.initialize_nightly(survey_length)
+
+        self.log.log(LoggingLevel.WORDY.value,
+                     "Total unscheduled downtime: {} days in {} days.".format(self.total_downtime,
+                                                                              survey_length))
+
+    def initialize_nightly(self, survey_length):
+        """Create the unscheduled downtimes with night by night checks.
+
+        The checks use a random number generator owned by the instance, so the global random state
+        is not changed.
+
+        Parameters
+        ----------
+        survey_length : int
+            The length of the survey in days.
+        """
+        generator = random.Random(self.seed)
 
         nights = 0
         while nights < survey_length:
-            prob = random.random()
+            prob = generator.random()
             if prob < self.CATASTROPHIC_EVENT[0]:
                 self.downtimes.append((nights, self.CATASTROPHIC_EVENT[1], self.CATASTROPHIC_EVENT[2]))
                 nights += self.CATASTROPHIC_EVENT[1] + 1
                 continue
             else:
-                prob = random.random()
+                prob = generator.random()
                 if prob < self.MAJOR_EVENT[0]:
                     self.downtimes.append((nights, self.MAJOR_EVENT[1], self.MAJOR_EVENT[2]))
                     nights += self.MAJOR_EVENT[1] + 1
                     continue
                 else:
-                    prob = random.random()
+                    prob = generator.random()
                     if prob < self.INTERMEDIATE_EVENT[0]:
                         self.downtimes.append((nights, self.INTERMEDIATE_EVENT[1],
                                                self.INTERMEDIATE_EVENT[2]))
                         nights += self.INTERMEDIATE_EVENT[1] + 1
                         continue
                     else:
-                        prob = random.random()
+                        prob = generator.random()
                         if prob < self.MINOR_EVENT[0]:
                             self.downtimes.append((nights, self.MINOR_EVENT[1], self.MINOR_EVENT[2]))
             nights += 1
 
-        self.log.log(LoggingLevel.WORDY.value,
-                     "Total unscheduled downtime: {} days in {} days.".format(self.total_downtime,
-                                                                              survey_length))
+    def initialize_vectorized(self, survey_length):
+        """Create the unscheduled downtimes with one vectorized draw.
+
+        Parameters
+        ----------
+        survey_length : int
+            The length of the survey in days.
+        """
+        events = self.draw_events(numpy.random.default_rng(self.seed), 1, survey_length)[0]
+        descriptions = dict((event[1], event[2]) for event in self.EVENTS)
+        for night in numpy.flatnonzero(events):
+            self.downtimes.append((int(night), int(events[night]), descriptions[events[night]]))
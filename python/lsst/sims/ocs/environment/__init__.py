@@ -1,5 +1,13 @@
 """
 Module for classes dealing with environmental conditions.
 """
+from .column_cache import *
+from .shared_columns import *
+from .weather_generator import *
+from .environment_sources import *
+from .streamed_series import *
 from .cloud_model import *
+from .cloud_map_model import *
 from .seeing_model import *
+from .sky_brightness_cube import *
+from .sky_data_prefetcher import *
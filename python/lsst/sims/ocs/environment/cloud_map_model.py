@@ -0,0 +1,252 @@
+from __future__ import division
+import json
+import numpy
+import struct
+
+from lsst.sims.ocs.environment import CloudModel
+
+__all__ = ["CloudMapModel"]
+
+class CloudMapModel(CloudModel):
+    """Handle spatially resolved cloud information.
+
+    This class handles a memory-mapped file of all-sky cloud maps on an altitude/azimuth grid over a
+    set of times. The file layout is a magic string, the length of a JSON metadata header, the header
+    itself, the array of map dates (float64), the array of sky averaged cloud for each map (float64)
+    and then the cloud map array with shape (number of times, number of altitudes, number of
+    azimuths). The map dates are the times (units=seconds) since the start of the year, like the
+    cloud database dates. The sky averaged cloud is used for the all-sky cloud, so the
+    :class:`.CloudModel` lookups and topic work unchanged, while the per-pointing cloud is a grid
+    lookup.
+
+    Attributes
+    ----------
+    map_file : str
+        The full path to the cloud map file.
+    header : dict
+        The metadata header information.
+    cloud_maps : numpy.memmap
+        The memory-mapped cloud map array. The cloud uses the units of the cloud database (fraction of
+        the grid cell in 8ths).
+    alt_step : float
+        The altitude (units=degrees) size of the grid cells.
+    az_step : float
+        The azimuth (units=degrees) size of the grid cells.
+    """
+
+    MAGIC = b"SOCSCLD1"
+    """Identifier at the start of a cloud map file."""
+    ALIGNMENT = 64
+    """Byte alignment of the array sections in the file."""
+
+    def __init__(self, time_handler):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        time_handler : :class:`.TimeHandler`
+            The instance of the simulation time handler.
+        """
+        CloudModel.__init__(self, time_handler)
+        self.map_file = None
+        self.header = None
+        self.cloud_maps = None
+        self.alt_step = None
+        self.az_step = None
+
+    @classmethod
+    def _align(cls, offset):
+        """Move the offset to the next alignment boundary.
+
+        Parameters
+        ----------
+        offset : int
+            The byte offset to align.
+
+        Returns
+        -------
+        int
+        """
+        return ((offset + cls.ALIGNMENT - 1) // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @classmethod
+    def _layout(cls, header):
+        """Calculate the byte layout of the file from the header.
+
+        Parameters
+        ----------
+        header : dict
+            The metadata header information.
+
+        Returns
+        -------
+        bytes, int, int, int
+            The encoded header and the offsets of the dates, the sky averaged cloud and the maps.
+        """
+        encoded_header = json.dumps(header, sort_keys=True).encode("utf-8")
+        prefix_size = len(cls.MAGIC) + struct.calcsize("<Q") + len(encoded_header)
+        dates_offset = cls._align(prefix_size)
+        values_offset = cls._align(dates_offset + header["num_times"] * 8)
+        maps_offset = cls._align(values_offset + header["num_times"] * 8)
+        return encoded_header, dates_offset, values_offset, maps_offset
+
+    def _map(self, mode):
+        """Memory-map the arrays in the cloud map file.
+
+        Parameters
+        ----------
+        mode : str
+            The numpy.memmap file mode.
+        """
+        _, dates_offset, values_offset, maps_offset = self._layout(self.header)
+        num_times = self.header["num_times"]
+        self.cloud_dates = numpy.memmap(self.map_file, dtype="<f8", mode=mode, offset=dates_offset,
+                                        shape=(num_times,))
+        self.cloud_values = numpy.memmap(self.map_file, dtype="<f8", mode=mode, offset=values_offset,
+                                         shape=(num_times,))
+        self.cloud_maps = numpy.memmap(self.map_file, dtype=self.header["dtype"], mode=mode,
+                                       offset=maps_offset,
+                                       shape=(num_times, self.header["num_alt"], self.header["num_az"]))
+        self.alt_step = (self.header["alt_max"] - self.header["alt_min"]) / self.header["num_alt"]
+        self.az_step = 360.0 / self.header["num_az"]
+
+    @classmethod
+    def create(cls, time_handler, map_file, dates, num_alt, num_az, alt_min=0.0, alt_max=90.0,
+               metadata=None, dtype="<f4"):
+        """Create a new cloud map file for filling.
+
+        Parameters
+        ----------
+        time_handler : :class:`.TimeHandler`
+            The instance of the simulation time handler.
+        map_file : str
+            The full path to the cloud map file.
+        dates : numpy.ndarray
+            The times (units=seconds) since the start of the year of the maps. Must be increasing.
+        num_alt : int
+            The number of altitude grid cells.
+        num_az : int
+            The number of azimuth grid cells.
+        alt_min : float, optional
+            The lowest altitude (units=degrees) of the grid.
+        alt_max : float, optional
+            The highest altitude (units=degrees) of the grid.
+        metadata : dict, optional
+            Extra information to store in the header, e.g. the source of the maps.
+        dtype : str, optional
+            The numpy type for the stored cloud. Default is little-endian float32.
+
+        Returns
+        -------
+        :class:`.CloudMapModel`
+            The instance with writable arrays.
+        """
+        header = {"num_times": len(dates), "num_alt": int(num_alt), "num_az": int(num_az),
+                  "alt_min": float(alt_min), "alt_max": float(alt_max), "dtype": dtype,
+                  "metadata": metadata if metadata is not None else {}}
+        encoded_header, _, _, maps_offset = cls._layout(header)
+        file_size = maps_offset + header["num_times"] * num_alt * num_az * numpy.dtype(dtype).itemsize
+
+        with open(map_file, "wb") as ofile:
+            ofile.write(cls.MAGIC)
+            ofile.write(struct.pack("<Q", len(encoded_header)))
+            ofile.write(encoded_header)
+            ofile.truncate(file_size)
+
+        model = cls(time_handler)
+        model.map_file = map_file
+        model.header = header
+        model._map("r+")
+        model.cloud_dates[:] = dates
+        return model
+
+    def flush(self):
+        """Write any changes in the arrays to the cloud map file.
+        """
+        self.cloud_dates.flush()
+        self.cloud_values.flush()
+        self.cloud_maps.flush()
+
+    def get_cloud_at(self, delta_time, altitude, azimuth):
+        """Get the cloud for a pointing at the specified time.
+
+        Parameters
+        ----------
+        delta_time : float or numpy.ndarray
+            The time (seconds) from the start of the simulation.
+        altitude : float or numpy.ndarray
+            The altitude (units=degrees) of the pointing.
+        azimuth : float or numpy.ndarray
+            The azimuth (units=degrees) of the pointing.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The cloud (fraction of the grid cell in 8ths) closest to the specified time and pointing.
+        """
+        alt_index = ((numpy.asarray(altitude) - self.header["alt_min"]) / self.alt_step).astype(int)
+        alt_index = numpy.clip(alt_index, 0, self.header["num_alt"] - 1)
+        az_index = ((numpy.asarray(azimuth) % 360.0) / self.az_step).astype(int) % self.header["num_az"]
+        return self.cloud_maps[self.get_time_index(delta_time), alt_index, az_index]
+
+    def get_time_index(self, delta_time):
+        """Get the index of the map closest to the specified time.
+
+        Parameters
+        ----------
+        delta_time : float or numpy.ndarray
+            The time (seconds) from the start of the simulation.
+
+        Returns
+        -------
+        int or numpy.ndarray
+        """
+        dates = (numpy.asarray(delta_time) + self.offset) % self.cloud_dates[-1]
+        idx = numpy.searchsorted(self.cloud_dates, dates)
+        # searchsorted ensures that left < date <= right
+        # but we need to know if date is closer to left or to right
+        left = self.cloud_dates[idx - 1]
+        right = self.cloud_dates[idx]
+        return numpy.where(dates - left < right - dates, idx - 1, idx)
+
+    def initialize(self, map_file, stream_window=0.0):
+        """Map the information from a cloud map file.
+
+        Parameters
+        ----------
+        map_file : str
+            The full path to the cloud map file.
+        stream_window : float, optional
+            Not used, since the maps are memory-mapped.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a cloud map file.
+        """
+        self.map_file = map_file
+        self.cloud_db = map_file
+        with open(self.map_file, "rb") as ifile:
+            magic = ifile.read(len(self.MAGIC))
+            if magic != self.MAGIC:
+                raise ValueError("{} is not a cloud map file.".format(self.map_file))
+            header_size = struct.unpack("<Q", ifile.read(struct.calcsize("<Q")))[0]
+            self.header = json.loads(ifile.read(header_size).decode("utf-8"))
+        self._map("r")
+
+    def set_map(self, time_index, cloud_map):
+        """Store the cloud map for one time.
+
+        The sky averaged cloud is calculated with the grid cells weighted by their solid angle.
+
+        Parameters
+        ----------
+        time_index : int
+            The index of the map time.
+        cloud_map : numpy.ndarray
+            The cloud with shape (number of altitudes, number of azimuths).
+        """
+        self.cloud_maps[time_index] = cloud_map
+        alt_centers = self.header["alt_min"] + self.alt_step * (numpy.arange(self.header["num_alt"]) + 0.5)
+        weights = numpy.cos(numpy.radians(alt_centers))
+        self.cloud_values[time_index] = numpy.average(numpy.asarray(cloud_map).mean(axis=1), weights=weights)
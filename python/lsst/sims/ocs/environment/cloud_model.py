@@ -2,7 +2,10 @@ from builtins import object
 from datetime import datetime
 import numpy
 import os
-import sqlite3
+
+from lsst.sims.ocs.environment import ColumnCache, SharedColumns, StreamedSeries, WeatherGenerator
+from lsst.sims.ocs.environment import make_source
+from lsst.sims.ocs.utilities.constants import SECONDS_IN_DAY
 
 __all__ = ["CloudModel"]
 
@@ -16,14 +19,23 @@ class CloudModel(object):
     CLOUD_DB = "cloud.db"
     """Filename of the internal cloud observation database."""
 
-    def __init__(self, time_handler):
+    def __init__(self, time_handler, shared_memory=False):
         """Initialize the class.
 
         Parameters
         ----------
         time_handler : :class:`.TimeHandler`
             The instance of the simulation time handler.
+        shared_memory : bool, optional
+            Flag for attaching the cloud information from POSIX shared memory.
         """
+        self.shared_memory = shared_memory
+        self.shared_columns = None
+        self.stream = None
+        self.sample_range = (0.0, 0.0)
+        self.last_cloud = None
+        self.topics_published = 0
+        self.topics_unchanged = 0
         self.cloud_db = None
         self.cloud_dates = None
         self.cloud_values = None
@@ -31,6 +43,18 @@ class CloudModel(object):
         self.offset = time_handler.time_since_given_datetime(model_time_start,
                                                              reverse=True)
 
+    def detach(self):
+        """Release the cloud information attached from shared memory or streamed from a source.
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.shared_columns is not None:
+            self.cloud_dates = None
+            self.cloud_values = None
+            self.shared_columns.detach()
+            self.shared_columns = None
+
     def get_cloud(self, delta_time):
         """Get the cloud for the specified time.
 
@@ -44,18 +68,92 @@ class CloudModel(object):
         float
             The cloud (fraction of sky in 8ths) closest to the specified time.
         """
-        delta_time += self.offset
-        date = delta_time % self.cloud_dates[-1]
-        idx = numpy.searchsorted(self.cloud_dates, date)
-        # searchsorted ensures that left < date < right
+        return self.get_cloud_for_times(delta_time)
+
+    def get_cloud_at(self, delta_time, altitude, azimuth):
+        """Get the cloud for a pointing at the specified time.
+
+        The cloud information covers the whole sky, so the pointing does not change the cloud.
+
+        Parameters
+        ----------
+        delta_time : int
+            The time (seconds) from the start of the simulation.
+        altitude : float
+            The altitude (units=degrees) of the pointing.
+        azimuth : float
+            The azimuth (units=degrees) of the pointing.
+
+        Returns
+        -------
+        float
+            The cloud (fraction of sky in 8ths) closest to the specified time.
+        """
+        return self.get_cloud(delta_time)
+
+    def get_cloud_for_times(self, delta_times):
+        """Get the clouds for a set of times.
+
+        Parameters
+        ----------
+        delta_times : numpy.ndarray
+            The times (seconds) from the start of the simulation.
+
+        Returns
+        -------
+        numpy.ndarray
+            The clouds (fraction of sky in 8ths) closest to the specified times.
+        """
+        if self.stream is not None:
+            return self.stream.get_values(numpy.asarray(delta_times) + self.offset)
+
+        dates = (numpy.asarray(delta_times) + self.offset) % self.cloud_dates[-1]
+        idx = numpy.searchsorted(self.cloud_dates, dates)
+        # searchsorted ensures that left < date <= right
         # but we need to know if date is closer to left or to right
         left = self.cloud_dates[idx - 1]
         right = self.cloud_dates[idx]
-        if date - left < right - date:
-            idx -= 1
+        idx = numpy.where(dates - left < right - dates, idx - 1, idx)
         return self.cloud_values[idx]
 
-    def initialize(self, cloud_file=""):
+    def get_sample_range(self, delta_time):
+        """Get the range of times with the same nearest cloud sample as the specified time.
+
+        Parameters
+        ----------
+        delta_time : float
+            The time (seconds) from the start of the simulation.
+
+        Returns
+        -------
+        tuple(float, float)
+            The start and end times (seconds) from the start of the simulation. The end time is not
+            included. The range is empty when the nearest sample is the first or last loaded sample.
+        """
+        if self.stream is not None:
+            date = (delta_time + self.offset) % self.stream.period
+            self.stream.load(date, date)
+            dates = self.stream.dates
+        else:
+            date = (delta_time + self.offset) % self.cloud_dates[-1]
+            dates = self.cloud_dates
+
+        idx = numpy.searchsorted(dates, date)
+        if idx == 0 or idx == dates.size:
+            sample_range = (delta_time, delta_time)
+        else:
+            if date - dates[idx - 1] < dates[idx] - date:
+                idx -= 1
+            if idx == 0 or idx == dates.size - 1:
+                sample_range = (delta_time, delta_time)
+            else:
+                # Times at the midpoint between two samples take the later sample.
+                start = 0.5 * (dates[idx - 1] + dates[idx])
+                end = 0.5 * (dates[idx] + dates[idx + 1])
+                sample_range = (delta_time - (date - start), delta_time + (end - date))
+        return sample_range
+
+    def initialize(self, cloud_file="", stream_window=0.0):
         """Configure the cloud information.
 
         This function gets the appropriate database file and creates the cloud information
@@ -73,31 +171,90 @@ class CloudModel(object):
         Parameters
         ----------
         cloud_file : str, optional
-            The full path to an alternate cloud database.
+            The full path to an alternate cloud database. When streaming, this can also be a CSV
+            (.csv) or structured numpy (.npy) file with the date and cloud columns.
+        stream_window : float, optional
+            The window (units=days) of cloud information kept in memory. Default is to load all of
+            the cloud information.
         """
         if cloud_file != "":
             self.cloud_db = cloud_file
         else:
             self.cloud_db = os.path.join(os.path.dirname(__file__), self.CLOUD_DB)
 
-        with sqlite3.connect(self.cloud_db) as conn:
-            cur = conn.cursor()
-            query = "select c_date, cloud from Cloud order by c_date;"
-            cur.execute(query)
-            results = numpy.array(cur.fetchall())
-            self.cloud_dates = numpy.hsplit(results, 2)[0].flatten()
-            self.cloud_values = numpy.hsplit(results, 2)[1].flatten()
-            cur.close()
+        query = "select c_date, cloud from Cloud order by c_date;"
+        names = ("c_date", "cloud")
+        column_cache = ColumnCache(self.cloud_db)
+        if stream_window > 0:
+            source = make_source(self.cloud_db, "Cloud", names[0], names[1])
+            self.stream = StreamedSeries(source, stream_window * SECONDS_IN_DAY)
+            columns = (None, None)
+        elif self.shared_memory:
+            self.shared_columns = SharedColumns(column_cache.get_key(query))
+            columns = self.shared_columns.attach(lambda: column_cache.load(query, names))
+        else:
+            columns = column_cache.load(query, names)
+        self.cloud_dates, self.cloud_values = columns
 
-    def set_topic(self, th, topic):
+    def set_topic(self, th, topic, on_change=False):
         """Set the cloud information into the topic.
 
+        When only publishing changes, the lookup is skipped while the time has the same nearest
+        cloud sample as the last lookup and the topic is not set when the cloud is the same as the
+        last published value. The receiver keeps the last published value until a new one arrives.
+
         Parameters
         ----------
         th : :class:`TimeHandler`
             A time handling instance.
         topic : SALPY_scheduler.scheduler_cloudC
             An instance of the cloud topic.
+        on_change : bool, optional
+            Flag for only setting the topic when the cloud changes.
+
+        Returns
+        -------
+        bool
+            True if the topic was set and needs publishing.
+        """
+        delta_time = th.time_since_start
+        if on_change and self.sample_range[0] <= delta_time < self.sample_range[1]:
+            publish = False
+        else:
+            cloud = self.get_cloud(delta_time)
+            if on_change:
+                self.sample_range = self.get_sample_range(delta_time)
+            publish = bool(not on_change or cloud != self.last_cloud)
+            if publish:
+                topic.timestamp = th.current_timestamp
+                topic.cloud = cloud
+                self.last_cloud = cloud
+        if publish:
+            self.topics_published += 1
+        else:
+            self.topics_unchanged += 1
+        return publish
+
+    def synthesize(self, duration, seed=None):
+        """Replace the cloud information with a synthesized series.
+
+        The synthesized series has the seasonal distribution and time correlation of the current
+        cloud information, but does not repeat over the given duration. Streamed information is
+        read in full for the fit and is no longer streamed afterwards.
+
+        Parameters
+        ----------
+        duration : float
+            The length (units=seconds) of the simulation.
+        seed : int, optional
+            The seed for the weather generator.
         """
-        topic.timestamp = th.current_timestamp
-        topic.cloud = self.get_cloud(th.time_since_start)
+        if self.stream is not None:
+            columns = self.stream.source.read_window(0.0, self.stream.period + 1.0)
+            self.cloud_dates, self.cloud_values = columns
+        generator = WeatherGenerator(seed)
+        generator.fit(self.cloud_dates, self.cloud_values)
+        dates, values = generator.generate(duration + self.offset + generator.step)
+        self.detach()
+        self.cloud_dates = dates
+        self.cloud_values = values
@@ -0,0 +1,245 @@
+from builtins import object
+import hashlib
+import logging
+import numpy
+import os
+import sqlite3
+import tempfile
+
+__all__ = ["ColumnCache"]
+
+class ColumnCache(object):
+    """Handle binary caches of columns from a SQLite database.
+
+    This class reads a set of columns from a SQLite database and stores each of them as a
+    numpy .npy file. The cache files are named after the hash of the database file contents and the
+    query, so a changed database automatically gets new cache files. Later loads memory-map the cache
+    files instead of running the query, so many simulations using the same database share one
+    physical copy of the information. The cache files are kept in a user cache directory, so the
+    database directory, e.g. an installed package, is never written to. The contents hash is stored
+    in the cache directory under the database path, size and modification time, so the database is
+    only read for the hash when one of those changes.
+
+    Attributes
+    ----------
+    db_file : str
+        The full path to the SQLite database.
+    db_digest : str or None
+        The hash of the database file contents once it is known.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    CACHE_DIR_ENV = "SIMS_OCS_CACHE_DIR"
+    """Environment variable for overriding the user cache directory."""
+    READ_SIZE = 1024 * 1024
+    """Size (units=bytes) of the blocks read when hashing the database file."""
+
+    def __init__(self, db_file):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        db_file : str
+            The full path to the SQLite database.
+        """
+        self.db_file = db_file
+        self.db_digest = None
+        self.log = logging.getLogger("environment.ColumnCache")
+
+    @property
+    def cache_directory(self):
+        """str: The user cache directory for the cache files.
+        """
+        cache_dir = os.environ.get(self.CACHE_DIR_ENV)
+        if cache_dir is None:
+            xdg_cache_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+            cache_dir = os.path.join(xdg_cache_dir, "sims_ocs")
+        return cache_dir
+
+    def cache_files(self, query, names):
+        """Get the cache file names for the query columns.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query that produces the columns.
+        names : list[str]
+            The names of the columns from the query.
+
+        Returns
+        -------
+        list[str]
+        """
+        key = self.get_key(query)
+        basename = os.path.splitext(os.path.basename(self.db_file))[0]
+        return [os.path.join(self.cache_directory, "{}.{}.{}.npy".format(basename, key, name))
+                for name in names]
+
+    def get_db_digest(self):
+        """Get the hash of the database file contents.
+
+        The hash is looked up in the cache directory under the database path, size and modification
+        time. The database file is only hashed if the cache directory does not have it, and the hash
+        is then stored for the next simulation.
+
+        Returns
+        -------
+        str
+        """
+        if self.db_digest is None:
+            db_file = os.path.abspath(self.db_file)
+            stat = os.stat(db_file)
+            stamp = hashlib.sha1("{}:{}:{}".format(db_file, stat.st_size,
+                                                   stat.st_mtime).encode("utf-8")).hexdigest()[:16]
+            basename = os.path.splitext(os.path.basename(db_file))[0]
+            digest_file = os.path.join(self.cache_directory, "{}.{}.digest".format(basename, stamp))
+            if os.path.exists(digest_file):
+                with open(digest_file) as ifile:
+                    self.db_digest = ifile.read().strip()
+            else:
+                digest = hashlib.sha1()
+                with open(db_file, "rb") as ifile:
+                    block = ifile.read(self.READ_SIZE)
+                    while block:
+                        digest.update(block)
+                        block = ifile.read(self.READ_SIZE)
+                self.db_digest = digest.hexdigest()
+                self.log.debug("Hashed {} for the cache key.".format(db_file))
+                try:
+                    self.write_digest_file(digest_file)
+                except (IOError, OSError) as err:
+                    self.log.debug("Cannot write {}: {}".format(digest_file, err))
+        return self.db_digest
+
+    def get_key(self, query):
+        """Create the cache key from the database contents and the query.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query that produces the columns.
+
+        Returns
+        -------
+        str
+        """
+        digest = hashlib.sha1(self.get_db_digest().encode("utf-8"))
+        digest.update(query.encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def load(self, query, names):
+        """Load the columns for the query.
+
+        The columns are memory-mapped from the cache files if they exist. Otherwise, the query is run
+        on the database and the cache files are written for the next load. If the cache directory is
+        not writable, the columns from the query are returned directly.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query that produces the columns.
+        names : list[str]
+            The names of the columns from the query.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+            The information for each column.
+        """
+        cache_files = self.cache_files(query, names)
+        if all([os.path.exists(cache_file) for cache_file in cache_files]):
+            self.log.debug("Loading {} from cache in {}.".format(self.db_file, self.cache_directory))
+            return [numpy.load(cache_file, mmap_mode="r") for cache_file in cache_files]
+
+        columns = self.read_columns(query, len(names))
+        try:
+            self.write_cache_files(cache_files, columns)
+        except (IOError, OSError) as err:
+            self.log.warning("Cannot write cache for {} in {}: {}".format(self.db_file, self.cache_directory,
+                                                                          err))
+            return columns
+        return [numpy.load(cache_file, mmap_mode="r") for cache_file in cache_files]
+
+    def make_directory(self, directory):
+        """Create a cache directory if it does not exist.
+
+        Parameters
+        ----------
+        directory : str
+            The cache directory.
+        """
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another simulation may have created the directory.
+                if not os.path.isdir(directory):
+                    raise
+
+    def read_columns(self, query, num_columns):
+        """Read the columns for the query from the database.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query that produces the columns.
+        num_columns : int
+            The number of columns from the query.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+        """
+        with sqlite3.connect(self.db_file) as conn:
+            cur = conn.cursor()
+            cur.execute(query)
+            results = numpy.array(cur.fetchall())
+            cur.close()
+        return [column.flatten() for column in numpy.hsplit(results, num_columns)]
+
+    def write_cache_files(self, cache_files, columns):
+        """Write the columns to the cache files.
+
+        Each file is written to a temporary name and then moved in place so concurrent simulations
+        never see a partial file.
+
+        Parameters
+        ----------
+        cache_files : list[str]
+            The cache file names.
+        columns : list[numpy.ndarray]
+            The information for each column.
+        """
+        self.make_directory(self.cache_directory)
+        for cache_file, column in zip(cache_files, columns):
+            fd, temp_file = tempfile.mkstemp(suffix=".npy", dir=self.cache_directory)
+            try:
+                with os.fdopen(fd, "wb") as ofile:
+                    numpy.save(ofile, column)
+                os.chmod(temp_file, 0o644)
+                os.rename(temp_file, cache_file)
+            except Exception:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                raise
+
+    def write_digest_file(self, digest_file):
+        """Write the hash of the database file contents.
+
+        Parameters
+        ----------
+        digest_file : str
+            The file for the hash.
+        """
+        self.make_directory(os.path.dirname(digest_file))
+        fd, temp_file = tempfile.mkstemp(suffix=".digest", dir=os.path.dirname(digest_file))
+        try:
+            with os.fdopen(fd, "w") as ofile:
+                ofile.write(self.db_digest)
+            os.chmod(temp_file, 0o644)
+            os.rename(temp_file, digest_file)
+        except Exception:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
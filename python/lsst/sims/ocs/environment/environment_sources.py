@@ -0,0 +1,368 @@
+from builtins import object
+import csv
+import io
+import numpy
+import os
+import sqlite3
+import threading
+
+__all__ = ["EnvironmentSource", "SqliteSource", "CsvSource", "NpySource", "make_source"]
+
+class EnvironmentSource(object):
+    """Base class for time ordered environment information sources.
+
+    A source provides the (date, value) rows of an environment series for a range of dates, so the
+    series never needs to be fully in memory. The dates are the times (units=seconds) since the start
+    of the series year and must be increasing.
+    """
+
+    def close(self):
+        """Release any resources held by the source.
+        """
+        pass
+
+    def get_last(self):
+        """Get the last row of the series.
+
+        Returns
+        -------
+        tuple(float, float)
+            The date and value of the last row.
+        """
+        raise NotImplementedError("Sources must provide the last row.")
+
+    def read_window(self, start, end):
+        """Read the rows for a range of dates.
+
+        The rows with start <= date < end are returned together with the row immediately before
+        start and the row immediately at or after end, if they exist, so that the nearest row of any
+        date in the range can be found.
+
+        Parameters
+        ----------
+        start : float
+            The start date (units=seconds) of the range.
+        end : float
+            The end date (units=seconds) of the range.
+
+        Returns
+        -------
+        tuple(numpy.ndarray)
+            The dates and values of the rows.
+        """
+        raise NotImplementedError("Sources must provide a window of rows.")
+
+class SqliteSource(EnvironmentSource):
+    """Environment information from a SQLite database table.
+
+    Attributes
+    ----------
+    db_file : str
+        The full path to the SQLite database.
+    table : str
+        The name of the table with the information.
+    date_column : str
+        The name of the date column.
+    value_column : str
+        The name of the value column.
+    """
+
+    def __init__(self, db_file, table, date_column, value_column):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        db_file : str
+            The full path to the SQLite database.
+        table : str
+            The name of the table with the information.
+        date_column : str
+            The name of the date column.
+        value_column : str
+            The name of the value column.
+        """
+        self.db_file = db_file
+        self.table = table
+        self.date_column = date_column
+        self.value_column = value_column
+
+    def get_last(self):
+        """Get the last row of the series.
+
+        Returns
+        -------
+        tuple(float, float)
+        """
+        query = "select {0}, {1} from {2} order by {0} desc limit 1;".format(self.date_column,
+                                                                             self.value_column, self.table)
+        return tuple(float(x) for x in self.run_queries([(query, ())])[0])
+
+    def read_window(self, start, end):
+        """Read the rows for a range of dates.
+
+        Parameters
+        ----------
+        start : float
+            The start date (units=seconds) of the range.
+        end : float
+            The end date (units=seconds) of the range.
+
+        Returns
+        -------
+        tuple(numpy.ndarray)
+        """
+        columns = "select {}, {} from {}".format(self.date_column, self.value_column, self.table)
+        queries = [("{} where {} < ? order by {} desc limit 1;".format(columns, self.date_column,
+                                                                       self.date_column), (start,)),
+                   ("{} where {} >= ? and {} < ? order by {};".format(columns, self.date_column,
+                                                                      self.date_column, self.date_column),
+                    (start, end)),
+                   ("{} where {} >= ? order by {} limit 1;".format(columns, self.date_column,
+                                                                   self.date_column), (end,))]
+        rows = self.run_queries(queries)
+        results = numpy.array(rows, dtype=float).reshape(-1, 2)
+        return results[:, 0].copy(), results[:, 1].copy()
+
+    def run_queries(self, queries):
+        """Run a set of queries on a new connection.
+
+        A connection is made for each call, so the source can be used from a prefetch thread.
+
+        Parameters
+        ----------
+        queries : list[tuple(str, tuple)]
+            The queries and their parameters.
+
+        Returns
+        -------
+        list[tuple]
+            The rows from all of the queries.
+        """
+        rows = []
+        with sqlite3.connect(self.db_file) as conn:
+            cur = conn.cursor()
+            for query, parameters in queries:
+                cur.execute(query, parameters)
+                rows.extend(cur.fetchall())
+            cur.close()
+        return rows
+
+class CsvSource(EnvironmentSource):
+    """Environment information from a CSV file.
+
+    The file is read forward as the requested dates increase, so only the rows of the requested
+    range are kept in memory. A request for earlier dates restarts the read from the top of the file.
+    A first line that does not parse as numbers is treated as a header.
+
+    Attributes
+    ----------
+    filename : str
+        The full path to the CSV file.
+    date_column : int
+        The index of the date column.
+    value_column : int
+        The index of the value column.
+    """
+
+    TAIL_SIZE = 4096
+    """Size (units=bytes) of the block read from the end of the file to find the last row."""
+
+    def __init__(self, filename, date_column=0, value_column=1):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        filename : str
+            The full path to the CSV file.
+        date_column : int, optional
+            The index of the date column.
+        value_column : int, optional
+            The index of the value column.
+        """
+        self.filename = filename
+        self.date_column = date_column
+        self.value_column = value_column
+        self.ifile = None
+        self.reader = None
+        self.previous_row = None
+        self.pending_row = None
+        self.lock = threading.Lock()
+
+    def close(self):
+        """Close the CSV file.
+        """
+        if self.ifile is not None:
+            self.ifile.close()
+            self.ifile = None
+            self.reader = None
+
+    def get_last(self):
+        """Get the last row of the series.
+
+        Returns
+        -------
+        tuple(float, float)
+        """
+        with open(self.filename, "rb") as ifile:
+            ifile.seek(0, os.SEEK_END)
+            size = ifile.tell()
+            ifile.seek(max(size - self.TAIL_SIZE, 0))
+            lines = [line for line in ifile.read().decode("utf-8").splitlines() if line.strip()]
+        return self.parse_row(next(csv.reader([lines[-1]])))
+
+    def next_row(self):
+        """Read the next data row from the file.
+
+        Returns
+        -------
+        tuple(float, float) or None
+            The date and value of the row. None at the end of the file.
+        """
+        for fields in self.reader:
+            if fields:
+                try:
+                    return self.parse_row(fields)
+                except ValueError:
+                    # Header line
+                    continue
+        return None
+
+    def parse_row(self, fields):
+        """Get the date and value from the fields of a row.
+
+        Parameters
+        ----------
+        fields : list[str]
+            The fields of the row.
+
+        Returns
+        -------
+        tuple(float, float)
+        """
+        return (float(fields[self.date_column]), float(fields[self.value_column]))
+
+    def read_window(self, start, end):
+        """Read the rows for a range of dates.
+
+        Parameters
+        ----------
+        start : float
+            The start date (units=seconds) of the range.
+        end : float
+            The end date (units=seconds) of the range.
+
+        Returns
+        -------
+        tuple(numpy.ndarray)
+        """
+        with self.lock:
+            if self.reader is None or (self.previous_row is not None and self.previous_row[0] >= start):
+                self.close()
+                self.ifile = io.open(self.filename, "r", newline="")
+                self.reader = csv.reader(self.ifile)
+                self.previous_row = None
+                self.pending_row = self.next_row()
+
+            while self.pending_row is not None and self.pending_row[0] < start:
+                self.previous_row = self.pending_row
+                self.pending_row = self.next_row()
+
+            rows = [] if self.previous_row is None else [self.previous_row]
+            while self.pending_row is not None and self.pending_row[0] < end:
+                rows.append(self.pending_row)
+                self.previous_row = self.pending_row
+                self.pending_row = self.next_row()
+            if self.pending_row is not None:
+                rows.append(self.pending_row)
+
+        results = numpy.array(rows, dtype=float).reshape(-1, 2)
+        return results[:, 0].copy(), results[:, 1].copy()
+
+class NpySource(EnvironmentSource):
+    """Environment information from a columnar numpy file.
+
+    The file holds a structured array with date and value fields. It is memory-mapped, so only the
+    pages of the requested ranges are read.
+
+    Attributes
+    ----------
+    filename : str
+        The full path to the numpy file.
+    dates : numpy.ndarray
+        The memory-mapped date column.
+    values : numpy.ndarray
+        The memory-mapped value column.
+    """
+
+    def __init__(self, filename, date_field, value_field):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        filename : str
+            The full path to the numpy file.
+        date_field : str
+            The name of the date field.
+        value_field : str
+            The name of the value field.
+        """
+        self.filename = filename
+        data = numpy.load(filename, mmap_mode="r")
+        self.dates = data[date_field]
+        self.values = data[value_field]
+
+    def get_last(self):
+        """Get the last row of the series.
+
+        Returns
+        -------
+        tuple(float, float)
+        """
+        return (float(self.dates[-1]), float(self.values[-1]))
+
+    def read_window(self, start, end):
+        """Read the rows for a range of dates.
+
+        Parameters
+        ----------
+        start : float
+            The start date (units=seconds) of the range.
+        end : float
+            The end date (units=seconds) of the range.
+
+        Returns
+        -------
+        tuple(numpy.ndarray)
+        """
+        first = max(numpy.searchsorted(self.dates, start) - 1, 0)
+        last = min(numpy.searchsorted(self.dates, end) + 1, self.dates.size)
+        return (numpy.array(self.dates[first:last], dtype=float),
+                numpy.array(self.values[first:last], dtype=float))
+
+def make_source(filename, table, date_column, value_column):
+    """Create the environment source for a file based on its extension.
+
+    Parameters
+    ----------
+    filename : str
+        The full path to the information file. CSV files (.csv) use the first two columns, numpy
+        files (.npy) use the date and value fields and all other files are SQLite databases.
+    table : str
+        The name of the database table.
+    date_column : str
+        The name of the date column.
+    value_column : str
+        The name of the value column.
+
+    Returns
+    -------
+    :class:`.EnvironmentSource`
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        source = CsvSource(filename)
+    elif extension == ".npy":
+        source = NpySource(filename, date_column, value_column)
+    else:
+        source = SqliteSource(filename, table, date_column, value_column)
+    return source
@@ -3,7 +3,10 @@ from builtins import object
 from datetime import datetime
 import numpy
 import os
-import sqlite3
+
+from lsst.sims.ocs.environment import ColumnCache, SharedColumns, StreamedSeries, WeatherGenerator
+from lsst.sims.ocs.environment import make_source
+from lsst.sims.ocs.utilities.constants import SECONDS_IN_DAY
 
 __all__ = ["SeeingModel"]
 
@@ -19,21 +22,37 @@ class SeeingModel(object):
     AIRMASS_CORRECTION_POWER = 0.6
     FILTER_WAVELENGTH_CORRECTION_POWER = 0.3
     RAW_SEEING_WAVELENGTH = 500  # nm
+    FILTERS = ("u", "g", "r", "i", "z", "y")
+    """The set of filters with precomputed wavelength corrections."""
+    MAX_TABLE_AIRMASS = 5.0
+    """The largest airmass in the airmass correction lookup table."""
 
-    def __init__(self, time_handler):
+    def __init__(self, time_handler, shared_memory=False):
         """Initialize the class.
 
         Parameters
         ----------
         time_handler : :class:`.TimeHandler`
             The instance of the simulation time handler.
+        shared_memory : bool, optional
+            Flag for attaching the seeing information from POSIX shared memory.
         """
+        self.shared_memory = shared_memory
+        self.shared_columns = None
+        self.stream = None
+        self.sample_range = (0.0, 0.0)
+        self.last_seeing = None
+        self.topics_published = 0
+        self.topics_unchanged = 0
         self.seeing_db = None
         self.seeing_dates = None
         self.seeing_values = None
         self.environment_config = None
         self.filters_config = None
         self.seeing_fwhm_system_zenith = None
+        self.filter_wavelength_corrections = None
+        self.airmass_grid = None
+        self.airmass_corrections = None
         model_time_start = datetime(time_handler.initial_dt.year, 1, 1)
         self.offset = time_handler.time_since_given_datetime(model_time_start,
                                                              reverse=True)
@@ -58,16 +77,111 @@ class SeeingModel(object):
         if filter_name == '':
             return (-1.0, -1.0, -1.0)
         fwhm_500 = self.get_seeing(delta_time)
-        airmass_correction = numpy.power(airmass, self.AIRMASS_CORRECTION_POWER)
-        filter_wavelength_correction = numpy.power(self.RAW_SEEING_WAVELENGTH /
-                                                   self.filters_config.get_effective_wavelength(filter_name),
-                                                   self.FILTER_WAVELENGTH_CORRECTION_POWER)
+        fwhm_geometric, fwhm_effective = self.correct_seeing(fwhm_500,
+                                                             self.filter_wavelength_corrections[filter_name],
+                                                             self.get_airmass_correction(airmass))
+
+        return (fwhm_500, fwhm_geometric, fwhm_effective)
+
+    def calculate_seeing_for_times(self, delta_times, filter_names, airmasses):
+        """Calculate the geometric and effective seeing values for a set of observations.
+
+        Parameters
+        ----------
+        delta_times : numpy.ndarray
+            The times (seconds) from the start of the simulation.
+        filter_names : numpy.ndarray
+            The single character filter names for the calculation.
+        airmasses : numpy.ndarray
+            The airmasses for the calculation.
+
+        Returns
+        -------
+        tuple(numpy.ndarray)
+            The FWHM 500nm, FWHM Geometric and FWHM Effective seeing values. Entries with an empty
+            filter name are set to -1.
+
+        Raises
+        ------
+        KeyError
+            If a filter name is not one of the configured filters.
+        """
+        filter_names = numpy.asarray(filter_names)
+        no_filter = filter_names == ''
+        unique_filters, filter_index = numpy.unique(filter_names, return_inverse=True)
+        # The empty filter name has no correction, since its entries are set to -1.
+        corrections = numpy.array([self.filter_wavelength_corrections[filter_name] if filter_name != ''
+                                   else 1.0 for filter_name in unique_filters.tolist()])
+        corrections = corrections[filter_index].reshape(filter_names.shape)
+
+        fwhm_500 = numpy.where(no_filter, -1.0, self.get_seeing_for_times(delta_times))
+        fwhm_geometric, fwhm_effective = self.correct_seeing(fwhm_500, corrections,
+                                                             self.get_airmass_correction(airmasses))
+        fwhm_geometric = numpy.where(no_filter, -1.0, fwhm_geometric)
+        fwhm_effective = numpy.where(no_filter, -1.0, fwhm_effective)
+
+        return (fwhm_500, fwhm_geometric, fwhm_effective)
+
+    def correct_seeing(self, fwhm_500, filter_wavelength_correction, airmass_correction):
+        """Apply the filter wavelength, airmass and system corrections to the seeing.
+
+        Parameters
+        ----------
+        fwhm_500 : float or numpy.ndarray
+            The FWHM 500nm seeing values.
+        filter_wavelength_correction : float or numpy.ndarray
+            The filter wavelength correction factors.
+        airmass_correction : float or numpy.ndarray
+            The airmass correction factors.
+
+        Returns
+        -------
+        tuple
+            The FWHM Geometric and FWHM Effective seeing values.
+        """
         fwhm_system = self.seeing_fwhm_system_zenith * airmass_correction
         fwhm_geometric = fwhm_500 * filter_wavelength_correction * airmass_correction
         temp1 = numpy.sqrt(fwhm_system**2 + self.environment_config.geom_eff_factor * fwhm_geometric**2)
         fwhm_effective = self.environment_config.scale_to_eff * temp1
 
-        return (fwhm_500, fwhm_geometric, fwhm_effective)
+        return (fwhm_geometric, fwhm_effective)
+
+    def detach(self):
+        """Release the seeing information attached from shared memory or streamed from a source.
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.shared_columns is not None:
+            self.seeing_dates = None
+            self.seeing_values = None
+            self.shared_columns.detach()
+            self.shared_columns = None
+
+    def get_airmass_correction(self, airmass):
+        """Get the seeing correction factor for the airmass.
+
+        The factor comes from the lookup table if one was created and the airmass is within the
+        table. Otherwise, it is calculated directly.
+
+        Parameters
+        ----------
+        airmass : float or numpy.ndarray
+            The airmass for the correction.
+
+        Returns
+        -------
+        float or numpy.ndarray
+        """
+        if self.airmass_grid is None:
+            correction = numpy.power(airmass, self.AIRMASS_CORRECTION_POWER)
+        else:
+            correction = numpy.interp(airmass, self.airmass_grid, self.airmass_corrections)
+            outside = numpy.asarray(airmass) > self.airmass_grid[-1]
+            if outside.any():
+                correction = numpy.where(outside, numpy.power(airmass, self.AIRMASS_CORRECTION_POWER),
+                                         correction)
+        return correction
 
     def get_seeing(self, delta_time):
         """Get the seeing for the specified time.
@@ -82,22 +196,76 @@ class SeeingModel(object):
         float
             The seeing (arcseconds) closest to the specified time.
         """
-        delta_time += self.offset
-        date = delta_time % self.seeing_dates[-1]
-        idx = numpy.searchsorted(self.seeing_dates, date)
-        # searchsorted ensures that left < date < right
+        return self.get_seeing_for_times(delta_time)
+
+    def get_seeing_for_times(self, delta_times):
+        """Get the seeing for a set of times.
+
+        Parameters
+        ----------
+        delta_times : numpy.ndarray
+            The times (seconds) from the start of the simulation.
+
+        Returns
+        -------
+        numpy.ndarray
+            The seeing (arcseconds) closest to the specified times.
+        """
+        if self.stream is not None:
+            return self.stream.get_values(numpy.asarray(delta_times) + self.offset)
+
+        dates = (numpy.asarray(delta_times) + self.offset) % self.seeing_dates[-1]
+        idx = numpy.searchsorted(self.seeing_dates, dates)
+        # searchsorted ensures that left < date <= right
         # but we need to know if date is closer to left or to right
         left = self.seeing_dates[idx - 1]
         right = self.seeing_dates[idx]
-        if date - left < right - date:
-            idx -= 1
+        idx = numpy.where(dates - left < right - dates, idx - 1, idx)
         return self.seeing_values[idx]
 
+    def get_sample_range(self, delta_time):
+        """Get the range of times with the same nearest seeing sample as the specified time.
+
+        Parameters
+        ----------
+        delta_time : float
+            The time (seconds) from the start of the simulation.
+
+        Returns
+        -------
+        tuple(float, float)
+            The start and end times (seconds) from the start of the simulation. The end time is not
+            included. The range is empty when the nearest sample is the first or last loaded sample.
+        """
+        if self.stream is not None:
+            date = (delta_time + self.offset) % self.stream.period
+            self.stream.load(date, date)
+            dates = self.stream.dates
+        else:
+            date = (delta_time + self.offset) % self.seeing_dates[-1]
+            dates = self.seeing_dates
+
+        idx = numpy.searchsorted(dates, date)
+        if idx == 0 or idx == dates.size:
+            sample_range = (delta_time, delta_time)
+        else:
+            if date - dates[idx - 1] < dates[idx] - date:
+                idx -= 1
+            if idx == 0 or idx == dates.size - 1:
+                sample_range = (delta_time, delta_time)
+            else:
+                # Times at the midpoint between two samples take the later sample.
+                start = 0.5 * (dates[idx - 1] + dates[idx])
+                end = 0.5 * (dates[idx] + dates[idx + 1])
+                sample_range = (delta_time - (date - start), delta_time + (end - date))
+        return sample_range
+
     def initialize(self, environment_config, filters_config):
         """Configure the seeing information.
 
         This function gets the environment and filters configuration, calculates the FWHM system
-        seeing at zenith and creates the seeing information from the appropriate database.
+        seeing at zenith and the filter wavelength corrections, creates the optional airmass correction
+        lookup table and creates the seeing information from the appropriate database.
         The default behavior is to use the module stored database. However, an
         alternate database file can be provided. The alternate database file needs to have a
         table called *Seeing* with the following columns:
@@ -109,6 +277,10 @@ class SeeingModel(object):
         seeing
             float : The FWHM of the atmospheric PSF (units=arcseconds).
 
+        If the environment configuration has a stream window, the seeing information is streamed
+        from the database, or from a CSV (.csv) or structured numpy (.npy) file, instead of being
+        loaded.
+
         Parameters
         ----------
         environment_config : :class:`.Environment`
@@ -122,30 +294,101 @@ class SeeingModel(object):
         self.seeing_fwhm_system_zenith = numpy.sqrt(self.environment_config.telescope_seeing**2 +
                                                     self.environment_config.optical_design_seeing**2 +
                                                     self.environment_config.camera_seeing**2)
+        self.filter_wavelength_corrections = {}
+        for filter_name in self.FILTERS:
+            wavelength = self.filters_config.get_effective_wavelength(filter_name)
+            correction = numpy.power(self.RAW_SEEING_WAVELENGTH / wavelength,
+                                     self.FILTER_WAVELENGTH_CORRECTION_POWER)
+            self.filter_wavelength_corrections[filter_name] = correction
+
+        step = self.environment_config.airmass_correction_step
+        if step > 0:
+            num_points = int(numpy.ceil((self.MAX_TABLE_AIRMASS - 1.0) / step)) + 1
+            self.airmass_grid = 1.0 + step * numpy.arange(num_points)
+            self.airmass_corrections = numpy.power(self.airmass_grid, self.AIRMASS_CORRECTION_POWER)
+        else:
+            self.airmass_grid = None
+            self.airmass_corrections = None
 
         if self.environment_config.seeing_db != "":
             self.seeing_db = self.environment_config.seeing_db
         else:
             self.seeing_db = os.path.join(os.path.dirname(__file__), self.SEEING_DB)
 
-        with sqlite3.connect(self.seeing_db) as conn:
-            cur = conn.cursor()
-            query = "select s_date, seeing from Seeing order by s_date;"
-            cur.execute(query)
-            results = numpy.array(cur.fetchall())
-            self.seeing_dates = numpy.hsplit(results, 2)[0].flatten()
-            self.seeing_values = numpy.hsplit(results, 2)[1].flatten()
-            cur.close()
+        query = "select s_date, seeing from Seeing order by s_date;"
+        names = ("s_date", "seeing")
+        stream_window = self.environment_config.stream_window
+        column_cache = ColumnCache(self.seeing_db)
+        if stream_window > 0:
+            source = make_source(self.seeing_db, "Seeing", names[0], names[1])
+            self.stream = StreamedSeries(source, stream_window * SECONDS_IN_DAY)
+            columns = (None, None)
+        elif self.shared_memory:
+            self.shared_columns = SharedColumns(column_cache.get_key(query))
+            columns = self.shared_columns.attach(lambda: column_cache.load(query, names))
+        else:
+            columns = column_cache.load(query, names)
+        self.seeing_dates, self.seeing_values = columns
 
-    def set_topic(self, th, topic):
+    def set_topic(self, th, topic, on_change=False):
         """Set the seeing information into the topic.
 
+        When only publishing changes, the lookup is skipped while the time has the same nearest
+        seeing sample as the last lookup and the topic is not set when the seeing is the same as the
+        last published value. The receiver keeps the last published value until a new one arrives.
+
         Parameters
         ----------
         th : :class:`.TimeHandler`
-            A time hadnling instance.
+            A time handling instance.
         topic : SALPY_scheduler.scheduler_seeingC
             An instance of the seeing topic.
+        on_change : bool, optional
+            Flag for only setting the topic when the seeing changes.
+
+        Returns
+        -------
+        bool
+            True if the topic was set and needs publishing.
+        """
+        delta_time = th.time_since_start
+        if on_change and self.sample_range[0] <= delta_time < self.sample_range[1]:
+            publish = False
+        else:
+            seeing = self.get_seeing(delta_time)
+            if on_change:
+                self.sample_range = self.get_sample_range(delta_time)
+            publish = bool(not on_change or seeing != self.last_seeing)
+            if publish:
+                topic.timestamp = th.current_timestamp
+                topic.seeing = seeing
+                self.last_seeing = seeing
+        if publish:
+            self.topics_published += 1
+        else:
+            self.topics_unchanged += 1
+        return publish
+
+    def synthesize(self, duration, seed=None):
+        """Replace the seeing information with a synthesized series.
+
+        The synthesized series has the seasonal distribution and time correlation of the current
+        seeing information, but does not repeat over the given duration. Streamed information is
+        read in full for the fit and is no longer streamed afterwards.
+
+        Parameters
+        ----------
+        duration : float
+            The length (units=seconds) of the simulation.
+        seed : int, optional
+            The seed for the weather generator.
         """
-        topic.timestamp = th.current_timestamp
-        topic.seeing = self.get_seeing(th.time_since_start)
+        if self.stream is not None:
+            columns = self.stream.source.read_window(0.0, self.stream.period + 1.0)
+            self.seeing_dates, self.seeing_values = columns
+        generator = WeatherGenerator(seed)
+        generator.fit(self.seeing_dates, self.seeing_values)
+        dates, values = generator.generate(duration + self.offset + generator.step)
+        self.detach()
+        self.seeing_dates = dates
+        self.seeing_values = values
@@ -0,0 +1,260 @@
+from builtins import object
+import contextlib
+import fcntl
+import json
+import logging
+import numpy
+import os
+import struct
+import tempfile
+
+try:
+    from multiprocessing import resource_tracker
+    from multiprocessing import shared_memory
+except ImportError:
+    resource_tracker = None
+    shared_memory = None
+
+__all__ = ["SharedColumns"]
+
+class SharedColumns(object):
+    """Handle read-only columns published in POSIX shared memory.
+
+    This class places a set of columns into a POSIX shared memory segment named after a content key.
+    The first process to attach creates the segment from the loader. Later processes map the same
+    segment and get zero-copy read-only views of the columns. The segment layout is a magic string,
+    the number of attached processes, the length of a JSON metadata header, the header itself and then
+    the column arrays, starting at the first aligned offset after the header. A lock file serializes
+    the creation, attachment and detachment and the last process to detach removes the segment.
+
+    Attributes
+    ----------
+    key : str
+        The content key for the columns.
+    name : str
+        The name of the shared memory segment.
+    lock_file : str
+        The full path to the lock file for the segment.
+    segment : multiprocessing.shared_memory.SharedMemory
+        The attached shared memory segment.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    MAGIC = b"SOCSSHM1"
+    """Identifier at the start of a shared memory segment."""
+    PREFIX = "socs_"
+    """Prefix for the shared memory segment names."""
+    ALIGNMENT = 64
+    """Byte alignment of the column arrays in the segment."""
+    HEADER_FORMAT = "<8sqq"
+    """Format of the magic string, attached process count and metadata length."""
+
+    def __init__(self, key):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        key : str
+            The content key for the columns.
+        """
+        self.key = key
+        self.name = "{}{}".format(self.PREFIX, key)
+        self.lock_file = os.path.join(tempfile.gettempdir(), "{}.lock".format(self.name))
+        self.segment = None
+        self.log = logging.getLogger("environment.SharedColumns")
+
+    @staticmethod
+    def available():
+        """Check if POSIX shared memory is available.
+
+        Returns
+        -------
+        bool
+        """
+        return shared_memory is not None
+
+    def attach(self, loader):
+        """Attach to the shared columns, creating them if necessary.
+
+        Parameters
+        ----------
+        loader : callable
+            Function that returns the list of column arrays. Only called if the segment does not exist.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+            The read-only information for each column.
+        """
+        if not self.available():
+            self.log.warning("Shared memory is not available, loading {} in process.".format(self.key))
+            return loader()
+
+        with self.locked():
+            try:
+                self.segment = self.open_segment(create=False)
+                self.log.debug("Attached to shared memory segment {}.".format(self.name))
+            except (IOError, OSError):
+                self.segment = self.create_segment(loader())
+                self.log.debug("Created shared memory segment {}.".format(self.name))
+            self.update_count(1)
+
+        return self.get_columns()
+
+    def create_segment(self, columns):
+        """Create the shared memory segment and copy the columns into it.
+
+        Parameters
+        ----------
+        columns : list[numpy.ndarray]
+            The information for each column.
+
+        Returns
+        -------
+        multiprocessing.shared_memory.SharedMemory
+        """
+        header_size = struct.calcsize(self.HEADER_FORMAT)
+        metadata = {"columns": []}
+        offset = 0
+        for column in columns:
+            column = numpy.ascontiguousarray(column)
+            metadata["columns"].append({"dtype": column.dtype.str, "shape": list(column.shape),
+                                        "offset": offset})
+            offset += self.padded(column.nbytes)
+        metadata_bytes = json.dumps(metadata).encode("utf-8")
+        data_start = self.padded(header_size + len(metadata_bytes))
+
+        segment = self.open_segment(create=True, size=max(data_start + offset, 1))
+        try:
+            struct.pack_into(self.HEADER_FORMAT, segment.buf, 0, self.MAGIC, 0, len(metadata_bytes))
+            segment.buf[header_size:header_size + len(metadata_bytes)] = metadata_bytes
+            for column, column_info in zip(columns, metadata["columns"]):
+                view = numpy.ndarray(column_info["shape"], dtype=column_info["dtype"], buffer=segment.buf,
+                                     offset=data_start + column_info["offset"])
+                view[...] = column
+                del view
+        except Exception:
+            segment.close()
+            self.unlink_segment(segment)
+            raise
+        return segment
+
+    def detach(self):
+        """Detach from the shared columns.
+
+        The segment is removed when the last process detaches. Any views of the columns must be released
+        before calling this function.
+        """
+        if self.segment is not None:
+            with self.locked():
+                count = self.update_count(-1)
+                try:
+                    self.segment.close()
+                except BufferError:
+                    self.log.warning("Column views of {} are still in use.".format(self.name))
+                if count <= 0:
+                    self.unlink_segment(self.segment)
+                    self.log.debug("Removed shared memory segment {}.".format(self.name))
+            self.segment = None
+
+    def get_columns(self):
+        """Create the read-only views of the columns in the segment.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+        """
+        header_size = struct.calcsize(self.HEADER_FORMAT)
+        magic, _, metadata_size = struct.unpack_from(self.HEADER_FORMAT, self.segment.buf, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Shared memory segment {} is not a SOCS column segment.".format(self.name))
+        metadata_end = header_size + metadata_size
+        metadata = json.loads(bytes(self.segment.buf[header_size:metadata_end]).decode("utf-8"))
+        data_start = self.padded(metadata_end)
+        columns = []
+        for column_info in metadata["columns"]:
+            column = numpy.ndarray(column_info["shape"], dtype=column_info["dtype"], buffer=self.segment.buf,
+                                   offset=data_start + column_info["offset"])
+            column.flags.writeable = False
+            columns.append(column)
+        return columns
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Hold the lock file for the segment.
+        """
+        with open(self.lock_file, "a") as lfile:
+            fcntl.flock(lfile, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lfile, fcntl.LOCK_UN)
+
+    def open_segment(self, create, size=0):
+        """Open the shared memory segment.
+
+        The segment lifetime is handled by the attached process count, so the segment is removed from
+        the resource tracker which would otherwise remove it when the first process exits.
+
+        Parameters
+        ----------
+        create : bool
+            Flag for creating a new segment.
+        size : int, optional
+            The size (units=bytes) of a new segment.
+
+        Returns
+        -------
+        multiprocessing.shared_memory.SharedMemory
+        """
+        try:
+            segment = shared_memory.SharedMemory(name=self.name, create=create, size=size, track=False)
+        except TypeError:
+            segment = shared_memory.SharedMemory(name=self.name, create=create, size=size)
+            resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+    def padded(self, size):
+        """Round the size up to the array alignment.
+
+        Parameters
+        ----------
+        size : int
+            The size (units=bytes) to round.
+
+        Returns
+        -------
+        int
+        """
+        return -(-size // self.ALIGNMENT) * self.ALIGNMENT
+
+    def unlink_segment(self, segment):
+        """Remove the shared memory segment.
+
+        Parameters
+        ----------
+        segment : multiprocessing.shared_memory.SharedMemory
+            The segment to remove.
+        """
+        if not hasattr(segment, "_track"):
+            # Older versions always unregister on unlink, so the tracker needs to know the segment.
+            resource_tracker.register(segment._name, "shared_memory")
+        segment.unlink()
+
+    def update_count(self, change):
+        """Change the attached process count stored in the segment.
+
+        Parameters
+        ----------
+        change : int
+            The change to the attached process count.
+
+        Returns
+        -------
+        int
+            The new attached process count.
+        """
+        count = struct.unpack_from("<q", self.segment.buf, 8)[0] + change
+        struct.pack_into("<q", self.segment.buf, 8, count)
+        return count
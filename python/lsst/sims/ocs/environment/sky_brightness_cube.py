@@ -0,0 +1,459 @@
+from __future__ import division
+from builtins import object
+from builtins import range
+import json
+import math
+import numpy
+import struct
+
+__all__ = ["SkyBrightnessCube"]
+
+class SkyBrightnessCube(object):
+    """Handle a pre-calculated sky brightness cube.
+
+    This class handles a memory-mapped file containing the sky brightness for a set of fields
+    and filters over a grid of times. The file layout is a magic string, the length of a JSON
+    metadata header, the header itself, the array of grid timestamps (float64), the ephemeris array
+    (float64) with shape (number of times, number of ephemeris values) and then the sky brightness
+    array with shape (number of times, number of fields, number of filters). The ephemeris holds the
+    local sidereal time and the moon and sun information of the sky model at each grid time, so the
+    target geometry can be calculated without updating the sky model. The arrays are memory-mapped
+    read-only, so many simulations using the same file share the same physical pages.
+
+    The time grid may have gaps, e.g. for the daytime. A lookup uses the closest grid time and must
+    be within one grid step of it.
+
+    Attributes
+    ----------
+    cube_file : str
+        The full path to the sky brightness cube file.
+    header : dict
+        The metadata header information.
+    timestamps : numpy.ndarray
+        The timestamps (units=seconds) of the time grid.
+    time_step : float
+        The spacing (units=seconds) of the time grid, taken as the median spacing.
+    ephemeris : numpy.memmap
+        The memory-mapped ephemeris array.
+    ephemeris_index : dict
+        The array index for each ephemeris value name.
+    field_index : numpy.ndarray
+        The array index for each field Id.
+    filter_index : dict
+        The array index for each filter name.
+    sky_brightness : numpy.memmap
+        The memory-mapped sky brightness array.
+    """
+
+    MAGIC = b"SOCSSKY2"
+    """Identifier at the start of a sky brightness cube file."""
+    FILTERS = ("u", "g", "r", "i", "z", "y")
+    """The set of filters stored in the cube."""
+    EPHEMERIS = ("lst", "moonRA", "moonDec", "moonAlt", "moonAz", "moonPhase", "sunRA", "sunDec", "sunAlt",
+                 "sunAz")
+    """The set of ephemeris values stored in the cube. All angles are in radians."""
+    SIDEREAL_RATE = 1.002737909350795 * 2.0 * math.pi / 86400.0
+    """The rate (units=radians/second) of the local sidereal time."""
+    ALIGNMENT = 64
+    """Byte alignment of the array sections in the file."""
+
+    def __init__(self):
+        """Initialize the class.
+        """
+        self.cube_file = None
+        self.header = None
+        self.timestamps = None
+        self.time_step = None
+        self.ephemeris = None
+        self.ephemeris_index = None
+        self.field_index = None
+        self.filter_index = None
+        self.sky_brightness = None
+
+    def __len__(self):
+        """Return the number of grid times.
+
+        Returns
+        -------
+        int
+        """
+        return self.timestamps.size if self.timestamps is not None else 0
+
+    @classmethod
+    def _align(cls, offset):
+        """Move the offset to the next alignment boundary.
+
+        Parameters
+        ----------
+        offset : int
+            The byte offset to align.
+
+        Returns
+        -------
+        int
+        """
+        return ((offset + cls.ALIGNMENT - 1) // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @classmethod
+    def _layout(cls, header):
+        """Calculate the byte layout of the file from the header.
+
+        Parameters
+        ----------
+        header : dict
+            The metadata header information.
+
+        Returns
+        -------
+        bytes, int, int, int
+            The encoded header, the offset of the timestamps, the offset of the ephemeris and the offset
+            of the sky brightness.
+        """
+        encoded_header = json.dumps(header, sort_keys=True).encode("utf-8")
+        prefix_size = len(cls.MAGIC) + struct.calcsize("<Q") + len(encoded_header)
+        timestamps_offset = cls._align(prefix_size)
+        ephemeris_offset = cls._align(timestamps_offset + header["num_times"] * 8)
+        ephemeris_size = header["num_times"] * len(header["ephemeris"]) * 8
+        sky_brightness_offset = cls._align(ephemeris_offset + ephemeris_size)
+        return encoded_header, timestamps_offset, ephemeris_offset, sky_brightness_offset
+
+    def _map(self, mode):
+        """Memory-map the arrays in the cube file.
+
+        Parameters
+        ----------
+        mode : str
+            The numpy.memmap file mode.
+        """
+        _, timestamps_offset, ephemeris_offset, sky_brightness_offset = self._layout(self.header)
+        self.timestamps = numpy.memmap(self.cube_file, dtype="<f8", mode=mode, offset=timestamps_offset,
+                                       shape=(self.header["num_times"],))
+        self.ephemeris = numpy.memmap(self.cube_file, dtype="<f8", mode=mode, offset=ephemeris_offset,
+                                      shape=(self.header["num_times"], len(self.header["ephemeris"])))
+        self.sky_brightness = numpy.memmap(self.cube_file, dtype=self.header["dtype"], mode=mode,
+                                           offset=sky_brightness_offset,
+                                           shape=(self.header["num_times"], len(self.header["field_ids"]),
+                                                  len(self.header["filters"])))
+
+        field_ids = numpy.array(self.header["field_ids"], dtype=int)
+        self.field_index = numpy.full(field_ids.max() + 1, -1, dtype=int)
+        self.field_index[field_ids] = numpy.arange(field_ids.size)
+        self.filter_index = {f: i for i, f in enumerate(self.header["filters"])}
+        self.ephemeris_index = {name: i for i, name in enumerate(self.header["ephemeris"])}
+
+    @staticmethod
+    def _separation(ra1, dec1, ra2, dec2):
+        """Calculate the angular separation between sky positions.
+
+        Parameters
+        ----------
+        ra1 : float or numpy.ndarray
+            The right ascension (units=radians) of the first positions.
+        dec1 : float or numpy.ndarray
+            The declination (units=radians) of the first positions.
+        ra2 : float or numpy.ndarray
+            The right ascension (units=radians) of the second positions.
+        dec2 : float or numpy.ndarray
+            The declination (units=radians) of the second positions.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The angular separation (units=radians).
+        """
+        sin_half_ddec = numpy.sin((dec2 - dec1) / 2.0)
+        sin_half_dra = numpy.sin((ra2 - ra1) / 2.0)
+        haversine = sin_half_ddec ** 2 + numpy.cos(dec1) * numpy.cos(dec2) * sin_half_dra ** 2
+        return 2.0 * numpy.arcsin(numpy.sqrt(numpy.clip(haversine, 0.0, 1.0)))
+
+    def _set_time_step(self):
+        """Set the grid spacing from the grid timestamps.
+        """
+        steps = numpy.diff(self.timestamps)
+        self.time_step = float(numpy.median(steps)) if steps.size else 0.0
+
+    def _time_index(self, timestamp):
+        """Get the index of the grid time closest to the timestamp.
+
+        Parameters
+        ----------
+        timestamp : float
+            The UTC timestamp (units=seconds) for the lookup.
+
+        Returns
+        -------
+        int
+
+        Raises
+        ------
+        ValueError
+            If the timestamp is more than one grid step from the closest grid time.
+        """
+        idx = numpy.searchsorted(self.timestamps, timestamp)
+        idx = min(max(idx, 1), self.timestamps.size - 1)
+        # searchsorted ensures that left < timestamp < right
+        # but we need to know if timestamp is closer to left or to right
+        if idx > 0 and timestamp - self.timestamps[idx - 1] < self.timestamps[idx] - timestamp:
+            idx -= 1
+        if abs(timestamp - self.timestamps[idx]) > self.time_step:
+            raise ValueError("Timestamp {} is not within one grid step ({} seconds) of the sky brightness "
+                             "cube time grid.".format(timestamp, self.time_step))
+        return int(idx)
+
+    @classmethod
+    def create(cls, cube_file, timestamps, field_ids, metadata=None, dtype="<f4"):
+        """Create a new sky brightness cube file for filling.
+
+        Parameters
+        ----------
+        cube_file : str
+            The full path to the sky brightness cube file.
+        timestamps : numpy.ndarray
+            The timestamps (units=seconds) of the time grid. Must be increasing.
+        field_ids : list[int]
+            The set of field Ids stored in the cube.
+        metadata : dict, optional
+            Extra information to store in the header, e.g. the sky model configuration.
+        dtype : str, optional
+            The numpy type for the stored sky brightness. Default is little-endian float32.
+
+        Returns
+        -------
+        :class:`.SkyBrightnessCube`
+            The instance with writable arrays.
+        """
+        header = {"num_times": len(timestamps), "field_ids": [int(x) for x in field_ids],
+                  "filters": list(cls.FILTERS), "ephemeris": list(cls.EPHEMERIS), "dtype": dtype,
+                  "metadata": metadata if metadata is not None else {}}
+        encoded_header, _, _, sky_brightness_offset = cls._layout(header)
+        file_size = sky_brightness_offset + (header["num_times"] * len(header["field_ids"]) *
+                                             len(header["filters"]) * numpy.dtype(dtype).itemsize)
+
+        with open(cube_file, "wb") as ofile:
+            ofile.write(cls.MAGIC)
+            ofile.write(struct.pack("<Q", len(encoded_header)))
+            ofile.write(encoded_header)
+            ofile.truncate(file_size)
+
+        cube = cls()
+        cube.cube_file = cube_file
+        cube.header = header
+        cube._map("r+")
+        cube.timestamps[:] = timestamps
+        cube._set_time_step()
+        return cube
+
+    def fill(self, sky_model, progress=None):
+        """Fill the cube from a sky model.
+
+        The sky brightness of all fields and the ephemeris are taken from the sky model at each grid
+        time.
+
+        Parameters
+        ----------
+        sky_model : lsst.ts.astrosky.model.AstronomicalSkyModel
+            The sky model used for calculating the sky brightness.
+        progress : callable, optional
+            A function called with the current and total number of grid times.
+        """
+        field_ids = numpy.array(self.header["field_ids"], dtype=int)
+        for i in range(len(self)):
+            sky_model.update(self.timestamps[i])
+            sky_mags = sky_model.get_sky_brightness(field_ids, extrapolate=True,
+                                                    override_exclude_planets=False)
+            self.set_sky_brightness(i, sky_mags)
+            msi = sky_model.get_moon_sun_info(numpy.zeros(1), numpy.zeros(1))
+            self.set_ephemeris(i, sky_model.date_profile.lst_rad, msi)
+            if progress is not None:
+                progress(i + 1, len(self))
+        self.flush()
+
+    def flush(self):
+        """Write any changes in the arrays to the cube file.
+        """
+        self.timestamps.flush()
+        self.ephemeris.flush()
+        self.sky_brightness.flush()
+
+    def get_moon_sun_info(self, timestamp, ra, dec):
+        """Get the moon and sun information at the grid time closest to the timestamp.
+
+        The dictionary has the same keys as the one from the sky model. The moon and sun distances are
+        calculated for the given target positions.
+
+        Parameters
+        ----------
+        timestamp : float
+            The UTC timestamp (units=seconds) for the lookup. It must be within one grid step of the
+            time grid.
+        ra : numpy.ndarray
+            The right ascensions (units=radians) of the targets.
+        dec : numpy.ndarray
+            The declinations (units=radians) of the targets.
+
+        Returns
+        -------
+        dict(str : float or numpy.ndarray)
+            The moon and sun information. All angles are in radians.
+
+        Raises
+        ------
+        ValueError
+            If the timestamp is not within one grid step of the time grid.
+        """
+        idx = self._time_index(timestamp)
+        values = dict((name, float(self.ephemeris[idx, i])) for name, i in self.ephemeris_index.items())
+        ones = numpy.ones(numpy.shape(ra))
+        msi = {"moonRA": values["moonRA"], "moonDec": values["moonDec"], "moonPhase": values["moonPhase"],
+               "sunRA": values["sunRA"], "sunDec": values["sunDec"]}
+        for name in ("moonAlt", "moonAz", "sunAlt", "sunAz"):
+            msi[name] = values[name] * ones
+        msi["moonDist"] = self._separation(ra, dec, values["moonRA"], values["moonDec"])
+        msi["solarElong"] = self._separation(ra, dec, values["sunRA"], values["sunDec"])
+        return msi
+
+    def get_sky_brightness(self, timestamp, ids):
+        """Get the sky brightness for the given fields at the grid time closest to the timestamp.
+
+        Parameters
+        ----------
+        timestamp : float
+            The UTC timestamp (units=seconds) for the lookup. It must be within one grid step of the
+            time grid.
+        ids : numpy.ndarray
+            The set of field Ids for the lookup.
+
+        Returns
+        -------
+        dict(str : numpy.ndarray)
+            The sky brightness for each filter with the same ordering as the field Ids.
+
+        Raises
+        ------
+        ValueError
+            If the timestamp is not within one grid step of the time grid or a field Id is not in the
+            cube.
+        """
+        idx = self._time_index(timestamp)
+
+        ids = numpy.asarray(ids, dtype=int)
+        known = (ids >= 0) & (ids < self.field_index.size)
+        if known.all():
+            known = self.field_index[ids] >= 0
+        if not known.all():
+            raise ValueError("Field Ids {} are not in the sky brightness cube.".format(ids[~known].tolist()))
+
+        field_idx = self.field_index[ids]
+        values = self.sky_brightness[idx, field_idx]
+        sky_mags = {}
+        for filter_name, i in self.filter_index.items():
+            sky_mags[filter_name] = values[:, i].astype(float)
+        return sky_mags
+
+    def get_target_information(self, timestamp, ra, dec, latitude):
+        """Get the airmass, altitude and azimuth of the targets at the timestamp.
+
+        The local sidereal time is taken from the closest grid time and advanced to the timestamp.
+
+        Parameters
+        ----------
+        timestamp : float
+            The UTC timestamp (units=seconds) for the lookup. It must be within one grid step of the
+            time grid.
+        ra : numpy.ndarray
+            The right ascensions (units=radians) of the targets.
+        dec : numpy.ndarray
+            The declinations (units=radians) of the targets.
+        latitude : float
+            The latitude (units=radians) of the observatory.
+
+        Returns
+        -------
+        dict(str : numpy.ndarray)
+            The airmass, altitude (units=radians) and azimuth (units=radians) of the targets.
+
+        Raises
+        ------
+        ValueError
+            If the timestamp is not within one grid step of the time grid.
+        """
+        idx = self._time_index(timestamp)
+        grid_lst = self.ephemeris[idx, self.ephemeris_index["lst"]]
+        lst = grid_lst + self.SIDEREAL_RATE * (timestamp - self.timestamps[idx])
+        hour_angle = lst - numpy.asarray(ra)
+        sin_dec = numpy.sin(dec)
+        cos_dec = numpy.cos(dec)
+        cos_ha = numpy.cos(hour_angle)
+        sin_altitude = sin_dec * math.sin(latitude) + cos_dec * math.cos(latitude) * cos_ha
+        altitude = numpy.arcsin(numpy.clip(sin_altitude, -1.0, 1.0))
+        azimuth = numpy.arctan2(-cos_dec * numpy.sin(hour_angle),
+                                sin_dec * math.cos(latitude) - cos_dec * math.sin(latitude) * cos_ha)
+        return {"airmass": 1.0 / numpy.sin(altitude), "altitude": altitude,
+                "azimuth": azimuth % (2.0 * math.pi)}
+
+    def initialize(self, cube_file):
+        """Map the information from a sky brightness cube file.
+
+        Parameters
+        ----------
+        cube_file : str
+            The full path to the sky brightness cube file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a sky brightness cube of the current format.
+        """
+        self.cube_file = cube_file
+        with open(self.cube_file, "rb") as ifile:
+            magic = ifile.read(len(self.MAGIC))
+            if magic != self.MAGIC:
+                raise ValueError("{} is not a sky brightness cube file of the current format. Recreate it "
+                                 "with make_sky_cube.".format(self.cube_file))
+            header_size = struct.unpack("<Q", ifile.read(struct.calcsize("<Q")))[0]
+            self.header = json.loads(ifile.read(header_size).decode("utf-8"))
+        self._map("r")
+        self._set_time_step()
+
+    def set_ephemeris(self, time_index, lst, msi):
+        """Store the ephemeris at one grid time.
+
+        Parameters
+        ----------
+        time_index : int
+            The index of the grid time.
+        lst : float
+            The local sidereal time (units=radians).
+        msi : dict(str : float or numpy.ndarray)
+            The moon and sun information from the sky model for a single target.
+        """
+        self.ephemeris[time_index, self.ephemeris_index["lst"]] = lst
+        for name, i in self.ephemeris_index.items():
+            if name != "lst":
+                self.ephemeris[time_index, i] = numpy.ravel(msi[name])[0]
+
+    def set_sky_brightness(self, time_index, sky_mags):
+        """Store the sky brightness for all fields at one grid time.
+
+        Parameters
+        ----------
+        time_index : int
+            The index of the grid time.
+        sky_mags : dict(str : numpy.ndarray)
+            The sky brightness for each filter ordered like the cube field Ids.
+        """
+        for filter_name, i in self.filter_index.items():
+            self.sky_brightness[time_index, :, i] = sky_mags[filter_name]
+
+    def sky_brightness_config(self):
+        """Get the configuration information for the sky brightness cube.
+
+        Returns
+        -------
+        list[tuple(key, value)]
+        """
+        config = [("sky_brightness_cube/file", self.cube_file),
+                  ("sky_brightness_cube/num_times", str(self.header["num_times"]))]
+        for key in sorted(self.header["metadata"]):
+            config.append(("sky_brightness_cube/{}".format(key), str(self.header["metadata"][key])))
+        return config
@@ -0,0 +1,203 @@
+from builtins import object
+import copy
+import logging
+import numpy
+import threading
+import time
+
+from lsst.sims.ocs.setup import LoggingLevel
+from lsst.sims.ocs.utilities.constants import SECONDS_IN_DAY
+
+__all__ = ["SkyDataPrefetcher"]
+
+class SkyDataPrefetcher(object):
+    """Load the next sky model data chunk on a background thread.
+
+    The pre-calculated sky brightness model keeps its data in files covering a range of dates and
+    loads a new file when a requested date leaves the loaded range. This class loads the data chunk
+    for the upcoming date range into a shallow copy of the sky model on a background thread. When the
+    simulation time moves into that chunk, the loaded data is swapped into the sky model, so the
+    sky model does not need to load it on the main thread. Two data chunks are held in memory while
+    a prefetched chunk waits to be swapped in.
+
+    Attributes
+    ----------
+    sky_brightness : lsst.sims.skybrightness_pre.SkyModelPre
+        The pre-calculated sky brightness model instance.
+    lookahead : float
+        The time (units=days) ahead of the current time to check for a new data chunk.
+    prefetch_hits : int
+        Counter for the number of chunk changes where the chunk was already loaded.
+    prefetch_misses : int
+        Counter for the number of chunk changes where the main thread waited for the chunk load.
+    stall_time : float
+        The total time (units=seconds) the main thread waited for chunk loads at chunk changes.
+    current_chunk : int or None
+        The index of the data chunk in use.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    MJD_UNIX_EPOCH = 40587.0
+    """The MJD of the UNIX timestamp epoch."""
+
+    def __init__(self, sky_brightness, lookahead=1.5):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        sky_brightness : lsst.sims.skybrightness_pre.SkyModelPre
+            The pre-calculated sky brightness model instance.
+        lookahead : float, optional
+            The time (units=days) ahead of the current time to check for a new data chunk.
+        """
+        self.sky_brightness = sky_brightness
+        self.lookahead = lookahead
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self.stall_time = 0.0
+        self.current_chunk = None
+        self.loading_chunk = None
+        self.prefetched = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.log = logging.getLogger("environment.SkyDataPrefetcher")
+
+    def chunk_index(self, mjd):
+        """Get the data chunk covering the given date.
+
+        Parameters
+        ----------
+        mjd : float
+            The date for the chunk lookup.
+
+        Returns
+        -------
+        int or None
+            The index of the data chunk. None if no chunk covers the date.
+        """
+        left = self.sky_brightness.mjd_left
+        right = self.sky_brightness.mjd_right
+        indexes = numpy.where((mjd >= left) & (mjd <= right))[0]
+        if indexes.size:
+            return int(indexes.min())
+        return None
+
+    def chunk_mjd(self, chunk):
+        """Get a date that selects the given data chunk.
+
+        Parameters
+        ----------
+        chunk : int
+            The index of the data chunk.
+
+        Returns
+        -------
+        float
+        """
+        return 0.5 * (self.sky_brightness.mjd_left[chunk] + self.sky_brightness.mjd_right[chunk])
+
+    def finalize(self):
+        """Wait for any running prefetch to finish.
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def prefetch(self, chunk):
+        """Load a data chunk into a copy of the sky model on a background thread.
+
+        Parameters
+        ----------
+        chunk : int
+            The index of the data chunk.
+        """
+        if self.loading_chunk == chunk:
+            return
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        self.log.log(LoggingLevel.EXTENSIVE.value, "Prefetching sky data chunk {}.".format(chunk))
+        # The copy is made here so the background thread never reads the sky model in use.
+        sky_brightness = copy.copy(self.sky_brightness)
+        self.loading_chunk = chunk
+        with self.lock:
+            self.prefetched = None
+        self.thread = threading.Thread(target=self._load_chunk, args=(chunk, sky_brightness),
+                                       name="SkyDataPrefetcher")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _load_chunk(self, chunk, sky_brightness):
+        """Load a data chunk on the background thread.
+
+        Parameters
+        ----------
+        chunk : int
+            The index of the data chunk.
+        sky_brightness : lsst.sims.skybrightness_pre.SkyModelPre
+            The copy of the sky model to load the data chunk into.
+        """
+        try:
+            sky_brightness._load_data(self.chunk_mjd(chunk))
+        except Exception as err:
+            self.log.warning("Failed to prefetch sky data chunk {}: {}".format(chunk, err))
+            return
+        with self.lock:
+            self.prefetched = (chunk, sky_brightness)
+
+    def _switch_chunk(self, chunk, mjd):
+        """Put the data for a new chunk into the sky model.
+
+        Parameters
+        ----------
+        chunk : int
+            The index of the new data chunk.
+        mjd : float
+            The current date.
+        """
+        start_time = time.time()
+        hit = self.thread is None or not self.thread.is_alive()
+        if self.loading_chunk == chunk:
+            self.finalize()
+        with self.lock:
+            prefetched = self.prefetched
+        if prefetched is not None and prefetched[0] == chunk:
+            self.sky_brightness.__dict__.update(prefetched[1].__dict__)
+        else:
+            hit = False
+            self.sky_brightness._load_data(mjd)
+        with self.lock:
+            self.prefetched = None
+        self.loading_chunk = None
+        self.stall_time += time.time() - start_time
+
+        if hit:
+            self.prefetch_hits += 1
+        else:
+            self.prefetch_misses += 1
+        self.log.log(LoggingLevel.EXTENSIVE.value,
+                     "Sky data chunk changed to {}: prefetch {}.".format(chunk, "hit" if hit else "miss"))
+
+    def update(self, timestamp):
+        """Check the data chunks for the given time.
+
+        If the data chunk changed since the last update, the prefetched data is swapped into the sky
+        model, waiting for a running load if needed, or the sky model loads the chunk. A prefetch is
+        started if a new data chunk is needed within the lookahead time.
+
+        Parameters
+        ----------
+        timestamp : float
+            The current UTC timestamp (units=seconds).
+        """
+        mjd = timestamp / SECONDS_IN_DAY + self.MJD_UNIX_EPOCH
+        chunk = self.chunk_index(mjd)
+        if chunk is not None and chunk != self.current_chunk:
+            if self.current_chunk is not None:
+                self._switch_chunk(chunk, mjd)
+            self.current_chunk = chunk
+
+        next_chunk = self.chunk_index(mjd + self.lookahead)
+        if next_chunk is not None and next_chunk != chunk:
+            self.prefetch(next_chunk)
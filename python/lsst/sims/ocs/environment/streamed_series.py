@@ -0,0 +1,167 @@
+from builtins import object
+import logging
+import numpy
+import threading
+
+from lsst.sims.ocs.setup import LoggingLevel
+
+__all__ = ["StreamedSeries"]
+
+class StreamedSeries(object):
+    """Keep a sliding window of an environment series in memory.
+
+    This class reads the rows of an environment source for a window of dates around the requested
+    dates and reads the following window on a background thread. The nearest row lookup matches the
+    in-memory lookup of the :class:`.CloudModel` and :class:`.SeeingModel`, including the wrap around
+    at the end of the series.
+
+    Attributes
+    ----------
+    source : :class:`.EnvironmentSource`
+        The source of the series rows.
+    window : float
+        The length (units=seconds) of the window of dates kept in memory.
+    prefetch : bool
+        Flag for reading the next window on a background thread.
+    period : float
+        The date (units=seconds) of the last row, where the series wraps around.
+    last_value : float
+        The value of the last row.
+    window_start : float
+        The start date (units=seconds) of the loaded window.
+    window_end : float
+        The end date (units=seconds) of the loaded window.
+    dates : numpy.ndarray
+        The dates of the loaded rows.
+    values : numpy.ndarray
+        The values of the loaded rows.
+    prefetch_hits : int
+        Counter for the number of window changes where the window was already prefetched.
+    prefetch_misses : int
+        Counter for the number of window changes where the window was not prefetched.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    def __init__(self, source, window, prefetch=True):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        source : :class:`.EnvironmentSource`
+            The source of the series rows.
+        window : float
+            The length (units=seconds) of the window of dates kept in memory.
+        prefetch : bool, optional
+            Flag for reading the next window on a background thread.
+        """
+        self.source = source
+        self.window = window
+        self.prefetch = prefetch
+        self.period, self.last_value = source.get_last()
+        self.window_start = None
+        self.window_end = None
+        self.dates = None
+        self.values = None
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self.prefetched = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.log = logging.getLogger("environment.StreamedSeries")
+
+    def close(self):
+        """Wait for any running prefetch and release the source.
+        """
+        self.finalize()
+        self.source.close()
+
+    def finalize(self):
+        """Wait for any running prefetch to finish.
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def get_values(self, dates):
+        """Get the values of the rows nearest to the given dates.
+
+        Parameters
+        ----------
+        dates : float or numpy.ndarray
+            The dates (units=seconds) since the start of the series year. Dates past the end of the
+            series wrap around.
+
+        Returns
+        -------
+        float or numpy.ndarray
+        """
+        dates = numpy.asarray(dates) % self.period
+        self.load(dates.min(), dates.max())
+
+        last_index = self.dates.size - 1
+        idx = numpy.searchsorted(self.dates, dates)
+        left_idx = numpy.maximum(idx - 1, 0)
+        right_idx = numpy.minimum(idx, last_index)
+        # searchsorted ensures that left < date <= right
+        # but we need to know if date is closer to left or to right
+        use_left = dates - self.dates[left_idx] < self.dates[right_idx] - dates
+        values = numpy.where(use_left, self.values[left_idx], self.values[right_idx])
+        if self.window_start <= self.dates[0]:
+            # Dates before the first row take the last row, as the wrap around of the full series does.
+            values = numpy.where(idx == 0, self.last_value, values)
+        return values[()] if values.ndim == 0 else values
+
+    def load(self, start, end):
+        """Make sure the loaded window covers the given dates.
+
+        Parameters
+        ----------
+        start : float
+            The earliest date (units=seconds) needed.
+        end : float
+            The latest date (units=seconds) needed.
+        """
+        if self.window_start is None or start < self.window_start or end >= self.window_end:
+            window_end = max(end + 1.0, start + self.window)
+            self.finalize()
+            with self.lock:
+                prefetched = self.prefetched
+                self.prefetched = None
+            if prefetched is not None and prefetched[0] <= start and prefetched[1] > end:
+                self.prefetch_hits += 1
+                self.window_start, self.window_end, self.dates, self.values = prefetched
+            else:
+                if self.window_start is not None:
+                    self.prefetch_misses += 1
+                self.dates, self.values = self.source.read_window(start, window_end)
+                self.window_start = start
+                self.window_end = window_end
+            self.log.log(LoggingLevel.TRACE.value,
+                         "Loaded {} rows for dates {} to {}.".format(self.dates.size, self.window_start,
+                                                                     self.window_end))
+
+            if self.prefetch and self.window_end < self.period:
+                self.thread = threading.Thread(target=self._read_window,
+                                               args=(self.window_end, self.window_end + self.window),
+                                               name="StreamedSeries")
+                self.thread.daemon = True
+                self.thread.start()
+
+    def _read_window(self, start, end):
+        """Read a window of rows on the background thread.
+
+        Parameters
+        ----------
+        start : float
+            The start date (units=seconds) of the window.
+        end : float
+            The end date (units=seconds) of the window.
+        """
+        try:
+            dates, values = self.source.read_window(start, end)
+        except Exception as err:
+            self.log.warning("Failed to prefetch dates {} to {}: {}".format(start, end, err))
+            return
+        with self.lock:
+            self.prefetched = (start, end, dates, values)
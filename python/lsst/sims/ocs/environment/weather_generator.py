@@ -0,0 +1,287 @@
+from __future__ import division
+from builtins import object
+from builtins import range
+import logging
+import numpy
+
+from lsst.sims.ocs.utilities.constants import SECONDS_IN_YEAR
+
+__all__ = ["WeatherGenerator"]
+
+class WeatherGenerator(object):
+    """Synthesize weather series from the statistics of a historical series.
+
+    This class fits a seasonal Gaussian copula model to a historical series such as the cloud or
+    seeing information. The series may be irregular, e.g. only sampled at night. The marginal
+    distribution is kept as an empirical quantile table for each season bin, so discrete values like
+    the cloud eighths are reproduced exactly. The time correlation is kept as a first order
+    autoregressive process on the normal scores over a regular time grid, with the coefficient fit to
+    the lag one correlation of the historical values at their actual times. New series of any length
+    are synthesized in vectorized form from a seeded random number generator.
+
+    Attributes
+    ----------
+    seed : int
+        The seed for the random number generator.
+    step : float
+        The interval (units=seconds) of the time grid, which is the typical spacing of the historical
+        series within a run of samples.
+    phi : float
+        The autoregressive coefficient of the normal scores for one grid step.
+    quantiles : numpy.ndarray
+        The empirical quantile table with shape (number of season bins, number of quantiles).
+    random : numpy.random.RandomState
+        The random number generator.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    YEAR = SECONDS_IN_YEAR
+    """The length (units=seconds) of the seasonal cycle."""
+    NUM_SEASON_BINS = 12
+    """The number of season bins in the quantile table."""
+    NUM_QUANTILES = 1000
+    """The number of quantiles stored for each season bin."""
+    MAX_PHI = 0.9999
+    """The largest magnitude of the autoregressive coefficient."""
+    MAX_WRAP_MARGIN = 100000
+    """The largest number of extra values used to hide the circular wrap of the scores."""
+    NUM_CALIBRATION_VALUES = 100000
+    """The largest number of grid values used when fitting the autoregressive coefficient."""
+    MAX_STEP_FACTOR = 2.0
+    """The largest spacing, in units of the shortest spacing, that is within a run of samples."""
+    NUM_BISECTIONS = 30
+    """The number of bisection steps when fitting the autoregressive coefficient."""
+
+    def __init__(self, seed=None):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        seed : int, optional
+            The seed for the random number generator. Default is an unpredictable seed.
+        """
+        self.seed = seed
+        self.step = None
+        self.phi = None
+        self.quantiles = None
+        self.random = numpy.random.RandomState(seed)
+        self.log = logging.getLogger("environment.WeatherGenerator")
+
+    def fit(self, dates, values):
+        """Fit the model to a historical series.
+
+        The time grid step is the median of the historical spacings that are within a run of samples,
+        so gaps like the daytime breaks of a nightly series are left out. The autoregressive
+        coefficient is found by bisection so that a series synthesized on the time grid and taken at
+        the historical times has the same lag one correlation as the historical values. The gaps
+        between samples therefore give the correlation its proper time scale. This includes the
+        effects of the seasonal bins and of the ties in discrete values.
+
+        Parameters
+        ----------
+        dates : numpy.ndarray
+            The times (units=seconds) of the series from the start of a year.
+        values : numpy.ndarray
+            The values of the series.
+        """
+        dates = numpy.asarray(dates, dtype=float)
+        values = numpy.asarray(values, dtype=float)
+        spacings = numpy.diff(dates)
+        spacings = spacings[spacings > 0]
+        self.step = float(numpy.median(spacings[spacings <= self.MAX_STEP_FACTOR * spacings.min()]))
+
+        season_bins = self.get_season_bins(dates)
+        probabilities = (numpy.arange(self.NUM_QUANTILES) + 0.5) / self.NUM_QUANTILES
+        self.quantiles = numpy.zeros((self.NUM_SEASON_BINS, self.NUM_QUANTILES))
+        for i in range(self.NUM_SEASON_BINS):
+            bin_values = values[season_bins == i]
+            if not bin_values.size:
+                bin_values = values
+            sorted_values = numpy.sort(bin_values)
+            self.quantiles[i] = sorted_values[(probabilities * sorted_values.size).astype(int)]
+
+        target = self.lag_correlation(values)
+        grid_index = numpy.round((dates - dates[0]) / self.step).astype(int)
+        calibration = grid_index < self.NUM_CALIBRATION_VALUES
+        calibration_index = grid_index[calibration]
+        calibration_bins = season_bins[calibration]
+        num_values = calibration_index[-1] + 1
+        # The same noise is used for every trial, so the correlation changes smoothly with phi.
+        noise_size = self.get_transform_size(num_values + self.MAX_WRAP_MARGIN)
+        noise = numpy.random.RandomState(0).standard_normal(noise_size)
+        low = -self.MAX_PHI
+        high = self.MAX_PHI
+        for _ in range(self.NUM_BISECTIONS):
+            phi = 0.5 * (low + high)
+            scores = self.make_scores(noise, phi, num_values)[calibration_index]
+            if self.lag_correlation(self.make_values(calibration_bins, scores)) < target:
+                low = phi
+            else:
+                high = phi
+        self.phi = 0.5 * (low + high)
+        self.log.debug("Fitted {} values with step {} s and phi {:.4f}.".format(values.size, self.step,
+                                                                                self.phi))
+
+    def generate(self, duration):
+        """Synthesize a series from the fitted model.
+
+        Parameters
+        ----------
+        duration : float
+            The length (units=seconds) of the series.
+
+        Returns
+        -------
+        tuple(numpy.ndarray)
+            The regularly spaced times (units=seconds) from the start of a year and the values of
+            the series.
+        """
+        if self.quantiles is None:
+            raise RuntimeError("The weather generator must be fit before generating a series.")
+        num_values = int(numpy.ceil(duration / self.step)) + 1
+        dates = self.step * numpy.arange(num_values)
+        size = self.get_transform_size(num_values + self.get_wrap_margin(self.phi))
+        scores = self.make_scores(self.random.standard_normal(size), self.phi, num_values)
+        return dates, self.make_values(self.get_season_bins(dates), scores)
+
+    def get_season_bins(self, dates):
+        """Get the season bin for a set of times.
+
+        Parameters
+        ----------
+        dates : numpy.ndarray
+            The times (units=seconds) from the start of a year.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        season_bins = ((dates % self.YEAR) * (self.NUM_SEASON_BINS / self.YEAR)).astype(int)
+        return numpy.minimum(season_bins, self.NUM_SEASON_BINS - 1)
+
+    @staticmethod
+    def get_transform_size(min_size):
+        """Get the smallest fast Fourier transform size of at least the given size.
+
+        The fast sizes only have factors of 2, 3 and 5.
+
+        Parameters
+        ----------
+        min_size : int
+            The smallest acceptable size.
+
+        Returns
+        -------
+        int
+        """
+        best = 1 << int(numpy.ceil(numpy.log2(max(min_size, 2))))
+        power5 = 1
+        while power5 < best:
+            power35 = power5
+            while power35 < best:
+                quotient = -(-min_size // power35)
+                power2 = 1 << int(numpy.ceil(numpy.log2(quotient))) if quotient > 1 else 1
+                best = min(best, power2 * power35)
+                power35 *= 3
+            power5 *= 5
+        return best
+
+    def get_wrap_margin(self, phi):
+        """Get the number of extra values needed to hide the circular wrap of the scores.
+
+        Parameters
+        ----------
+        phi : float
+            The autoregressive coefficient.
+
+        Returns
+        -------
+        int
+        """
+        if abs(phi) < 1.0e-3:
+            margin = 0
+        else:
+            margin = int(numpy.ceil(numpy.log(1.0e-3) / numpy.log(abs(phi))))
+        return min(margin, self.MAX_WRAP_MARGIN)
+
+    @staticmethod
+    def lag_correlation(values):
+        """Calculate the lag one correlation of a series.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            The values of the series.
+
+        Returns
+        -------
+        float
+        """
+        correlation = numpy.corrcoef(values[:-1], values[1:])[0, 1]
+        return correlation if numpy.isfinite(correlation) else 0.0
+
+    def make_scores(self, noise, phi, num_values):
+        """Filter white noise into autoregressive normal scores.
+
+        The filter is applied in the frequency domain. The noise must be longer than the number of
+        values by the wrap margin so the circular wrap of the filter is not in the returned scores.
+
+        Parameters
+        ----------
+        noise : numpy.ndarray
+            The standard normal white noise.
+        phi : float
+            The autoregressive coefficient.
+        num_values : int
+            The number of scores to return.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        size = noise.size
+        frequencies = 2.0 * numpy.pi * numpy.arange(size // 2 + 1) / size
+        transfer = numpy.sqrt(1.0 - phi ** 2) / (1.0 - phi * numpy.exp(-1j * frequencies))
+        return numpy.fft.irfft(numpy.fft.rfft(noise) * transfer, size)[:num_values]
+
+    def make_values(self, season_bins, scores):
+        """Map the normal scores to values through the quantile table.
+
+        Parameters
+        ----------
+        season_bins : numpy.ndarray
+            The season bin for each value.
+        scores : numpy.ndarray
+            The normal scores for each value.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        quantile_index = (self.normal_cdf(scores) * self.NUM_QUANTILES).astype(int)
+        quantile_index = numpy.clip(quantile_index, 0, self.NUM_QUANTILES - 1)
+        return self.quantiles[season_bins, quantile_index]
+
+    @staticmethod
+    def normal_cdf(x):
+        """Calculate the standard normal cumulative distribution.
+
+        This uses the Abramowitz and Stegun 7.1.26 approximation of the error function, which has a
+        maximum error of 1.5e-7.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            The standard normal values.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        z = numpy.abs(x) / numpy.sqrt(2.0)
+        t = 1.0 / (1.0 + 0.3275911 * z)
+        polynomial = -1.453152027 + t * 1.061405429
+        polynomial = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * polynomial)))
+        erf = 1.0 - polynomial * numpy.exp(-z * z)
+        return 0.5 * (1.0 + numpy.sign(x) * erf)
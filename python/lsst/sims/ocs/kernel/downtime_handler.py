@@ -1,6 +1,6 @@
 from builtins import object
-from builtins import range
 import logging
+import numpy
 
 from lsst.sims.ocs.downtime.scheduled_downtime import ScheduledDowntime
 from lsst.sims.ocs.downtime.unscheduled_downtime import UnscheduledDowntime
@@ -10,7 +10,8 @@ class DowntimeHandler(object):
     """Coordinate the handling of all the downtime information.
 
     This class handles the coordination between the scheduled and unscheduled
-    downtime information.
+    downtime information. The downtimes are merged once into a calendar with an
+    entry for each night, so the downtime for a night is a single lookup.
 
     Attributes
     ----------
@@ -18,63 +19,64 @@ class DowntimeHandler(object):
         The scheduled downtime information instance.
     unscheduled : :class:`.UnscheduledDowntime`
         The unscheduled downtime information instance.
-    current_scheduled : tuple or None
-        The set of current scheduled downtime information.
-    current_unscheduled : tuple or None
-        The set of current unscheduled downtime information.
-    downtime_days : set
-        The holder for the list of downtime days.
+    downtime_remaining : numpy.ndarray
+        The number of downtime nights remaining, including the night itself, for each night.
+    downtime_cause : numpy.ndarray
+        The cause of the downtime for each night as a combination of the SCHEDULED and
+        UNSCHEDULED flags.
     log : Logger
         The handle for the logger.
     """
 
+    NO_DOWNTIME = 0
+    """Cause flag for nights without downtime."""
+    SCHEDULED = 1
+    """Cause flag for nights with scheduled downtime."""
+    UNSCHEDULED = 2
+    """Cause flag for nights with unscheduled downtime."""
+
     def __init__(self):
         """Initialize the class.
         """
         self.scheduled = ScheduledDowntime()
         self.unscheduled = UnscheduledDowntime()
-        self.current_scheduled = None
-        self.current_unscheduled = None
-        self.downtime_days = set()
+        self.downtime_remaining = numpy.zeros(0, dtype=numpy.int32)
+        self.downtime_cause = numpy.zeros(0, dtype=numpy.int8)
         self.log = logging.getLogger("kernel.DowntimeHandler")
 
-    def downtime_range(self, dt):
-        """Get the downtime day range and start night.
-
-        Parameters
-        ----------
-        dt : tuple
-            The collection of downtime information (start, length, description)
+    def build_calendar(self):
+        """Merge the scheduled and unscheduled downtimes into the nightly calendar.
 
-        Returns
-        -------
-        set, int
-            The list of downtime days as a set and the downtime start night.
+        Overlapping downtimes are joined into one block of downtime nights, so each night of the
+        block has the number of nights to the end of the block. Downtimes that only touch stay
+        separate blocks.
         """
-        if dt is None:
-            return set(), -1
-        else:
-            return set(list(range(dt[0], dt[0] + dt[1]))), dt[0]
+        downtimes = [(dt[0], dt[0] + dt[1], self.SCHEDULED) for dt in self.scheduled.downtimes]
+        downtimes += [(dt[0], dt[0] + dt[1], self.UNSCHEDULED) for dt in self.unscheduled.downtimes]
+        downtimes.sort()
+        num_nights = max([dt[1] for dt in downtimes] + [0])
+
+        self.downtime_remaining = numpy.zeros(num_nights, dtype=numpy.int32)
+        self.downtime_cause = numpy.zeros(num_nights, dtype=numpy.int8)
+        block_start = block_end = 0
+        for start, end, cause in downtimes:
+            if start < block_end:
+                overlap = min(end, block_end) - start
+                self.log.log(LoggingLevel.EXTENSIVE.value,
+                             "Overlapping downtime at night {}: {} nights".format(start, overlap))
+                block_end = max(block_end, end)
+            else:
+                block_start, block_end = start, end
+            self.downtime_remaining[block_start:block_end] = numpy.arange(block_end - block_start, 0, -1)
+            self.downtime_cause[start:end] |= cause
 
-    def initialize(self, config):
-        """Perform initialization steps.
-
-        Parameters
-        ----------
-        config : :class:`.Downtime`
-            Downtime configuration instance.
-        """
-        self.scheduled.initialize(config.scheduled_downtime_db)
-        self.unscheduled.initialize(config.unscheduled_downtime_use_random_seed)
-        config.unscheduled_downtime_random_seed = self.unscheduled.seed
+        self.log.log(LoggingLevel.EXTENSIVE.value,
+                     "Downtime calendar: {} down nights in {} nights".format(
+                         numpy.count_nonzero(self.downtime_remaining), num_nights))
 
     def get_downtime(self, night):
         """Determine if there is downtime for the given night.
 
-        This function looks at the given downtime and determines if there are any
-        downtime days. If downtime is identified, then this number will return a
-        decreasing number of days until no more downtime if found.
-
         Parameters
         ----------
         night : int
@@ -83,73 +85,45 @@ class DowntimeHandler(object):
         Returns
         -------
         int
-            The number of downtime nights.
+            The number of downtime nights remaining, including the given night.
         """
-        self.update()
-        try:
-            self.downtime_days.remove(night)
-            return len(self.downtime_days) + 1
-        except KeyError:
+        if 0 <= night < self.downtime_remaining.size:
+            return int(self.downtime_remaining[night])
+        else:
             return 0
 
-    def update(self):
-        """Update the lsit of downtime days.
-        """
-        if len(self.downtime_days):
-            return
+    def get_downtime_cause(self, night):
+        """Get the cause of the downtime for the given night.
 
-        if self.current_scheduled is None:
-            self.current_scheduled = self.scheduled()
-        if self.current_unscheduled is None:
-            self.current_unscheduled = self.unscheduled()
+        Parameters
+        ----------
+        night : int
+            The night to check the downtime information for.
 
-        if self.current_scheduled is None and self.current_unscheduled is None:
-            return
+        Returns
+        -------
+        int
+            The combination of the SCHEDULED and UNSCHEDULED flags. NO_DOWNTIME if the night has
+            no downtime.
+        """
+        if 0 <= night < self.downtime_cause.size:
+            return int(self.downtime_cause[night])
+        else:
+            return self.NO_DOWNTIME
 
-        usdt, usdt_start = self.downtime_range(self.current_unscheduled)
-        sdt, sdt_start = self.downtime_range(self.current_scheduled)
+    def initialize(self, config):
+        """Perform initialization steps.
 
-        if sdt_start < usdt_start:
-            if sdt.isdisjoint(usdt):
-                self.downtime_days.update(sdt)
-                self.current_scheduled = None
-            else:
-                if sdt.issuperset(usdt):
-                    self.log.log(LoggingLevel.EXTENSIVE.value,
-                                 "Completely overlapping unscheduled downtime")
-                else:
-                    partial = len(sdt.intersection(usdt))
-                    self.log.log(LoggingLevel.EXTENSIVE.value,
-                                 "Partial overlapping unscheduled downtime: {}".format(partial))
-
-                self.downtime_days.update(sdt)
-                self.downtime_days.update(usdt)
-                self.current_scheduled = None
-                self.current_unscheduled = None
-
-        if usdt_start < sdt_start:
-            if usdt.isdisjoint(sdt):
-                self.downtime_days.update(usdt)
-                self.current_unscheduled = None
-            else:
-                if usdt.issuperset(sdt):
-                    self.log.log(LoggingLevel.EXTENSIVE.value,
-                                 "Completely overlapping scheduled downtime")
-                else:
-                    partial = len(usdt.intersection(sdt))
-                    self.log.log(LoggingLevel.EXTENSIVE.value,
-                                 "Partial overlapping scheduled downtime: {}".format(partial))
-
-                self.downtime_days.update(sdt)
-                self.downtime_days.update(usdt)
-                self.current_scheduled = None
-                self.current_unscheduled = None
-
-        if sdt_start == usdt_start:
-            self.downtime_days.update(sdt)
-            self.downtime_days.update(usdt)
-            self.current_scheduled = None
-            self.current_unscheduled = None
+        Parameters
+        ----------
+        config : :class:`.Downtime`
+            Downtime configuration instance.
+        """
+        self.scheduled.initialize(config.scheduled_downtime_db)
+        self.unscheduled.initialize(config.unscheduled_downtime_use_random_seed,
+                                    vectorized=config.unscheduled_downtime_vectorized)
+        config.unscheduled_downtime_random_seed = self.unscheduled.seed
+        self.build_calendar()
 
     def write_downtime_to_db(self, db):
         """Write all the downtime information to the survey database.
@@ -2,7 +2,9 @@ from builtins import object
 from builtins import range
 import logging
 import numpy
+import os
 
+from lsst.sims.ocs.environment import SkyBrightnessCube, SkyDataPrefetcher
 from lsst.sims.ocs.observatory import MainObservatory
 from lsst.sims.ocs.setup import LoggingLevel
 from lsst.ts.astrosky.model import AstronomicalSkyModel
@@ -30,13 +32,23 @@ class Sequencer(object):
         Instance of the SOCS observatory model.
     observatory_state : SALPY_scheduler.observatoryStateC
         DDS topic instance for the observatory state information.
+    obs_site_config : :class:`.ObservingSite`
+        The instance of the observing site configuration.
     idle_delay : float
         Time (units=seconds) to wait when a missed target is received.
     log : logging.Logger
         The logging instance.
+    sky_cube : :class:`.SkyBrightnessCube` or None
+        The pre-calculated sky brightness lookup. If set, it provides the sky brightness, the target
+        geometry and the moon and sun information instead of the sky model.
+    sky_prefetcher : :class:`.SkyDataPrefetcher` or None
+        The background loader for the sky model data chunks.
+    slew_time_cache_file : str or None
+        The file for saving the field-to-field slew time table.
     """
 
-    def __init__(self, obs_site_config, idle_delay):
+    def __init__(self, obs_site_config, idle_delay, sky_cube_file=None,
+                 sky_prefetch=False, slew_time_cache_file=None, aggregate_slew_activities=False):
         """Initialize the class.
 
         Parameters
@@ -45,11 +57,26 @@ class Sequencer(object):
             The instance of the observing site configuration.
         idle_delay : float
             The delay time (seconds) to skip forward when no target is received.
+        sky_cube_file : str, optional
+            A pre-calculated sky brightness cube file to use instead of the sky model for the sky
+            brightness, target geometry and moon and sun information of the visits.
+        sky_prefetch : bool, optional
+            Flag to load the next sky model data chunk on a background thread.
+        slew_time_cache_file : str, optional
+            A file for the field-to-field slew time table. The table is read from the file at
+            initialization if it exists and matches the configuration, and written to it at
+            finalization.
+        aggregate_slew_activities : bool, optional
+            Flag to collect nightly slew activity statistics instead of the individual slew activities.
         """
         self.targets_received = 0
         self.targets_missed = 0
         self.observation = None
-        self.observatory_model = MainObservatory(obs_site_config)
+        self.observatory_model = MainObservatory(obs_site_config,
+                                                 slew_time_cache=slew_time_cache_file is not None,
+                                                 aggregate_slew_activities=aggregate_slew_activities)
+        self.slew_time_cache_file = slew_time_cache_file
+        self.obs_site_config = obs_site_config
         self.observatory_location = ObservatoryLocation(obs_site_config.latitude_rad,
                                                         obs_site_config.longitude_rad,
                                                         obs_site_config.height)
@@ -57,6 +84,13 @@ class Sequencer(object):
         self.log = logging.getLogger("kernel.Sequencer")
         self.idle_delay = (idle_delay, "seconds")
         self.sky_model = AstronomicalSkyModel(self.observatory_location)
+        self.sky_cube = None
+        if sky_cube_file is not None:
+            self.sky_cube = SkyBrightnessCube()
+            self.sky_cube.initialize(sky_cube_file)
+        self.sky_prefetcher = None
+        if sky_prefetch:
+            self.sky_prefetcher = SkyDataPrefetcher(self.sky_model.sky_brightness)
 
     @property
     def observations_made(self):
@@ -109,10 +143,34 @@ class Sequencer(object):
 
         return self.observatory_state
 
-    def initialize(self, sal, obs_config):
+    def get_slew_activity_statistics(self, night):
+        """Get the slew activity statistics for the night.
+
+        The statistics are cleared after retrieval.
+
+        Parameters
+        ----------
+        night : int
+            The current survey observing night.
+
+        Returns
+        -------
+        list[:class:`.SlewActivityStatistics`]
+            The statistics for each slew activity. Empty if the aggregated slew activity mode is not used.
+        """
+        aggregator = self.observatory_model.slew_activity_aggregator
+        if aggregator is None:
+            return []
+        statistics = aggregator.get_statistics(night)
+        aggregator.clear()
+        return statistics
+
+    def initialize(self, sal, obs_config, fields=None):
         """Perform initialization steps.
 
         This function handles gathering the observation telemetry topic from the given SalManager instance.
+        If the slew time table is used, it is read from its file when the file was written for the same
+        configuration and field set.
 
         Parameters
         ----------
@@ -120,10 +178,18 @@ class Sequencer(object):
             A SalManager instance.
         obs_config : :class:`.Observatory`
             The instance of the observatory configuration.
+        fields : iterable[tuple], optional
+            The field information rows of the survey field set.
         """
         self.observation = sal.set_publish_topic("observation")
         self.observatory_state = sal.set_publish_topic("observatoryState")
         self.observatory_model.configure(obs_config)
+        if self.slew_time_cache_file is not None:
+            slew_time_cache = self.observatory_model.slew_time_cache
+            slew_time_cache.set_config_hash({"obs_site": self.obs_site_config.toDict(),
+                                             "observatory": obs_config.toDict()}, fields or [])
+            if os.path.exists(self.slew_time_cache_file):
+                slew_time_cache.read(self.slew_time_cache_file)
 
     def finalize(self):
         """Perform finalization steps.
@@ -133,6 +199,16 @@ class Sequencer(object):
         self.log.info("Number of targets received: {}".format(self.targets_received))
         self.log.info("Number of observations made: {}".format(self.observations_made))
         self.log.info("Number of targets missed: {}".format(self.targets_missed))
+        if self.sky_prefetcher is not None:
+            self.sky_prefetcher.finalize()
+            self.log.info("Sky data prefetch hits: {}".format(self.sky_prefetcher.prefetch_hits))
+            self.log.info("Sky data prefetch misses: {}".format(self.sky_prefetcher.prefetch_misses))
+            stall_time = self.sky_prefetcher.stall_time
+            self.log.info("Sky data chunk load wait time: {:.3f} seconds".format(stall_time))
+        if self.slew_time_cache_file is not None:
+            slew_time_cache = self.observatory_model.slew_time_cache
+            self.log.info("Number of slew time table entries: {}".format(len(slew_time_cache)))
+            slew_time_cache.write(self.slew_time_cache_file)
 
     def observe_target(self, target, th):
         """Observe the given target.
@@ -160,27 +236,40 @@ class Sequencer(object):
             An observation telemetry topic containing the observed target parameters.
         dict(:class:`.SlewHistory`, :class:`.SlewState`, :class:`.SlewState`, list[:class:`.SlewActivity`])
             A dictionanry of all the slew information from the visit.
-        dict(list[:class:`.TargetExposure`], list[:class:`.ObsExposure`])
-            A dictionary of all the exposure information from the visit.
+        dict(str : slice)
+            The location of the visit's exposures in the target and observation exposure buffers of
+            the observatory model.
         """
         if target.targetId != -1:
             self.log.log(LoggingLevel.EXTENSIVE.value, "Received target {}".format(target.targetId))
             self.targets_received += 1
 
-            self.sky_model.update(target.request_time)
-            target.request_mjd = self.sky_model.date_profile.mjd
+            if self.sky_cube is not None:
+                target.request_mjd, _ = self.observatory_model.date_profile(target.request_time)
+            else:
+                self.prefetch_sky_data(target.request_time)
+                self.sky_model.update(target.request_time)
+                target.request_mjd = self.sky_model.date_profile.mjd
 
             slew_info, exposure_info = self.observatory_model.observe(th, target, self.observation)
-            self.sky_model.update(self.observation.observation_start_time)
+            start_time = self.observation.observation_start_time
 
             nid = numpy.array([target.fieldId])
             nra = numpy.radians(numpy.array([self.observation.ra]))
             ndec = numpy.radians(numpy.array([self.observation.dec]))
 
-            sky_mags = self.sky_model.get_sky_brightness(nid, extrapolate=True,
-                                                         override_exclude_planets=False)
-            attrs = self.sky_model.get_target_information(nid, nra, ndec)
-            msi = self.sky_model.get_moon_sun_info(nra, ndec)
+            if self.sky_cube is not None:
+                # The sky model is not updated, the cube has everything for the visit.
+                sky_mags = self.sky_cube.get_sky_brightness(start_time, nid)
+                attrs = self.sky_cube.get_target_information(start_time, nra, ndec,
+                                                             self.observatory_location.latitude_rad)
+                msi = self.sky_cube.get_moon_sun_info(start_time, nra, ndec)
+            else:
+                self.sky_model.update(start_time)
+                sky_mags = self.sky_model.get_sky_brightness(nid, extrapolate=True,
+                                                             override_exclude_planets=False)
+                attrs = self.sky_model.get_target_information(nid, nra, ndec)
+                msi = self.sky_model.get_moon_sun_info(nra, ndec)
 
             self.observation.sky_brightness = sky_mags[self.observation.filter][0]
             self.observation.airmass = attrs["airmass"][0]
@@ -220,14 +309,28 @@ class Sequencer(object):
 
         return self.observation, slew_info, exposure_info
 
+    def prefetch_sky_data(self, timestamp):
+        """Check the sky model data prefetching.
+
+        Parameters
+        ----------
+        timestamp : float
+            The current UTC timestamp (units=seconds).
+        """
+        if self.sky_prefetcher is not None:
+            self.sky_prefetcher.update(timestamp)
+
     def sky_brightness_config(self):
-        """Get the configuration from the SkyModelPre files.
+        """Get the configuration from the SkyModelPre files and the sky brightness cube if used.
 
         Returns
         -------
         list[tuple(key, value)]
         """
-        return self.sky_model.sky_brightness_config()
+        config = self.sky_model.sky_brightness_config()
+        if self.sky_cube is not None:
+            config = list(config) + self.sky_cube.sky_brightness_config()
+        return config
 
     def start_day(self, filter_swap):
         """Perform start of day functions.
@@ -15,13 +15,13 @@ from lsst.sims.survey.fields import FieldsDatabase, FieldSelection
 from lsst.sims.ocs.configuration import ConfigurationCommunicator
 from lsst.sims.ocs.database.tables import write_config, write_field
 from lsst.sims.ocs.database.tables import write_proposal, write_proposal_field
-from lsst.sims.ocs.environment import CloudModel, SeeingModel
+from lsst.sims.ocs.environment import CloudMapModel, CloudModel, SeeingModel
 from lsst.sims.ocs.kernel import DowntimeHandler, ObsProposalHistory
 from lsst.sims.ocs.kernel import ProposalInfo, ProposalFieldInfo
 from lsst.sims.ocs.kernel import Sequencer, TargetProposalHistory, TimeHandler
 from lsst.sims.ocs.sal import SalManager, topic_strdict
 from lsst.sims.ocs.setup import LoggingLevel
-from lsst.sims.ocs.utilities.constants import DAYS_IN_YEAR, SECONDS_IN_MINUTE
+from lsst.sims.ocs.utilities.constants import DAYS_IN_YEAR, SECONDS_IN_DAY, SECONDS_IN_MINUTE
 from lsst.sims.ocs.utilities.socs_exceptions import SchedulerTimeoutError
 from lsst.sims.utils import m5_flat_sed
 
@@ -54,7 +54,7 @@ class Simulator(object):
         The downtime handler instance.
     conf_comm : :class:`.ConfigurationCommunicator`
         The configuration communicator instance.
-    cloud_model : :class:`.CloudModel`
+    cloud_model : :class:`.CloudModel` or :class:`.CloudMapModel`
         The cloud model instance.
     seeing_model : :class:`.SeeingModel`
         The seeing model instance.
@@ -87,12 +87,19 @@ class Simulator(object):
         self.time_handler = TimeHandler(self.conf.survey.start_date)
         self.log = logging.getLogger("kernel.Simulator")
         self.sal = SalManager()
-        self.seq = Sequencer(self.conf.observing_site, self.conf.survey.idle_delay)
+        self.seq = Sequencer(self.conf.observing_site, self.conf.survey.idle_delay,
+                             sky_cube_file=self.opts.sky_cube,
+                             sky_prefetch=self.opts.sky_prefetch,
+                             slew_time_cache_file=self.opts.slew_time_cache,
+                             aggregate_slew_activities=self.opts.aggregate_slew_activities)
         self.dh = DowntimeHandler()
         self.conf_comm = ConfigurationCommunicator()
         self.sun = Sun()
-        self.cloud_model = CloudModel(self.time_handler)
-        self.seeing_model = SeeingModel(self.time_handler)
+        if self.conf.environment.cloud_map_file != "":
+            self.cloud_model = CloudMapModel(self.time_handler)
+        else:
+            self.cloud_model = CloudModel(self.time_handler, shared_memory=self.opts.shared_environment)
+        self.seeing_model = SeeingModel(self.time_handler, shared_memory=self.opts.shared_environment)
         self.field_database = FieldsDatabase()
         self.field_selection = FieldSelection()
         self.obs_site_info = (self.conf.observing_site.longitude, self.conf.observing_site.latitude)
@@ -112,16 +119,31 @@ class Simulator(object):
     def end_night(self):
         """Perform actions at the end of the night.
         """
+        for statistics in self.seq.get_slew_activity_statistics(self.comm_time.night):
+            self.db.append_data("slew_activity_statistics", statistics)
+        exposure_columns = self.seq.observatory_model.get_exposure_columns()
+        if self.wait_for_scheduler:
+            for exposure_type, column_data in exposure_columns.items():
+                self.db.append_columns(exposure_type, column_data)
         self.db.write()
         self.seq.end_night()
 
     def finalize(self):
         """Perform finalization steps.
 
-        This function handles finalization of the :class:`.SalManager` and :class:`.Sequencer` instances.
+        This function handles finalization of the :class:`.SalManager` and :class:`.Sequencer` instances,
+        logs the environment topic counts, releases any environment information attached from shared
+        memory and finalizes the simulation database.
         """
+        self.log.info("Cloud topics published: {}, unchanged: {}".format(self.cloud_model.topics_published,
+                                                                         self.cloud_model.topics_unchanged))
+        self.log.info("Seeing topics published: {}, unchanged: {}".format(self.seeing_model.topics_published,
+                                                                          self.seeing_model.topics_unchanged))
+        self.cloud_model.detach()
+        self.seeing_model.detach()
         self.seq.finalize()
         self.sal.finalize()
+        self.db.finalize()
         self.log.info("Ending simulation")
 
     def gather_proposal_history(self, phtype, topic):
@@ -182,11 +204,22 @@ class Simulator(object):
         self.log.info("Initializing simulation")
         self.log.info("Simulation Session Id = {}".format(self.db.session_id))
         self.sal.initialize()
-        self.seq.initialize(self.sal, self.conf.observatory)
+        fields = None
+        if self.opts.slew_time_cache is not None:
+            fields = self.field_database.get_field_set(self.field_selection.get_all_fields())
+        self.seq.initialize(self.sal, self.conf.observatory, fields=fields)
         self.dh.initialize(self.conf.downtime)
         self.dh.write_downtime_to_db(self.db)
-        self.cloud_model.initialize(self.conf.environment.cloud_db)
+        if self.conf.environment.cloud_map_file != "":
+            self.cloud_model.initialize(self.conf.environment.cloud_map_file)
+        else:
+            self.cloud_model.initialize(self.conf.environment.cloud_db,
+                                        stream_window=self.conf.environment.stream_window)
         self.seeing_model.initialize(self.conf.environment, self.conf.observatory.filters)
+        if self.conf.environment.synthetic_weather:
+            duration = self.conf.survey.full_duration * SECONDS_IN_DAY
+            self.cloud_model.synthesize(duration, seed=self.conf.environment.weather_random_seed)
+            self.seeing_model.synthesize(duration, seed=self.conf.environment.weather_random_seed + 1)
         self.conf_comm.initialize(self.sal, self.conf)
         self.comm_time = self.sal.set_publish_topic("timeHandler")
         self.target = self.sal.set_subscribe_topic("target")
@@ -222,11 +255,13 @@ class Simulator(object):
                              "Observatory State: {}".format(topic_strdict(observatory_state)))
                 self.sal.put(observatory_state)
 
-                self.cloud_model.set_topic(self.time_handler, self.cloud)
-                self.sal.put(self.cloud)
+                if self.cloud_model.set_topic(self.time_handler, self.cloud,
+                                              on_change=self.opts.environment_on_change):
+                    self.sal.put(self.cloud)
 
-                self.seeing_model.set_topic(self.time_handler, self.seeing)
-                self.sal.put(self.seeing)
+                if self.seeing_model.set_topic(self.time_handler, self.seeing,
+                                               on_change=self.opts.environment_on_change):
+                    self.sal.put(self.seeing)
 
                 self.get_target_from_scheduler()
 
@@ -235,7 +270,8 @@ class Simulator(object):
                 # Add a few more things to the observation
                 observation.night = night
                 elapsed_time = self.time_handler.time_since_given(observation.observation_start_time)
-                observation.cloud = self.cloud_model.get_cloud(elapsed_time)
+                observation.cloud = self.cloud_model.get_cloud_at(elapsed_time, observation.altitude,
+                                                                  observation.azimuth)
                 seeing_values = self.seeing_model.calculate_seeing(elapsed_time, observation.filter,
                                                                    observation.airmass)
                 observation.seeing_fwhm_500 = seeing_values[0]
@@ -280,13 +316,6 @@ class Simulator(object):
                                 self.db.append_data(slew_type, data)
                         else:
                             self.db.append_data(slew_type, slew_data)
-                    for exposure_type in exposure_info:
-                        self.log.log(LoggingLevel.TRACE.value, "Adding {} to DB".format(exposure_type))
-                        self.log.log(LoggingLevel.TRACE.value,
-                                     "Number of exposures being added: "
-                                     "{}".format(len(exposure_info[exposure_type])))
-                        for exposure in exposure_info[exposure_type]:
-                            self.db.append_data(exposure_type, exposure)
 
             self.end_night()
             self.start_day()
@@ -384,6 +413,7 @@ class Simulator(object):
         self.log.debug("Start of night {} at {}".format(night, self.time_handler.current_timestring))
 
         self.end_of_night = rise_timestamp
+        self.seq.prefetch_sky_data(self.time_handler.current_timestamp)
 
         end_of_night_str = self.time_handler.future_timestring(0, "seconds", timestamp=self.end_of_night)
         self.log.debug("End of night {} at {}".format(night, end_of_night_str))
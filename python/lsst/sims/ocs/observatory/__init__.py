@@ -2,7 +2,12 @@
 Module for classes that implement the necessary behavior for the SOCS additions to the
 Scheduler Observatory Model.
 """
+from .exposure_buffer import *
 from .exposure_information import *
 from .slew_information import *
+from .slew_activity_aggregator import *
+from .slew_time_cache import *
+from .state_snapshot import *
 from .variational_model import *
 from .main_observatory import *
+from .slew_replay import *
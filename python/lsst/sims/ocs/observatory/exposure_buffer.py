@@ -0,0 +1,100 @@
+from builtins import object
+import numpy
+
+__all__ = ["ExposureBuffer"]
+
+class ExposureBuffer(object):
+    """Growable column buffers for exposure information.
+
+    This class keeps a numpy array for each column of an exposure table. Rows are added in blocks,
+    one block per visit, and the arrays double in size when they fill up.
+
+    Attributes
+    ----------
+    size : int
+        The number of rows stored in the buffers.
+    column_names : list[str]
+        The names of the columns.
+    columns : dict(str : numpy.ndarray)
+        The column arrays. Only the first size entries are valid.
+    """
+
+    def __init__(self, column_types, initial_size=1024):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        column_types : list[tuple(str, type)]
+            The name and numpy type for each column.
+        initial_size : int, optional
+            The starting number of rows for the buffers.
+        """
+        self.size = 0
+        self.column_names = [name for name, _ in column_types]
+        self.columns = {name: numpy.zeros(initial_size, dtype=dtype) for name, dtype in column_types}
+
+    def __len__(self):
+        """Return the number of stored rows.
+
+        Returns
+        -------
+        int
+        """
+        return self.size
+
+    def append(self, **column_data):
+        """Add a block of rows to the buffers.
+
+        Parameters
+        ----------
+        **column_data
+            The values for each column. Array values must all have the same length and at least one
+            value must be an array. Scalar values are used for all of the rows in the block. An empty
+            block adds no rows.
+
+        Returns
+        -------
+        slice
+            The location of the new rows in the buffers.
+        """
+        num_rows = max([numpy.size(values) for values in column_data.values() if numpy.ndim(values)] + [0])
+        if not num_rows:
+            return slice(self.size, self.size)
+        new_size = self.size + num_rows
+        capacity = self.columns[self.column_names[0]].size
+        if new_size > capacity:
+            capacity = max(new_size, 2 * capacity)
+            for name in self.column_names:
+                column = numpy.zeros(capacity, dtype=self.columns[name].dtype)
+                column[:self.size] = self.columns[name][:self.size]
+                self.columns[name] = column
+
+        rows = slice(self.size, new_size)
+        for name in self.column_names:
+            self.columns[name][rows] = column_data[name]
+        self.size = new_size
+        return rows
+
+    def clear(self):
+        """Remove all of the stored rows.
+
+        The allocated buffers are kept for reuse.
+        """
+        self.size = 0
+
+    def get_columns(self, rows=None):
+        """Get the stored information for each column.
+
+        Parameters
+        ----------
+        rows : slice, optional
+            The set of rows to get. Default is all of the stored rows.
+
+        Returns
+        -------
+        dict(str : numpy.ndarray)
+            A copy of the column information.
+        """
+        if rows is None:
+            rows = slice(0, self.size)
+        return {name: self.columns[name][rows].copy() for name in self.column_names}
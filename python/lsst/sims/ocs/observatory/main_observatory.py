@@ -1,18 +1,20 @@
 from builtins import object
 from builtins import range
 from builtins import str
-import copy
 import logging
 import math
 
+import numpy
 import palpy
 
 from lsst.ts.dateloc import DateProfile, ObservatoryLocation
 from lsst.ts.observatory.model import ObservatoryModel, Target
 
 from lsst.sims.ocs.setup import LoggingLevel
-from lsst.sims.ocs.observatory import ObsExposure, TargetExposure
-from lsst.sims.ocs.observatory import SlewActivity, SlewHistory, SlewMaxSpeeds, SlewState
+from lsst.sims.ocs.observatory import ExposureBuffer
+from lsst.sims.ocs.observatory import SlewActivity, SlewActivityAggregator, SlewHistory, SlewMaxSpeeds
+from lsst.sims.ocs.observatory import SlewState
+from lsst.sims.ocs.observatory import SlewTimeCache, StateSnapshot
 from lsst.sims.ocs.observatory import VariationalModel
 
 __all__ = ["MainObservatory"]
@@ -33,15 +35,41 @@ class MainObservatory(object):
         The instance of the Observatory model from the LSST Scheduler.
     param_dict : dict
         The configuration parameters for the Observatory model.
+    target_exposures : :class:`.ExposureBuffer`
+        The column buffers for the night's target exposure information.
+    observation_exposures : :class:`.ExposureBuffer`
+        The column buffers for the night's observation exposure information.
+    visit_exposure_rows : dict(str : slice) or None
+        The location of the last visit's exposures in the exposure buffers.
+    visit_exposure_times : numpy.ndarray or None
+        The exposure times (units=seconds) of the last visit.
+    slew_time_cache : :class:`.SlewTimeCache` or None
+        The field-to-field slew time table if it is enabled.
+    current_field_id : int or None
+        The field Id of the last target slewed to. None after parking.
+    slew_activity_aggregator : :class:`.SlewActivityAggregator` or None
+        The slew activity statistics collector if the aggregated slew activity mode is enabled.
     """
 
-    def __init__(self, obs_site_config):
+    TARGET_EXPOSURE_COLUMNS = [("exposureId", numpy.int64), ("exposureNum", numpy.int64),
+                               ("exposureTime", numpy.float64), ("TargetHistory_targetId", numpy.int64)]
+    """The column names and types for the target exposure information."""
+    OBSERVATION_EXPOSURE_COLUMNS = [("exposureId", numpy.int64), ("exposureNum", numpy.int64),
+                                    ("exposureTime", numpy.float64), ("exposureStartTime", numpy.float64),
+                                    ("ObsHistory_observationId", numpy.int64)]
+    """The column names and types for the observation exposure information."""
+
+    def __init__(self, obs_site_config, slew_time_cache=False, aggregate_slew_activities=False):
         """Initialize the class.
 
         Parameters
         ----------
         obs_site_config : :class:`.ObservingSite`
             The instance of the observing site configuration.
+        slew_time_cache : bool, optional
+            Flag to record the slew times in a field-to-field slew time table.
+        aggregate_slew_activities : bool, optional
+            Flag to collect slew activity statistics instead of the individual slew activities.
         """
         self.log = logging.getLogger("observatory.MainObservatory")
         observatory_location = ObservatoryLocation()
@@ -53,8 +81,10 @@ class MainObservatory(object):
         self.slew_count = 0
         self.observations_made = 0
         self.exposures_made = 0
-        self.target_exposure_list = None
-        self.observation_exposure_list = None
+        self.target_exposures = ExposureBuffer(self.TARGET_EXPOSURE_COLUMNS)
+        self.observation_exposures = ExposureBuffer(self.OBSERVATION_EXPOSURE_COLUMNS)
+        self.visit_exposure_rows = None
+        self.visit_exposure_times = None
         self.slew_history = None
         self.slew_final_state = None
         self.slew_initial_state = None
@@ -62,6 +92,9 @@ class MainObservatory(object):
         self.slew_activities_done = 0
         self.slew_maxspeeds = None
         self.variational_model = None
+        self.slew_time_cache = SlewTimeCache() if slew_time_cache else None
+        self.current_field_id = None
+        self.slew_activity_aggregator = SlewActivityAggregator() if aggregate_slew_activities else None
 
     def __getattr__(self, name):
         """Find attributes in lsst.ts.scheduler.observator_model.ObservatorModel as well as MainObservatory.
@@ -85,6 +118,8 @@ class MainObservatory(object):
         visit_time = sum over number of exposures (shutter_time + effective exposure time)
         visit_time += (number of exposures - 1) * camera readout time
 
+        The exposure information is added to the target and observation exposure buffers.
+
         Parameters
         ----------
         target : SALPY_scheduler.targetC
@@ -95,31 +130,59 @@ class MainObservatory(object):
         (float, str)
             The calculated visit time and a unit string (default it seconds).
         """
-        self.target_exposure_list = []
-        self.observation_exposure_list = []
-
         camera_config = self.config.camera
         shutter_time = 2.0 * (0.5 * camera_config.shutter_time)
 
-        visit_time = 0.0
-        for i in range(target.num_exposures):
-            self.exposures_made += 1
-            effective_exposure_time = target.exposure_times[i]
-            self.target_exposure_list.append(TargetExposure(self.exposures_made, i + 1,
-                                                            effective_exposure_time,
-                                                            target.targetId))
+        num_exposures = target.num_exposures
+        exposure_times = numpy.array([target.exposure_times[i] for i in range(num_exposures)],
+                                     dtype=numpy.float64)
+        # Interleave the exposures and readouts so the sums follow the exposure sequence.
+        increments = numpy.empty(max(2 * num_exposures - 1, 0))
+        increments[0::2] = shutter_time + exposure_times
+        increments[1::2] = camera_config.readout_time
+        elapsed_times = numpy.cumsum(increments)
+        visit_time = float(elapsed_times[-1]) if num_exposures else 0.0
+        # Each exposure after the first starts at the end of the previous readout.
+        start_times = th.current_timestamp + numpy.concatenate(([0.0], elapsed_times[1::2]))[:num_exposures]
+
+        exposure_ids = numpy.arange(self.exposures_made + 1, self.exposures_made + num_exposures + 1)
+        exposure_nums = numpy.arange(1, num_exposures + 1)
+        self.exposures_made += num_exposures
+
+        target_rows = self.target_exposures.append(exposureId=exposure_ids, exposureNum=exposure_nums,
+                                                   exposureTime=exposure_times,
+                                                   TargetHistory_targetId=target.targetId)
+        observation_rows = self.observation_exposures.append(exposureId=exposure_ids,
+                                                             exposureNum=exposure_nums,
+                                                             exposureTime=exposure_times,
+                                                             exposureStartTime=start_times,
+                                                             ObsHistory_observationId=self.observations_made)
+        self.visit_exposure_rows = {"target_exposures": target_rows,
+                                    "observation_exposures": observation_rows}
+        self.visit_exposure_times = exposure_times
 
-            exposure_start_time = th.future_timestamp(visit_time, "seconds")
-            visit_time += (shutter_time + effective_exposure_time)
+        return (visit_time, "seconds")
 
-            self.observation_exposure_list.append(ObsExposure(self.exposures_made, i + 1,
-                                                              effective_exposure_time,
-                                                              exposure_start_time, self.observations_made))
+    def cache_slew_time(self, target, initial_slew_state, slew_time):
+        """Record a slew time in the slew time table.
 
-            if i < (target.num_exposures - 1):
-                visit_time += camera_config.readout_time
+        Slews that do not start from a known field, i.e. after parking, are not recorded.
 
-        return (visit_time, "seconds")
+        Parameters
+        ----------
+        target : SALPY_scheduler.targetC
+            The Scheduler topic instance holding the target information.
+        initial_slew_state : :class:`.StateSnapshot`
+            The observatory state at the start of the slew.
+        slew_time : float
+            The slew time (units=seconds).
+        """
+        if self.current_field_id is None:
+            return
+        _, lst = self.date_profile(initial_slew_state.time)
+        self.slew_time_cache.add(self.current_field_id, target.fieldId,
+                                 initial_slew_state.filter != target.filter,
+                                 initial_slew_state.telrot, math.degrees(lst), slew_time)
 
     def configure(self, obs_config):
         """Configure the ObservatoryModel parameters.
@@ -134,21 +197,109 @@ class MainObservatory(object):
         self.model.configure(self.param_dict)
         self.variational_model = VariationalModel(obs_config)
 
+    def estimate_slew_time(self, target):
+        """Estimate the slew time from the current state to the given target from the slew time table.
+
+        Parameters
+        ----------
+        target : SALPY_scheduler.targetC
+            The Scheduler topic instance holding the target information.
+
+        Returns
+        -------
+        float or None
+            The estimated slew time (units=seconds). None if the slew time table is not enabled, the
+            observatory is parked or the slew has not been recorded.
+        """
+        if self.slew_time_cache is None or self.current_field_id is None:
+            return None
+        current_state = self.model.current_state
+        _, lst = self.date_profile(current_state.time)
+        return self.slew_time_cache.get_slew_time(self.current_field_id, target.fieldId,
+                                                  current_state.filter != target.filter,
+                                                  current_state.telrot, math.degrees(lst))
+
+    def evaluate_slews(self, ra, dec, angle, filters):
+        """Evaluate the slews from the current state to a set of candidate targets.
+
+        This function calculates the slew time and critical path activities for each candidate target
+        using the same steps as lsst.ts.observatory.model.ObservatoryModel::slew, but does not change
+        the observatory state. The coordinate arrays are converted once and the candidates are
+        evaluated against the same starting state.
+
+        Parameters
+        ----------
+        ra : numpy.ndarray
+            The right ascensions (units=degrees) of the candidate targets.
+        dec : numpy.ndarray
+            The declinations (units=degrees) of the candidate targets.
+        angle : numpy.ndarray
+            The sky angles (units=degrees) of the candidate targets.
+        filters : list[str]
+            The filters of the candidate targets.
+
+        Returns
+        -------
+        (numpy.ndarray, list[list[str]])
+            The slew times (units=seconds) and the critical path activities for each candidate.
+        """
+        ra_rad = numpy.radians(numpy.asarray(ra, dtype=float))
+        dec_rad = numpy.radians(numpy.asarray(dec, dtype=float))
+        ang_rad = numpy.radians(numpy.asarray(angle, dtype=float))
+        if not (ra_rad.shape == dec_rad.shape == ang_rad.shape == (len(filters),)):
+            raise ValueError("Candidate ra, dec, angle and filters must have the same length.")
+
+        slew_times = numpy.zeros(ra_rad.size)
+        critical_paths = []
+        current_state = self.model.current_state
+        last_delays = self.model.lastslew_delays_dict
+        last_critical_path = self.model.lastslew_criticalpath
+        try:
+            for i, filter_name in enumerate(filters):
+                target_position = self.model.radecang2position(self.model.dateprofile, ra_rad[i],
+                                                               dec_rad[i], ang_rad[i], filter_name)
+                target_state = self.model.get_closest_state(target_position)
+                slew_times[i] = self.model.get_slew_delay_for_state(target_state, current_state, True)
+                critical_paths.append(list(self.model.lastslew_criticalpath))
+        finally:
+            self.model.lastslew_delays_dict = last_delays
+            self.model.lastslew_criticalpath = last_critical_path
+
+        return slew_times, critical_paths
+
+    def get_exposure_columns(self):
+        """Get the night's exposure information and clear the exposure buffers.
+
+        Returns
+        -------
+        dict(str : dict(str : numpy.ndarray))
+            The column information for the target and observation exposures.
+        """
+        exposure_columns = {"target_exposures": self.target_exposures.get_columns(),
+                            "observation_exposures": self.observation_exposures.get_columns()}
+        self.target_exposures.clear()
+        self.observation_exposures.clear()
+        return exposure_columns
+
     def get_slew_activities(self):
         """Get the slew activities for the given slew.
 
         This function retrieved the list of slew activities from the model after
         lsst.ts.scheduler.observatory_model.ObservatoryModel::slew is called. The
         activites are stored in an internal structure so parameters nor returns are
-        necessary.
+        necessary. In the aggregated slew activity mode, the activities are added to
+        the statistics instead and the list stays empty.
         """
         self.slew_activities_list = []
         critical_activities = self.model.lastslew_criticalpath
         for activity, delay in self.model.lastslew_delays_dict.items():
-            self.slew_activities_done += 1
-            self.slew_activities_list.append(SlewActivity(self.slew_activities_done, activity, delay,
-                                                          str(activity in critical_activities),
-                                                          self.slew_count))
+            if self.slew_activity_aggregator is not None:
+                self.slew_activity_aggregator.add(activity, delay, activity in critical_activities)
+            else:
+                self.slew_activities_done += 1
+                self.slew_activities_list.append(SlewActivity(self.slew_activities_done, activity, delay,
+                                                              str(activity in critical_activities),
+                                                              self.slew_count))
 
     def get_slew_state(self, slew_state_info):
         """Get the slew state from the current state instance.
@@ -158,7 +309,7 @@ class MainObservatory(object):
 
         Parameters
         ----------
-        slew_state_info : lsst.ts.scheduler.observatory_model.ObservatoryState
+        slew_state_info : lsst.ts.scheduler.observatory_model.ObservatoryState or :class:`.StateSnapshot`
             The current slew state instance.
 
         Returns
@@ -190,8 +341,8 @@ class MainObservatory(object):
         -------
         dict(:class:`.SlewHistory`, :class:`.SlewState`, :class:`.SlewState`, list[:class:`.SlewActivity`])
             A dictionanry of all the slew information from the visit.
-        dict(list[:class:`.TargetExposure`], list[:class:`.ObsExposure`])
-            A dictionary of all the exposure information from the visit.
+        dict(str : slice)
+            The location of the visit's exposures in the target and observation exposure buffers.
         """
         self.observations_made += 1
 
@@ -226,8 +377,8 @@ class MainObservatory(object):
                      "Visit Time for Target {}: {}".format(target.targetId, visit_time[0]))
 
         observation.visit_time = visit_time[0]
-        for i, exposure in enumerate(self.observation_exposure_list):
-            observation.exposure_times[i] = int(exposure.exposureTime)
+        for i, exposure_time in enumerate(self.visit_exposure_times.tolist()):
+            observation.exposure_times[i] = int(exposure_time)
 
         time_handler.update_time(*visit_time)
 
@@ -239,10 +390,15 @@ class MainObservatory(object):
                      "slew_final_state": self.slew_final_state, "slew_activities": self.slew_activities_list,
                      "slew_maxspeeds": self.slew_maxspeeds}
 
-        exposure_info = {"target_exposures": self.target_exposure_list,
-                         "observation_exposures": self.observation_exposure_list}
+        return slew_info, self.visit_exposure_rows
+
+    def park(self):
+        """Park the observatory.
 
-        return slew_info, exposure_info
+        The field Id of the last target is cleared since the next slew will start from the park position.
+        """
+        self.model.park()
+        self.current_field_id = None
 
     def slew(self, target):
         """Perform the slewing operation for the observatory to the given target.
@@ -259,14 +415,14 @@ class MainObservatory(object):
         """
         self.slew_count += 1
         self.log.log(LoggingLevel.TRACE.value, "Slew count: {}".format(self.slew_count))
-        initial_slew_state = copy.deepcopy(self.model.current_state)
+        initial_slew_state = StateSnapshot(self.model.current_state)
         self.log.log(LoggingLevel.TRACE.value, "Initial slew state: {}".format(initial_slew_state))
         self.slew_initial_state = self.get_slew_state(initial_slew_state)
 
         sched_target = Target.from_topic(target)
         self.model.slew(sched_target)
 
-        final_slew_state = copy.deepcopy(self.model.current_state)
+        final_slew_state = StateSnapshot(self.model.current_state)
         self.log.log(LoggingLevel.TRACE.value, "Final slew state: {}".format(final_slew_state))
         self.slew_final_state = self.get_slew_state(final_slew_state)
 
@@ -286,6 +442,10 @@ class MainObservatory(object):
                                             final_slew_state.telaz_peakspeed,
                                             final_slew_state.telrot_peakspeed, self.slew_count)
 
+        if self.slew_time_cache is not None:
+            self.cache_slew_time(target, initial_slew_state, slew_time[0])
+        self.current_field_id = target.fieldId
+
         return slew_time
 
     def start_night(self, night, duration):
@@ -299,8 +459,14 @@ class MainObservatory(object):
             The survey duration in days.
         """
         if self.variational_model.active:
-            new_obs_config = self.variational_model.modify_parameters(night, duration)
-            self.model.configure(new_obs_config)
+            updated_parameters = self.variational_model.update_parameters(night, duration)
+            for sub_system, sub_system_conf in updated_parameters.items():
+                self.log.log(LoggingLevel.EXTENSIVE.value,
+                             "Reconfiguring observatory {} for night {}.".format(sub_system, night))
+                getattr(self.model, "configure_{}".format(sub_system))(sub_system_conf)
+            # Recorded slew times are not valid for the new parameters.
+            if updated_parameters and self.slew_time_cache is not None:
+                self.slew_time_cache.clear()
 
     def swap_filter(self, filter_to_unmount):
         """Perform a filter swap.
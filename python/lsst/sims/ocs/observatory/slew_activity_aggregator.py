@@ -0,0 +1,91 @@
+from builtins import object
+import collections
+import numpy
+
+from lsst.sims.ocs.observatory import SlewActivityStatistics
+
+__all__ = ["SlewActivityAggregator"]
+
+class SlewActivityAggregator(object):
+    """Collect statistics of the slew activities.
+
+    This class keeps a running count, critical path count, total and maximum delay and a delay
+    histogram for each slew activity instead of keeping the individual activities.
+
+    Attributes
+    ----------
+    bin_width : float
+        The width (units=seconds) of the delay histogram bins.
+    num_bins : int
+        The number of delay histogram bins. An extra bin holds the delays beyond the histogram range.
+    statistics : collections.OrderedDict
+        The running statistics for each slew activity.
+    statistics_made : int
+        Counter for the number of statistics entries created.
+    """
+
+    def __init__(self, bin_width=1.0, num_bins=60):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        bin_width : float, optional
+            The width (units=seconds) of the delay histogram bins.
+        num_bins : int, optional
+            The number of delay histogram bins.
+        """
+        self.bin_width = bin_width
+        self.num_bins = num_bins
+        self.statistics = collections.OrderedDict()
+        self.statistics_made = 0
+
+    def add(self, activity, delay, in_critical_path):
+        """Add a slew activity to the statistics.
+
+        Parameters
+        ----------
+        activity : str
+            The name of the slew activity.
+        delay : float
+            The delay time (units=seconds) of the slew activity.
+        in_critical_path : bool
+            Flag for the slew activity being in the critical path.
+        """
+        try:
+            stats = self.statistics[activity]
+        except KeyError:
+            stats = [0, 0, 0.0, 0.0, numpy.zeros(self.num_bins + 1, dtype=int)]
+            self.statistics[activity] = stats
+        stats[0] += 1
+        if in_critical_path:
+            stats[1] += 1
+        stats[2] += delay
+        stats[3] = max(stats[3], delay)
+        stats[4][min(max(int(delay // self.bin_width), 0), self.num_bins)] += 1
+
+    def clear(self):
+        """Remove all of the running statistics.
+        """
+        self.statistics.clear()
+
+    def get_statistics(self, night):
+        """Get the statistics for all of the slew activities.
+
+        Parameters
+        ----------
+        night : int
+            The survey night for the statistics.
+
+        Returns
+        -------
+        list[:class:`.SlewActivityStatistics`]
+        """
+        statistics = []
+        for activity in sorted(self.statistics):
+            num_activities, num_critical_path, total_delay, max_delay, histogram = self.statistics[activity]
+            self.statistics_made += 1
+            statistics.append(SlewActivityStatistics(self.statistics_made, night, activity, num_activities,
+                                                     num_critical_path, total_delay, max_delay,
+                                                     self.bin_width,
+                                                     ",".join([str(x) for x in histogram.tolist()])))
+        return statistics
@@ -1,6 +1,6 @@
 import collections
 
-__all__ = ["SlewActivity", "SlewHistory", "SlewMaxSpeeds", "SlewState"]
+__all__ = ["SlewActivity", "SlewActivityStatistics", "SlewHistory", "SlewMaxSpeeds", "SlewState"]
 
 """Simple tuple for handling slew history information.
 """
@@ -19,6 +19,14 @@ SlewState = collections.namedtuple("SlewState", ["slewStateId", "slewStateDate",
 SlewActivity = collections.namedtuple("SlewActivity", ["slewActivityId", "activity", "activityDelay",
                                                        "inCriticalPath", "SlewHistory_slewCount"])
 
+"""Simple tuple for handling aggregated slew activity information.
+"""
+SlewActivityStatistics = collections.namedtuple("SlewActivityStatistics", ["slewActivityStatId", "night",
+                                                                           "activity", "numActivities",
+                                                                           "numCriticalPath", "totalDelay",
+                                                                           "maxDelay", "histogramBinWidth",
+                                                                           "delayHistogram"])
+
 """Simple tuple for handling slew maxspeeds.
 """
 SlewMaxSpeeds = collections.namedtuple("SlewMaxSpeeds", ["slewMaxSpeedId", "domeAltSpeed", "domeAzSpeed",
@@ -0,0 +1,213 @@
+from __future__ import division
+from builtins import object
+from builtins import range
+import collections
+import logging
+import multiprocessing
+import numpy
+
+from lsst.ts.observatory.model import Target
+
+from lsst.sims.ocs.observatory import MainObservatory
+from lsst.sims.ocs.setup import LoggingLevel
+
+__all__ = ["SlewReplay"]
+
+class SlewReplay(object):
+    """Replay the slews of a finished survey with a new observatory configuration.
+
+    This class takes the ordered visit pointings from a survey and re-calculates the slew times using
+    only the observatory slew model. Each night starts from the park position, so the nights are
+    independent and can be replayed in parallel. The visit information is a dictionary of equal length
+    arrays with the following keys: observationId, night, fieldId, slew_start (units=seconds), ra, dec,
+    angle (units=degrees) and filter.
+
+    Attributes
+    ----------
+    obs_site_config : :class:`.ObservingSite`
+        The instance of the observing site configuration.
+    obs_config : :class:`.Observatory`
+        The instance of the observatory configuration used for the replay.
+    observatory : :class:`.MainObservatory`
+        The instance of the SOCS observatory model.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    VISIT_KEYS = ("observationId", "night", "fieldId", "slew_start", "ra", "dec", "angle", "filter")
+    """The keys of the visit information."""
+
+    def __init__(self, obs_site_config, obs_config):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        obs_site_config : :class:`.ObservingSite`
+            The instance of the observing site configuration.
+        obs_config : :class:`.Observatory`
+            The instance of the observatory configuration used for the replay.
+        """
+        self.obs_site_config = obs_site_config
+        self.obs_config = obs_config
+        self.observatory = MainObservatory(obs_site_config)
+        self.observatory.configure(obs_config)
+        self.log = logging.getLogger("observatory.SlewReplay")
+
+    def mount_filters(self, filters):
+        """Make sure the given filters are mounted.
+
+        Any unmounted filter is swapped with a removable filter that is not in the given set.
+
+        Parameters
+        ----------
+        filters : list[str]
+            The set of filters needed.
+        """
+        needed = set(filters)
+        for filter_name in sorted(needed):
+            current_state = self.observatory.model.current_state
+            if filter_name in current_state.mountedfilters:
+                continue
+            for removable in self.obs_config.camera.filter_removable:
+                if removable in current_state.mountedfilters and removable not in needed:
+                    self.observatory.swap_filter(removable)
+                    break
+
+    def replay(self, visits, processes=1):
+        """Replay the slews for all of the visits.
+
+        Parameters
+        ----------
+        visits : dict(str : numpy.ndarray)
+            The ordered visit information.
+        processes : int, optional
+            The number of worker processes. Default is to replay in this process.
+
+        Returns
+        -------
+        numpy.ndarray
+            The slew times (units=seconds) for the visits.
+        """
+        nights = numpy.asarray(visits["night"])
+        boundaries = numpy.flatnonzero(numpy.diff(nights)) + 1
+        night_slices = [slice(start, stop) for start, stop in zip(numpy.r_[0, boundaries],
+                                                                  numpy.r_[boundaries, nights.size])]
+        night_visits = [{key: numpy.asarray(visits[key])[night_slice] for key in self.VISIT_KEYS}
+                        for night_slice in night_slices]
+        self.log.info("Replaying {} visits over {} nights.".format(nights.size, len(night_visits)))
+
+        if processes > 1:
+            pool = multiprocessing.Pool(processes, _init_worker, (self.obs_site_config, self.obs_config))
+            try:
+                results = pool.map(_replay_night, night_visits)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self.replay_night(night_visit) for night_visit in night_visits]
+
+        if not results:
+            return numpy.zeros(0)
+        return numpy.concatenate(results)
+
+    def replay_night(self, visits):
+        """Replay the slews for a single night of visits.
+
+        Parameters
+        ----------
+        visits : dict(str : numpy.ndarray)
+            The ordered visit information for the night.
+
+        Returns
+        -------
+        numpy.ndarray
+            The slew times (units=seconds) for the visits.
+        """
+        self.observatory.park()
+        self.mount_filters(visits["filter"])
+
+        num_visits = len(visits["observationId"])
+        slew_times = numpy.zeros(num_visits)
+        ra_rad = numpy.radians(visits["ra"])
+        dec_rad = numpy.radians(visits["dec"])
+        ang_rad = numpy.radians(visits["angle"])
+        target = Target()
+        model = self.observatory.model
+        for i in range(num_visits):
+            model.update_state(visits["slew_start"][i])
+            start_time = model.current_state.time
+            target.fieldid = int(visits["fieldId"][i])
+            target.filter = str(visits["filter"][i])
+            target.ra_rad = ra_rad[i]
+            target.dec_rad = dec_rad[i]
+            target.ang_rad = ang_rad[i]
+            model.slew(target)
+            slew_times[i] = model.current_state.time - start_time
+
+        if num_visits:
+            self.log.log(LoggingLevel.EXTENSIVE.value,
+                         "Replayed {} visits for night {}.".format(num_visits, visits["night"][0]))
+        return slew_times
+
+    @staticmethod
+    def summarize(original_slew_times, slew_times):
+        """Create the summary of the replayed slew times.
+
+        Parameters
+        ----------
+        original_slew_times : numpy.ndarray
+            The slew times (units=seconds) from the survey.
+        slew_times : numpy.ndarray
+            The replayed slew times (units=seconds).
+
+        Returns
+        -------
+        collections.OrderedDict
+        """
+        original_slew_times = numpy.asarray(original_slew_times, dtype=float)
+        slew_times = numpy.asarray(slew_times, dtype=float)
+        difference = slew_times - original_slew_times
+        original_total = original_slew_times.sum()
+
+        summary = collections.OrderedDict()
+        summary["num_visits"] = slew_times.size
+        summary["original_total_slew_time"] = original_total
+        summary["total_slew_time"] = slew_times.sum()
+        summary["original_mean_slew_time"] = original_slew_times.mean() if slew_times.size else 0.0
+        summary["mean_slew_time"] = slew_times.mean() if slew_times.size else 0.0
+        summary["median_slew_time"] = numpy.median(slew_times) if slew_times.size else 0.0
+        summary["max_slew_time_increase"] = difference.max() if slew_times.size else 0.0
+        summary["total_slew_time_change_percent"] = (100.0 * difference.sum() / original_total
+                                                     if original_total else 0.0)
+        return summary
+
+
+_worker_replay = None
+
+def _init_worker(obs_site_config, obs_config):
+    """Create the replay instance for a worker process.
+
+    Parameters
+    ----------
+    obs_site_config : :class:`.ObservingSite`
+        The instance of the observing site configuration.
+    obs_config : :class:`.Observatory`
+        The instance of the observatory configuration used for the replay.
+    """
+    global _worker_replay
+    _worker_replay = SlewReplay(obs_site_config, obs_config)
+
+def _replay_night(visits):
+    """Replay a night of visits in a worker process.
+
+    Parameters
+    ----------
+    visits : dict(str : numpy.ndarray)
+        The ordered visit information for the night.
+
+    Returns
+    -------
+    numpy.ndarray
+        The slew times (units=seconds) for the visits.
+    """
+    return _worker_replay.replay_night(visits)
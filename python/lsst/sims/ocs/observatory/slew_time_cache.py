@@ -0,0 +1,221 @@
+from __future__ import division
+from builtins import object
+from builtins import zip
+import hashlib
+import json
+import logging
+import math
+import numpy
+
+__all__ = ["SlewTimeCache"]
+
+class SlewTimeCache(object):
+    """Table of slew times between fields.
+
+    This class keeps the average slew time for a slew between two fields keyed on the from field,
+    the to field, the presence of a filter change, a bucket of the starting rotator position and a
+    bucket of the local sidereal time. The LST bucket accounts for the field positions changing
+    with time. The table is filled from the actual slews and can be saved to a file so that it can
+    be used for slew time cost estimation outside of SOCS. The file carries a hash of the
+    configuration and field set the slew times were recorded with, so a table from a different
+    setup is not used.
+
+    Attributes
+    ----------
+    rotator_bucket : float
+        The size (units=degrees) of the rotator position buckets.
+    lst_bucket : float
+        The size (units=degrees) of the local sidereal time buckets.
+    slew_times : dict
+        The set of keys with the total slew time and number of slews.
+    hits : int
+        Counter for the number of lookups with a stored slew time.
+    misses : int
+        Counter for the number of lookups without a stored slew time.
+    config_hash : str
+        The hash of the configuration and field set the slew times are valid for.
+    log : logging.Logger
+        The logging instance.
+    """
+
+    COLUMNS = ("from_field", "to_field", "filter_change", "rotator_bucket", "lst_bucket")
+    """The names of the key columns in the saved file."""
+
+    def __init__(self, rotator_bucket=10.0, lst_bucket=15.0):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        rotator_bucket : float, optional
+            The size (units=degrees) of the rotator position buckets.
+        lst_bucket : float, optional
+            The size (units=degrees) of the local sidereal time buckets.
+        """
+        self.rotator_bucket = rotator_bucket
+        self.lst_bucket = lst_bucket
+        self.slew_times = {}
+        self.hits = 0
+        self.misses = 0
+        self.config_hash = ""
+        self.log = logging.getLogger("observatory.SlewTimeCache")
+
+    def __len__(self):
+        """Return the number of stored slew keys.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.slew_times)
+
+    def add(self, from_field, to_field, filter_change, telrot, lst, slew_time):
+        """Add a slew time to the table.
+
+        Parameters
+        ----------
+        from_field : int
+            The field Id at the start of the slew.
+        to_field : int
+            The field Id at the end of the slew.
+        filter_change : bool
+            Flag for a filter change during the slew.
+        telrot : float
+            The rotator position (units=degrees) at the start of the slew.
+        lst : float
+            The local sidereal time (units=degrees) at the start of the slew.
+        slew_time : float
+            The slew time (units=seconds).
+        """
+        key = self.make_key(from_field, to_field, filter_change, telrot, lst)
+        try:
+            entry = self.slew_times[key]
+            entry[0] += slew_time
+            entry[1] += 1
+        except KeyError:
+            self.slew_times[key] = [slew_time, 1]
+
+    def clear(self):
+        """Remove all stored slew times.
+        """
+        self.slew_times.clear()
+
+    def get_slew_time(self, from_field, to_field, filter_change, telrot, lst):
+        """Get the average slew time for the given slew.
+
+        Parameters
+        ----------
+        from_field : int
+            The field Id at the start of the slew.
+        to_field : int
+            The field Id at the end of the slew.
+        filter_change : bool
+            Flag for a filter change during the slew.
+        telrot : float
+            The rotator position (units=degrees) at the start of the slew.
+        lst : float
+            The local sidereal time (units=degrees) at the start of the slew.
+
+        Returns
+        -------
+        float or None
+            The average slew time (units=seconds). None if the slew is not stored.
+        """
+        key = self.make_key(from_field, to_field, filter_change, telrot, lst)
+        try:
+            total, count = self.slew_times[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return total / count
+
+    def make_key(self, from_field, to_field, filter_change, telrot, lst):
+        """Create the table key for a slew.
+
+        Parameters
+        ----------
+        from_field : int
+            The field Id at the start of the slew.
+        to_field : int
+            The field Id at the end of the slew.
+        filter_change : bool
+            Flag for a filter change during the slew.
+        telrot : float
+            The rotator position (units=degrees) at the start of the slew.
+        lst : float
+            The local sidereal time (units=degrees) at the start of the slew.
+
+        Returns
+        -------
+        tuple
+        """
+        return (int(from_field), int(to_field), bool(filter_change),
+                int(math.floor(telrot / self.rotator_bucket)),
+                int(math.floor((lst % 360.0) / self.lst_bucket)))
+
+    def read(self, filename):
+        """Read a slew time table from a file.
+
+        The bucket sizes are taken from the file and any stored slew times are replaced. A file
+        written with a different configuration hash is not used and the table is left empty.
+
+        Parameters
+        ----------
+        filename : str
+            The full path to the slew time table file.
+
+        Returns
+        -------
+        bool
+            True if the slew times were read from the file.
+        """
+        with numpy.load(filename) as data:
+            config_hash = str(data["config_hash"]) if "config_hash" in data.files else ""
+            if config_hash != self.config_hash:
+                self.log.warning("Slew time table {} was written for a different configuration and "
+                                 "is not used.".format(filename))
+                self.slew_times = {}
+                return False
+            self.rotator_bucket = float(data["bucket_sizes"][0])
+            self.lst_bucket = float(data["bucket_sizes"][1])
+            columns = [data[column].tolist() for column in self.COLUMNS]
+            totals = data["total_slew_time"].tolist()
+            counts = data["num_slews"].tolist()
+        self.slew_times = {}
+        for key, total, count in zip(zip(*columns), totals, counts):
+            self.slew_times[(key[0], key[1], bool(key[2]), key[3], key[4])] = [total, count]
+        return True
+
+    def set_config_hash(self, config, fields):
+        """Set the hash of the configuration and field set the slew times are valid for.
+
+        Parameters
+        ----------
+        config : dict
+            The observatory configuration, including the park and slew parameters.
+        fields : iterable[tuple]
+            The field information rows of the field set.
+        """
+        digest = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(repr(sorted(fields)).encode("utf-8"))
+        self.config_hash = digest.hexdigest()
+
+    def write(self, filename):
+        """Write the slew time table to a file.
+
+        Parameters
+        ----------
+        filename : str
+            The full path to the slew time table file. The file is written in the npz format under
+            the given name, so no extension is added.
+        """
+        keys = list(self.slew_times.keys())
+        output = {}
+        for i, column in enumerate(self.COLUMNS):
+            output[column] = numpy.array([key[i] for key in keys], dtype=int)
+        output["total_slew_time"] = numpy.array([self.slew_times[key][0] for key in keys])
+        output["num_slews"] = numpy.array([self.slew_times[key][1] for key in keys], dtype=int)
+        output["bucket_sizes"] = numpy.array([self.rotator_bucket, self.lst_bucket])
+        output["config_hash"] = numpy.array(self.config_hash)
+        with open(filename, "wb") as ofile:
+            numpy.savez(ofile, **output)
@@ -0,0 +1,39 @@
+from builtins import object
+
+__all__ = ["StateSnapshot"]
+
+class StateSnapshot(object):
+    """Hold a copy of the observatory state values needed for the slew information.
+
+    This class copies only the scalar values from an observatory state that are used for the
+    slew state, slew history and slew maximum speed information. It is much cheaper than a
+    deep copy of the full observatory state.
+    """
+
+    __slots__ = ("time", "ra", "dec", "ra_rad", "dec_rad", "ang", "tracking", "alt", "az", "pa",
+                 "domalt", "domaz", "telalt", "telaz", "telrot", "filter", "domalt_peakspeed",
+                 "domaz_peakspeed", "telalt_peakspeed", "telaz_peakspeed", "telrot_peakspeed")
+
+    def __init__(self, state):
+        """Initialize the class.
+
+        Parameters
+        ----------
+        state : lsst.ts.observatory.model.ObservatoryState
+            The observatory state instance to copy the values from.
+        """
+        for name in self.__slots__:
+            setattr(self, name, getattr(state, name))
+
+    def __str__(self):
+        """The string representation of the snapshot.
+
+        Returns
+        -------
+        str
+        """
+        return ("t={:.1f} ra={:.3f} dec={:.3f} ang={:.3f} filter={} track={} alt={:.3f} az={:.3f} "
+                "pa={:.3f} telalt={:.3f} telaz={:.3f} telrot={:.3f} domalt={:.3f} "
+                "domaz={:.3f}".format(self.time, self.ra, self.dec, self.ang, self.filter, self.tracking,
+                                      self.alt, self.az, self.pa, self.telalt, self.telaz, self.telrot,
+                                      self.domalt, self.domaz))
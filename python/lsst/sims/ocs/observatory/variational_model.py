@@ -9,8 +9,22 @@ class VariationalModel(object):
 
     This class handles varying telescope and dome kinematic parameters over the duration
     of the survey. It uses a linear percentage decrease model for now.
+
+    Attributes
+    ----------
+    config : :class:`.Observatory`
+        The instance of the observatory configuration.
+    base_parameters : dict or None
+        The unmodified telescope and dome configurations.
+    current_scales : dict
+        The kinematic parameter scale currently applied to the telescope and dome.
+    log : logging.Logger
+        The logging instance.
     """
 
+    SUB_SYSTEMS = ("telescope", "dome")
+    """The sub-systems whose kinematic parameters are varied."""
+
     def __init__(self, config):
         """Initialize the class.
 
@@ -20,6 +34,8 @@ class VariationalModel(object):
             The instance of the observatory configuration.
         """
         self.config = config
+        self.base_parameters = None
+        self.current_scales = {sub_system: 1.0 for sub_system in self.SUB_SYSTEMS}
         self.log = logging.getLogger("observatory.VariationalModel")
 
     @property
@@ -32,8 +48,12 @@ class VariationalModel(object):
         """
         return self.config.obs_var.apply_variation
 
-    def modify_parameters(self, night, duration):
-        """Modify the observatory parameters according to the model.
+    def update_parameters(self, night, duration):
+        """Determine the sub-system configurations that need updating for the given night.
+
+        Only the sub-systems whose kinematic parameter scale moved more than the configured
+        tolerance since the last update are returned. The unmodified sub-system configurations
+        are only created once.
 
         Parameters
         ----------
@@ -44,17 +64,30 @@ class VariationalModel(object):
 
         Returns
         -------
-        dict
-            The modified observatory configuration.
+        dict(str : dict)
+            The modified configuration for each changed sub-system. Empty if nothing needs updating.
         """
+        if self.base_parameters is None:
+            self.base_parameters = {sub_system: getattr(self.config, sub_system).toDict()
+                                    for sub_system in self.SUB_SYSTEMS}
+
         time_frac = night / duration
-        obs_conf = self.config.toDict()
+        tolerance = self.config.obs_var.tolerance
+        changes = {"telescope": self.config.obs_var.telescope_change,
+                   "dome": self.config.obs_var.dome_change}
 
-        self.change_speeds_and_accelerations(obs_conf["telescope"], self.config.obs_var.telescope_change,
-                                             time_frac)
-        self.change_speeds_and_accelerations(obs_conf["dome"], self.config.obs_var.dome_change, time_frac)
+        updated_parameters = {}
+        for sub_system in self.SUB_SYSTEMS:
+            scale = 1.0 - (changes[sub_system] / 100.) * time_frac
+            scale_change = abs(scale - self.current_scales[sub_system]) * 100.
+            if scale_change == 0.0 or scale_change < tolerance:
+                continue
+            sub_system_conf = dict(self.base_parameters[sub_system])
+            self.change_speeds_and_accelerations(sub_system_conf, changes[sub_system], time_frac)
+            updated_parameters[sub_system] = sub_system_conf
+            self.current_scales[sub_system] = scale
 
-        return obs_conf
+        return updated_parameters
 
     def change_speeds_and_accelerations(self, sub_system, change, time_frac):
         """Perform a linear degradation on speeds, accelerations and decelerations.
@@ -28,6 +28,24 @@ def create_parser():
                         help="Override the 60 second DDS message timeouts in the Scheduler main loop.")
     parser.add_argument("--profile", dest="profile", action="store_true", help="Run the profiler on SOCS and"
                         "Scheduler code.")
+    parser.add_argument("--sky-cube", dest="sky_cube", help="A pre-calculated sky brightness cube file "
+                        "(see make_sky_cube) to use instead of the sky model for the sky brightness.")
+    parser.add_argument("--sky-prefetch", dest="sky_prefetch", action="store_true",
+                        help="Load the next sky model data file on a background thread before it is "
+                        "needed and swap it into the sky model when the simulation reaches it.")
+    parser.add_argument("--slew-time-cache", dest="slew_time_cache", help="A file (npz format) for the "
+                        "field-to-field slew time table. The table is loaded from the file if it exists and "
+                        "was saved with the same observatory configuration and field set, and saved to it at "
+                        "the end of the simulation.")
+    parser.add_argument("--aggregate-slew-activities", dest="aggregate_slew_activities", action="store_true",
+                        help="Store nightly statistics of the slew activities in the SlewActivityStatistics "
+                        "table instead of each slew activity in the SlewActivities table.")
+    parser.add_argument("--shared-environment", dest="shared_environment", action="store_true",
+                        help="Attach the cloud and seeing information from POSIX shared memory. The first "
+                        "simulation on a node publishes the information and the others reuse it.")
+    parser.add_argument("--environment-on-change", dest="environment_on_change", action="store_true",
+                        help="Only publish the cloud and seeing topics when their values change. The "
+                        "scheduler keeps the last published values.")
 
     sqlite_group_descr = ["This group of arguments is for dealing with a SQLite database."]
     sqlite_group = parser.add_argument_group("sqlite", " ".join(sqlite_group_descr))
@@ -38,6 +56,23 @@ def create_parser():
                               "tracking database.")
     sqlite_group.add_argument("-s", "--session-id-start", dest="session_id_start",
                               help="Set a new value for the starting session ID.")
+    sqlite_group.add_argument("--columnar-buffers", dest="sqlite_columnar", action="store_true",
+                              help="Collect the simulation output in per-table column buffers and write them "
+                              "with bulk inserts in a single transaction.")
+    sqlite_group.add_argument("--bulk-load", dest="sqlite_bulk_load", choices=["wal", "off"],
+                              help="Use a bulk-load profile of SQLite settings for the simulation database. "
+                              "The wal profile uses a write-ahead log and the off profile turns off the "
+                              "journal and disk syncs, so a failed nightly write may not be fully rolled "
+                              "back. The safe settings are restored at the end of the simulation.")
+    sqlite_group.add_argument("--async-writes", dest="sqlite_async", action="store_true",
+                              help="Write the nightly information into the simulation database on a "
+                              "background thread while the next night runs.")
+    sqlite_group.add_argument("--columnar-output", dest="sqlite_columnar_output", action="store_true",
+                              help="Also write the simulation tables in a columnar format with a row group "
+                              "per night into a <session database>_columns directory.")
+    sqlite_group.add_argument("--defer-indexes", dest="sqlite_defer_indexes", action="store_true",
+                              help="Create the simulation database tables without their non-unique "
+                              "indexes and build them once the simulation finishes.")
 
     tracking_group_descr = ["This group of arguments controls the tracking of the simulation session."]
     track_grp = parser.add_argument_group("tracking", " ".join(tracking_group_descr))
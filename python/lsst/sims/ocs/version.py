@@ -0,0 +1,3 @@
+__version__ = '0.7.1'
+__version_info__ = (0, 7, 1)
+__all__ = ('__version__', '__version_info__')
@@ -11,3 +11,4 @@ class ObservatoryVariationTest(unittest.TestCase):
         self.assertFalse(self.obs_var.apply_variation)
         self.assertEqual(self.obs_var.telescope_change, 0.0)
         self.assertEqual(self.obs_var.dome_change, 0.0)
+        self.assertEqual(self.obs_var.tolerance, 0.0)
@@ -11,3 +11,4 @@ class DowntimeTest(unittest.TestCase):
         self.assertEqual(self.down.scheduled_downtime_db, "")
         self.assertFalse(self.down.unscheduled_downtime_use_random_seed)
         self.assertEqual(self.down.unscheduled_downtime_random_seed, -1)
+        self.assertFalse(self.down.unscheduled_downtime_vectorized)
@@ -10,8 +10,20 @@ class EnvironmentTest(unittest.TestCase):
     def test_basic_information_after_creation(self):
         self.assertEqual(self.environ.seeing_db, "")
         self.assertEqual(self.environ.cloud_db, "")
+        self.assertEqual(self.environ.cloud_map_file, "")
         self.assertEqual(self.environ.telescope_seeing, 0.25)
         self.assertEqual(self.environ.optical_design_seeing, 0.08)
         self.assertEqual(self.environ.camera_seeing, 0.3)
         self.assertEqual(self.environ.scale_to_eff, 1.16)
         self.assertEqual(self.environ.geom_eff_factor, 1.04)
+        self.assertEqual(self.environ.airmass_correction_step, 0.0)
+        self.assertEqual(self.environ.stream_window, 0.0)
+        self.assertFalse(self.environ.synthetic_weather)
+        self.assertEqual(self.environ.weather_random_seed, 1516231120)
+
+    def test_synthetic_weather_with_cloud_map(self):
+        self.environ.synthetic_weather = True
+        self.environ.validate()
+        self.environ.cloud_map_file = "cloud_maps.dat"
+        with self.assertRaises(ValueError):
+            self.environ.validate()
@@ -0,0 +1,109 @@
+import collections
+import numpy
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, MetaData
+
+from lsst.sims.ocs.database import ColumnarWriter, read_columnar_table
+from lsst.sims.ocs.database.tables import create_scheduled_downtime, create_session, create_target_exposures
+
+class ColumnarWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.metadata = MetaData()
+        self.downtime = create_scheduled_downtime(self.metadata)
+        self.exposures = create_target_exposures(self.metadata)
+        self.session = create_session(self.metadata)
+        self.writer = ColumnarWriter(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def downtime_columns(self, nights):
+        return collections.OrderedDict([("night", nights), ("Session_sessionId", [2000] * len(nights)),
+                                        ("duration", [7] * len(nights)),
+                                        ("activity", ["maintenance"] * len(nights))])
+
+    def test_column_dtype(self):
+        self.assertEqual(ColumnarWriter.column_dtype(self.downtime.c.night), "<i8")
+        self.assertEqual(ColumnarWriter.column_dtype(self.exposures.c.exposureTime), "<f8")
+        self.assertEqual(ColumnarWriter.column_dtype(self.downtime.c.activity), "S128")
+        self.assertEqual(ColumnarWriter.column_dtype(self.session.c.sessionDate), "S26")
+
+    def test_write_and_read(self):
+        self.writer.write_table(self.downtime, self.downtime_columns([1]))
+        self.writer.write_table(self.downtime, self.downtime_columns([100, 101]))
+        self.writer.flush()
+        self.assertEqual(len(self.writer.changed), 0)
+        downtime = read_columnar_table(self.directory, "ScheduledDowntime")
+        self.assertListEqual(list(downtime.keys()), ["night", "Session_sessionId", "duration", "activity"])
+        self.assertListEqual(downtime["night"].tolist(), [1, 100, 101])
+        self.assertListEqual(downtime["activity"].tolist(), [b"maintenance"] * 3)
+        index = self.writer.indexes["ScheduledDowntime"]
+        self.assertListEqual([group["night"] for group in index["row_groups"]], [1, 100])
+        self.assertListEqual([group["length"] for group in index["row_groups"]], [1, 2])
+
+    def test_read_nights_and_columns(self):
+        for night in range(1, 6):
+            self.writer.write_table(self.downtime, self.downtime_columns([night]))
+        self.writer.finalize()
+        downtime = read_columnar_table(self.directory, "ScheduledDowntime", columns=["night"], nights=(2, 3))
+        self.assertListEqual(list(downtime.keys()), ["night"])
+        self.assertListEqual(downtime["night"].tolist(), [2, 3])
+        downtime = read_columnar_table(self.directory, "ScheduledDowntime", nights=(10, 12))
+        self.assertEqual(downtime["night"].size, 0)
+
+    def test_reader_uses_flushed_rows(self):
+        self.writer.write_table(self.downtime, self.downtime_columns([1]))
+        self.writer.flush()
+        self.writer.write_table(self.downtime, self.downtime_columns([2]))
+        downtime = read_columnar_table(self.directory, "ScheduledDowntime")
+        self.assertListEqual(downtime["night"].tolist(), [1])
+
+    def test_rerun_replaces_table(self):
+        for exposure_time in (1.0, 2.0):
+            writer = ColumnarWriter(self.directory)
+            writer.write_table(self.exposures, collections.OrderedDict([("exposureId", [1]),
+                                                                        ("Session_sessionId", [2000]),
+                                                                        ("exposureNum", [1]),
+                                                                        ("exposureTime", [exposure_time]),
+                                                                        ("TargetHistory_targetId", [1])]))
+            writer.finalize()
+        exposures = read_columnar_table(self.directory, "TargetExposures")
+        self.assertListEqual(exposures["exposureTime"].tolist(), [2.0])
+        self.assertListEqual(exposures["exposureId"].tolist(), [1])
+
+    def test_to_array(self):
+        values = self.writer.to_array([None, "a" * 10, u"é"], "S4", "activity")
+        self.assertListEqual(values.tolist(), [b"", b"aaaa", u"é".encode("utf-8")])
+        values = self.writer.to_array(numpy.array([1, 2]), "<f8", "duration")
+        self.assertEqual(values.dtype, numpy.dtype("<f8"))
+
+    def test_convert(self):
+        db_file = "{}/test_session.db".format(self.directory)
+        engine = create_engine("sqlite:///{}".format(db_file))
+        self.metadata.create_all(engine)
+        conn = sqlite3.connect(db_file)
+        conn.executemany('INSERT INTO "ScheduledDowntime" VALUES (?, ?, ?, ?)',
+                         [(1, 2000, 7, "maintenance"), (1, 2001, 7, "maintenance"),
+                          (40, 2000, 3, "repair")])
+        conn.executemany('INSERT INTO "TargetExposures" VALUES (?, ?, ?, ?, ?)',
+                         [(1, 2000, 1, 15.0, 1), (2, 2000, 2, 15.0, 1)])
+        conn.commit()
+        conn.close()
+
+        writer = ColumnarWriter.convert(db_file, "{}/columns".format(self.directory))
+        downtime = read_columnar_table(writer.directory, "ScheduledDowntime")
+        self.assertListEqual(downtime["Session_sessionId"].tolist(), [2000, 2001, 2000])
+        self.assertListEqual(downtime["activity"].tolist(), [b"maintenance", b"maintenance", b"repair"])
+        self.assertListEqual([group["night"] for group in writer.indexes["ScheduledDowntime"]["row_groups"]],
+                             [1, 40])
+        exposures = read_columnar_table(writer.directory, "TargetExposures")
+        self.assertListEqual(exposures["exposureTime"].tolist(), [15.0, 15.0])
+        self.assertEqual(len(writer.indexes["TargetExposures"]["row_groups"]), 1)
+        session = read_columnar_table(writer.directory, "Session")
+        self.assertEqual(session["sessionId"].size, 0)
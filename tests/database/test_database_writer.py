@@ -0,0 +1,62 @@
+import threading
+import unittest
+
+from lsst.sims.ocs.database import DatabaseWriter
+from lsst.sims.ocs.utilities.socs_exceptions import SocsDatabaseError
+
+class DatabaseWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.writer = DatabaseWriter(queue_size=1)
+        self.written = []
+
+    def tearDown(self):
+        if self.writer.thread is not None:
+            self.writer.queue.put(None)
+            self.writer.thread.join()
+
+    def write(self, value):
+        self.written.append((value, threading.current_thread().name))
+
+    def fail(self, message):
+        raise SocsDatabaseError(message)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.writer.queue_size, 1)
+        self.assertEqual(self.writer.writes_done, 0)
+        self.assertIsNone(self.writer.error)
+        self.assertIsNone(self.writer.thread)
+
+    def test_writes_in_order_on_thread(self):
+        for i in range(5):
+            self.writer.submit(self.write, i)
+        self.writer.drain()
+        self.assertListEqual([value for value, _ in self.written], list(range(5)))
+        self.assertTrue(all(name == "DatabaseWriter" for _, name in self.written))
+        self.assertEqual(self.writer.writes_done, 5)
+
+    def test_error_raised_on_next_submit(self):
+        self.writer.submit(self.fail, "Night 1 failed")
+        self.writer.queue.join()
+        with self.assertRaises(SocsDatabaseError):
+            self.writer.submit(self.write, 2)
+        self.assertListEqual(self.written, [])
+        self.writer.submit(self.write, 3)
+        self.writer.drain()
+        self.assertEqual(self.written[0][0], 3)
+
+    def test_stop(self):
+        self.writer.submit(self.write, 1)
+        self.writer.stop(self.write, "close")
+        self.assertIsNone(self.writer.thread)
+        self.assertListEqual([value for value, _ in self.written], [1, "close"])
+
+    def test_error_raised_on_stop(self):
+        self.writer.submit(self.fail, "Last night failed")
+        with self.assertRaises(SocsDatabaseError):
+            self.writer.stop()
+        self.assertIsNone(self.writer.thread)
+
+    def test_stop_without_writes(self):
+        self.writer.stop()
+        self.assertIsNone(self.writer.thread)
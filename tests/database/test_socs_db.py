@@ -1,16 +1,19 @@
 from __future__ import absolute_import
+import numpy
 import os
 import random
 import shutil
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, exc, select
 import unittest
 try:
     from unittest import mock
 except ImportError:
     import mock
 
+from lsst.sims.ocs.database import read_columnar_table
 from lsst.sims.ocs.database.socs_db import SocsDatabase
 from lsst.sims.ocs.database.tables import write_target_history
+from lsst.sims.ocs.utilities.socs_exceptions import SocsDatabaseError
 from . import topic_helpers
 
 class SocsDatabaseSqliteTest(unittest.TestCase):
@@ -92,11 +95,26 @@ class SocsDatabaseSqliteTest(unittest.TestCase):
         self.assertEqual(len(self.db.data_list), 1)
         self.assertEqual(len(self.db.data_list["target_history"]), 1)
 
+    def test_append_columns(self):
+        self.setup_db("This is my cool test!")
+        self.db.append_columns("target_exposures", {"exposureId": numpy.array([1, 2]),
+                                                    "exposureNum": numpy.array([1, 2]),
+                                                    "exposureTime": numpy.array([15.0, 15.0]),
+                                                    "TargetHistory_targetId": numpy.array([1, 1])})
+        self.assertFalse(self.db.data_empty)
+        self.assertEqual(len(self.db.data_columns["target_exposures"]), 1)
+        rows = self.db.rows_from_columns(self.db.data_columns["target_exposures"][0])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["exposureId"], 2)
+        self.assertEqual(rows[1]["Session_sessionId"], self.db.session_id)
+
     def test_clear_data(self):
         self.setup_db("This is my cool test!")
         self.create_append_data()
+        self.db.append_columns("target_exposures", {"exposureId": numpy.array([1])})
         self.db.clear_data()
         self.assertEqual(len(self.db.data_list), 0)
+        self.assertEqual(len(self.db.data_columns), 0)
 
     @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
     def test_write_data(self, mock_get_hostname):
@@ -116,6 +134,251 @@ class SocsDatabaseSqliteTest(unittest.TestCase):
         self.db.write_table("target_history", [write_target_history(target, self.session_id)])
         self.check_db_file_for_target_info()
 
+    def test_columnar_append_data(self):
+        self.setup_db("This is my cool test!")
+        self.db.columnar = True
+        self.create_append_data()
+        self.create_append_data()
+        self.assertFalse(self.db.data_empty)
+        self.assertEqual(len(self.db.data_list), 0)
+        self.assertEqual(len(self.db.buffers["target_history"]), 2)
+        self.assertNotIn("Session_sessionId", self.db.buffers["target_history"].names)
+        self.db.clear_data()
+        self.assertTrue(self.db.data_empty)
+        self.create_append_data()
+        self.assertEqual(len(self.db.buffers["target_history"]), 1)
+
+    def test_columnar_append_columns(self):
+        self.setup_db("This is my cool test!")
+        self.db.columnar = True
+        self.db.append_columns("target_exposures", {"exposureId": numpy.array([1, 2]),
+                                                    "exposureNum": numpy.array([1, 2]),
+                                                    "exposureTime": numpy.array([15.0, 15.0]),
+                                                    "TargetHistory_targetId": numpy.array([1, 1])})
+        self.assertEqual(len(self.db.data_columns), 0)
+        self.assertEqual(len(self.db.buffers["target_exposures"]), 2)
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_columnar_write_data(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.setup_db("This is my cool test!")
+        self.db.columnar = True
+        self.create_append_data()
+        self.db.append_columns("target_exposures", {"exposureId": numpy.array([1, 2]),
+                                                    "exposureNum": numpy.array([1, 2]),
+                                                    "exposureTime": numpy.array([15.0, 15.0]),
+                                                    "TargetHistory_targetId": numpy.array([10, 10])})
+
+        self.db.write()
+        self.check_db_file_for_target_info()
+        session_db_name = "{}_{}.db".format(self.hostname, self.session_id)
+        conn = create_engine("sqlite:///{}".format(session_db_name)).connect()
+        rows = conn.execute(select([self.db.target_exposures])).fetchall()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["Session_sessionId"], self.session_id)
+
+    def test_persistent_connection(self):
+        self.setup_db("This is my cool test!")
+        conn = self.db._get_conn()
+        self.create_append_data()
+        self.db.write()
+        self.assertIs(self.db._get_conn(), conn)
+        self.db.finalize()
+        self.assertIsNone(self.db.session_conn)
+        self.check_db_file_for_target_info()
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_write_data_failure_keeps_nothing(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.setup_db("This is my cool test!")
+        self.db.append_data("observation_history", topic_helpers.observation_topic)
+        self.create_append_data()
+        self.create_append_data()
+        dump_file = "target_history_{}.npz".format(self.session_id)
+        try:
+            with self.assertRaises(SocsDatabaseError):
+                self.db.write()
+        finally:
+            if os.path.exists(dump_file):
+                os.remove(dump_file)
+        conn = self.db._get_conn()
+        self.assertEqual(conn.execute(select([self.db.observation_history])).fetchall(), [])
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_write_data_error_ends_transaction(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.setup_db("This is my cool test!")
+        conn = self.db._get_conn()
+        conn.execute("DROP TABLE TargetHistory")
+        self.create_append_data()
+        with self.assertRaises(exc.OperationalError):
+            self.db.write()
+        self.assertFalse(conn.in_transaction())
+        self.db.clear_data()
+        self.db.append_data("observation_history", topic_helpers.observation_topic)
+        self.db.write()
+        session_db_name = "{}_{}.db".format(self.hostname, self.session_id)
+        other_conn = create_engine("sqlite:///{}".format(session_db_name)).connect()
+        self.assertEqual(len(other_conn.execute(select([self.db.observation_history])).fetchall()), 1)
+        other_conn.close()
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_bulk_load_profile(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.db = SocsDatabase(bulk_load="wal")
+        self.setup_db("This is my cool test!")
+        conn = self.db._get_conn()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").scalar(), "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").scalar(), 1)
+        self.assertEqual(conn.execute("PRAGMA cache_size").scalar(), -65536)
+        self.create_append_data()
+        self.db.write()
+        session_db_name = "{}_{}.db".format(self.hostname, self.session_id)
+        self.assertTrue(os.path.exists(session_db_name + "-wal"))
+        self.db.finalize()
+        self.assertFalse(os.path.exists(session_db_name + "-wal"))
+        self.check_db_file_for_target_info()
+
+    def test_bulk_load_pragmas(self):
+        db = SocsDatabase(bulk_load={"synchronous": "OFF"})
+        self.assertEqual(db.pragmas, {"synchronous": "OFF"})
+        self.assertEqual(SocsDatabase().pragmas, {})
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_asynchronous_write_data(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.db = SocsDatabase(asynchronous=True)
+        self.setup_db("This is my cool test!")
+        self.create_append_data()
+        self.db.write()
+        self.assertTrue(self.db.data_empty)
+        self.db.finalize()
+        self.assertIsNone(self.db.writer.thread)
+        self.assertIsNone(self.db.session_conn)
+        self.check_db_file_for_target_info()
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_asynchronous_write_errors(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.db = SocsDatabase(asynchronous=True)
+        self.setup_db("This is my cool test!")
+        dump_file = "target_history_{}.npz".format(self.session_id)
+        try:
+            self.create_append_data()
+            self.create_append_data()
+            self.db.write()
+            self.db.writer.queue.join()
+            self.assertTrue(os.path.exists(dump_file))
+            self.create_append_data()
+            with self.assertRaises(SocsDatabaseError):
+                self.db.write()
+            self.db.write()
+            self.create_append_data()
+            self.create_append_data()
+            self.db.write()
+            with self.assertRaises(SocsDatabaseError):
+                self.db.finalize()
+        finally:
+            if os.path.exists(dump_file):
+                os.remove(dump_file)
+        self.check_db_file_for_target_info()
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_columnar_output(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.db = SocsDatabase(columnar_output=True)
+        self.setup_db("This is my cool test!")
+        columnar_dir = "{}_{}_columns".format(self.hostname, self.session_id)
+        try:
+            self.create_append_data()
+            self.db.append_columns("target_exposures", {"exposureId": numpy.array([1, 2]),
+                                                        "exposureNum": numpy.array([1, 2]),
+                                                        "exposureTime": numpy.array([15.0, 15.0]),
+                                                        "TargetHistory_targetId": numpy.array([10, 10])})
+            self.db.write()
+            self.db.finalize()
+            target_history = read_columnar_table(columnar_dir, "TargetHistory")
+            self.assertListEqual(list(target_history.keys()), [c.name for c in self.db.target_history.c])
+            self.assertListEqual(target_history["Field_fieldId"].tolist(), [topic_helpers.target.fieldId])
+            exposures = read_columnar_table(columnar_dir, "TargetExposures")
+            self.assertListEqual(exposures["Session_sessionId"].tolist(), [self.session_id] * 2)
+            session = read_columnar_table(columnar_dir, "Session")
+            self.assertListEqual(session["sessionId"].tolist(), [self.session_id])
+        finally:
+            shutil.rmtree(columnar_dir)
+        self.check_db_file_for_target_info()
+
+    def get_index_names(self):
+        session_db_name = "{}_{}.db".format(self.hostname, self.session_id)
+        conn = create_engine("sqlite:///{}".format(session_db_name)).connect()
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND "
+                            "name NOT LIKE 'sqlite_autoindex%'").fetchall()
+        conn.close()
+        return sorted(row[0] for row in rows)
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_defer_indexes(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.setup_db("This is my cool test!")
+        index_names = self.get_index_names()
+        self.assertIn("o_filter", index_names)
+        os.remove("{}_{}.db".format(self.hostname, self.session_id))
+
+        self.db = SocsDatabase(defer_indexes=True)
+        self.setup_db("This is my cool test!")
+        self.assertListEqual(self.get_index_names(), ["s_host_user_date_idx"])
+        session_db_name = "{}_{}.db".format(self.hostname, self.session_id)
+        conn = create_engine("sqlite:///{}".format(session_db_name)).connect()
+        views = conn.execute("SELECT name FROM sqlite_master WHERE type = 'view'").fetchall()
+        conn.close()
+        self.assertListEqual([row[0] for row in views], ["SummaryAllProps"])
+        self.assertIn("o_filter", [index.name for index in self.db.observation_history.indexes])
+        self.create_append_data()
+        self.db.write()
+        self.db.finalize()
+        self.assertListEqual(self.get_index_names(), index_names)
+        self.check_db_file_for_target_info()
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_defer_indexes_asynchronous(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.db = SocsDatabase(defer_indexes=True, asynchronous=True)
+        self.setup_db("This is my cool test!")
+        self.create_append_data()
+        self.db.write()
+        self.db.finalize()
+        self.assertIn("fk_TargetHistory_Field1", self.get_index_names())
+        self.check_db_file_for_target_info()
+
+    @mock.patch("lsst.sims.ocs.database.socs_db.get_hostname")
+    def test_create_indexes(self, mock_get_hostname):
+        mock_get_hostname.return_value = self.hostname
+        self.db = SocsDatabase(defer_indexes=True)
+        self.setup_db("This is my cool test!")
+        self.create_append_data()
+        self.db.write()
+        self.db._close_conn()
+        session_db_name = "{}_{}.db".format(self.hostname, self.session_id)
+        created = SocsDatabase().create_indexes(session_db_name)
+        self.assertIn("fov_ra_dec", created)
+        self.assertNotIn("s_host_user_date_idx", created)
+        self.assertListEqual(sorted(created + ["s_host_user_date_idx"]), self.get_index_names())
+        self.assertListEqual(SocsDatabase().create_indexes(session_db_name), [])
+        self.check_db_file_for_target_info()
+
+    def test_get_table_columns(self):
+        self.setup_db("This is my cool test!")
+        self.create_append_data()
+        self.db.append_columns("target_exposures", {"exposureTime": numpy.array([15.0]),
+                                                    "exposureId": numpy.array([1])})
+        self.db.append_columns("target_exposures", {"exposureTime": numpy.array([20.0]),
+                                                    "exposureId": numpy.array([2])})
+        table_columns = self.db.get_table_columns(self.db.data_list, self.db.data_columns, self.db.buffers)
+        self.assertListEqual(list(table_columns["target_exposures"].keys()),
+                             ["exposureId", "Session_sessionId", "exposureTime"])
+        self.assertListEqual(table_columns["target_exposures"]["exposureTime"].tolist(), [15.0, 20.0])
+        self.assertEqual(table_columns["target_history"]["targetId"], [topic_helpers.target.targetId])
+
 class SocsDatabaseSqliteWithSavePathTest(unittest.TestCase):
 
     @classmethod
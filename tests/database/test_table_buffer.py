@@ -0,0 +1,35 @@
+import numpy
+import unittest
+
+from lsst.sims.ocs.database import TableBuffer
+
+class TableBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = TableBuffer(["observationId", "night", "moonAlt"])
+
+    def test_basic_information_after_creation(self):
+        self.assertListEqual(self.buffer.names, ["observationId", "night", "moonAlt"])
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(len(TableBuffer([])), 0)
+
+    def test_append(self):
+        self.buffer.append((1, 1, 10.0))
+        self.buffer.append((2, 1, 12.0))
+        self.assertEqual(len(self.buffer), 2)
+        self.assertListEqual(list(self.buffer.get_rows()), [(1, 1, 10.0), (2, 1, 12.0)])
+
+    def test_extend(self):
+        self.buffer.append((1, 1, 10.0))
+        self.buffer.extend({"observationId": numpy.array([2, 3]), "night": numpy.array([2, 2]),
+                            "moonAlt": numpy.array([-5.0, -6.0])})
+        self.assertEqual(len(self.buffer), 3)
+        rows = list(self.buffer.get_rows())
+        self.assertEqual(rows[2], (3, 2, -6.0))
+        self.assertIsInstance(rows[2][0], int)
+
+    def test_get_column_arrays(self):
+        self.buffer.append((1, 1, 10.0))
+        self.buffer.append((2, 1, 12.0))
+        arrays = self.buffer.get_column_arrays()
+        self.assertListEqual(arrays["moonAlt"].tolist(), [10.0, 12.0])
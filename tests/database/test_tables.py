@@ -196,6 +196,21 @@ class TablesTest(unittest.TestCase):
         self.assertEqual(result['inCriticalPath'], sa.inCriticalPath)
         self.assertEqual(result['SlewHistory_slewCount'], sa.SlewHistory_slewCount)
 
+    def test_create_slew_activity_statistics_table(self):
+        slew_as = tbls.create_slew_activity_statistics(self.metadata)
+        self.assertEqual(len(slew_as.c), 10)
+        self.assertEqual(len(slew_as.indexes), 1)
+
+    def test_write_slew_activity_statistics_table(self):
+        sas = topic_helpers.slew_activity_stat_coll
+        result = tbls.write_slew_activity_statistics(sas, 1000)
+        slew_as_table = tbls.create_slew_activity_statistics(self.metadata)
+        self.check_ordered_dict_to_table(result, slew_as_table)
+        self.assertEqual(result['slewActivityStatId'], 1)
+        self.assertEqual(result['Session_sessionId'], 1000)
+        self.assertEqual(result['numCriticalPath'], sas.numCriticalPath)
+        self.assertEqual(result['delayHistogram'], sas.delayHistogram)
+
     def test_create_slew_maxspeeds_table(self):
         slew_ms = tbls.create_slew_maxspeeds(self.metadata)
         self.assertEqual(len(slew_ms.c), 8)
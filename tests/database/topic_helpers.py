@@ -101,6 +101,15 @@ slew_activity_coll = lsst.sims.ocs.observatory.SlewActivity(slewActivityId=1, ac
                                                             activityDelay=2.0, inCriticalPath="False",
                                                             SlewHistory_slewCount=1)
 
+slew_activity_stat_coll = lsst.sims.ocs.observatory.SlewActivityStatistics(slewActivityStatId=1, night=1,
+                                                                           activity="telalt",
+                                                                           numActivities=10,
+                                                                           numCriticalPath=4,
+                                                                           totalDelay=25.0,
+                                                                           maxDelay=5.5,
+                                                                           histogramBinWidth=1.0,
+                                                                           delayHistogram="1,2,3,2,1,1")
+
 slew_maxspeed_coll = lsst.sims.ocs.observatory.SlewMaxSpeeds(slewMaxSpeedId=1, domeAltSpeed=1.0,
                                                              domeAzSpeed=2.3, telAltSpeed=0.5, telAzSpeed=1.1,
                                                              rotatorSpeed=0.1, SlewHistory_slewCount=1)
@@ -0,0 +1,56 @@
+import numpy
+import unittest
+
+from lsst.sims.ocs.downtime.downtime_ensemble import DowntimeEnsemble
+
+class DowntimeEnsembleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ensemble = DowntimeEnsemble(300, survey_length=3650, seed=42)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.ensemble.num_realizations, 300)
+        self.assertEqual(self.ensemble.survey_length, 3650)
+        self.assertIsNone(self.ensemble.events)
+        self.assertIsNone(self.ensemble.total_downtime)
+
+    def test_generate(self):
+        self.ensemble.generate()
+        self.assertEqual(self.ensemble.events.shape, (300, 3650))
+        self.assertEqual(self.ensemble.total_downtime.size, 300)
+        numpy.testing.assert_array_equal(self.ensemble.total_downtime, self.ensemble.events.sum(axis=1))
+        self.assertTrue(numpy.all(self.ensemble.longest_downtime >= 1))
+        self.assertTrue(numpy.all(self.ensemble.longest_gap < 3650))
+
+        other = DowntimeEnsemble(300, survey_length=3650, seed=42)
+        other.generate()
+        numpy.testing.assert_array_equal(other.events, self.ensemble.events)
+
+    def test_get_downtimes(self):
+        self.ensemble.generate()
+        downtimes = self.ensemble.get_downtimes(0)
+        self.assertEqual(len(downtimes), self.ensemble.num_events[0])
+        self.assertEqual(sum([downtime[1] for downtime in downtimes]), self.ensemble.total_downtime[0])
+        self.assertIn(downtimes[0][2], ("minor event", "intermediate event", "major event",
+                                        "catastrophic event"))
+
+    def test_longest_runs(self):
+        events = numpy.zeros((2, 20), dtype=numpy.int8)
+        events[0, 2] = 3
+        events[0, 5] = 1
+        events[1, 10] = 7
+        is_down = self.ensemble.get_down_nights(events)
+        self.assertListEqual(numpy.flatnonzero(is_down[0]).tolist(), [2, 3, 4, 5])
+        self.assertListEqual(self.ensemble.get_longest_run(is_down).tolist(), [4, 7])
+        self.assertListEqual(self.ensemble.get_longest_run(~is_down).tolist(), [14, 10])
+
+    def test_summary(self):
+        self.ensemble.generate()
+        summary = self.ensemble.summary()
+        self.assertListEqual(sorted(summary.keys()), ["longest_downtime", "longest_gap", "num_events",
+                                                      "total_downtime"])
+        total = summary["total_downtime"]
+        self.assertLessEqual(total["min"], total["p5"])
+        self.assertLessEqual(total["p5"], total["p50"])
+        self.assertLessEqual(total["p95"], total["max"])
+        self.assertAlmostEqual(total["mean"], self.ensemble.total_downtime.mean())
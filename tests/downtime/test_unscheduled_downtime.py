@@ -1,4 +1,6 @@
 import logging
+import numpy
+import random
 try:
     from unittest import mock
 except ImportError:
@@ -49,3 +51,33 @@ class UnscheduledDowntimeTest(unittest.TestCase):
         self.usdt.initialize()
         self.check_downtime(self.usdt(), 29, 1, "minor event")
         self.assertEqual(len(self.usdt), 157)
+
+    def test_global_random_state_unchanged(self):
+        state = random.getstate()
+        self.usdt.initialize()
+        self.assertEqual(random.getstate(), state)
+
+    def test_vectorized_initialization(self):
+        state = random.getstate()
+        self.usdt.initialize(vectorized=True)
+        self.assertEqual(random.getstate(), state)
+        self.assertGreater(len(self.usdt), 0)
+        nights = [downtime[0] for downtime in self.usdt.downtimes]
+        self.assertListEqual(nights, sorted(nights))
+        for downtime, next_downtime in zip(self.usdt.downtimes[:-1], self.usdt.downtimes[1:]):
+            self.assertGreaterEqual(next_downtime[0], downtime[0] + downtime[1])
+        other = UnscheduledDowntime()
+        other.initialize(vectorized=True)
+        self.assertListEqual(other.downtimes, self.usdt.downtimes)
+
+    def test_draw_events(self):
+        events = UnscheduledDowntime.draw_events(numpy.random.default_rng(42), 200, 3650)
+        self.assertEqual(events.shape, (200, 3650))
+        self.assertTrue(set(numpy.unique(events).tolist()).issubset({0, 1, 3, 7, 14}))
+        # The expected downtime is about 15 days per year.
+        self.assertAlmostEqual(events.sum(axis=1).mean() / 150.0, 1.0, delta=0.1)
+        for row in events[:10]:
+            nights = numpy.flatnonzero(row)
+            durations = row[nights]
+            blocked = numpy.where(durations > 1, durations + 1, 1)
+            self.assertTrue(numpy.all(nights[1:] >= nights[:-1] + blocked[:-1]))
@@ -0,0 +1,71 @@
+import numpy
+import os
+import unittest
+
+from lsst.sims.ocs.environment import CloudMapModel
+from lsst.sims.ocs.kernel import TimeHandler
+
+class TestCloudMapModel(unittest.TestCase):
+
+    def setUp(self):
+        self.th = TimeHandler("2020-01-01")
+        self.map_file = "test_cloud_map.dat"
+        self.dates = numpy.array([0.0, 1800.0, 3600.0])
+
+    def tearDown(self):
+        if os.path.exists(self.map_file):
+            os.remove(self.map_file)
+
+    def create_maps(self):
+        cloud_maps = CloudMapModel.create(self.th, self.map_file, self.dates, 4, 8,
+                                          metadata={"source": "test"})
+        for i in range(self.dates.size):
+            cloud_map = numpy.zeros((4, 8))
+            cloud_map[:, 2] = 0.5 * (i + 1)
+            cloud_map[3, :] = 1.0
+            cloud_maps.set_map(i, cloud_map)
+        cloud_maps.flush()
+
+    def test_basic_information_after_creation(self):
+        cloud_maps = CloudMapModel(self.th)
+        self.assertIsNone(cloud_maps.map_file)
+        self.assertIsNone(cloud_maps.header)
+        self.assertIsNone(cloud_maps.cloud_maps)
+
+    def test_information_after_initialization(self):
+        self.create_maps()
+        cloud_maps = CloudMapModel(self.th)
+        cloud_maps.initialize(self.map_file)
+        self.assertEqual(cloud_maps.cloud_maps.shape, (3, 4, 8))
+        self.assertListEqual(cloud_maps.cloud_dates.tolist(), self.dates.tolist())
+        self.assertEqual(cloud_maps.header["metadata"]["source"], "test")
+        self.assertEqual(cloud_maps.alt_step, 22.5)
+        self.assertEqual(cloud_maps.az_step, 45.0)
+
+    def test_bad_file(self):
+        with open(self.map_file, "wb") as ofile:
+            ofile.write(b"NOTACLOUDMAPFILE")
+        cloud_maps = CloudMapModel(self.th)
+        with self.assertRaises(ValueError):
+            cloud_maps.initialize(self.map_file)
+
+    def test_get_cloud_at(self):
+        self.create_maps()
+        cloud_maps = CloudMapModel(self.th)
+        cloud_maps.initialize(self.map_file)
+        self.assertEqual(cloud_maps.get_cloud_at(1700.0, 30.0, 100.0), 1.0)
+        self.assertEqual(cloud_maps.get_cloud_at(1700.0, 30.0, 10.0), 0.0)
+        self.assertEqual(cloud_maps.get_cloud_at(1700.0, 89.0, 10.0), 1.0)
+        self.assertEqual(cloud_maps.get_cloud_at(1700.0, 30.0, 460.0), 1.0)
+        self.assertEqual(cloud_maps.get_cloud_at(1700.0, -5.0, 100.0), 1.0)
+        clouds = cloud_maps.get_cloud_at(numpy.array([100.0, 3500.0]), numpy.array([30.0, 30.0]),
+                                         numpy.array([100.0, 100.0]))
+        self.assertListEqual(clouds.tolist(), [0.5, 1.5])
+
+    def test_get_cloud(self):
+        self.create_maps()
+        cloud_maps = CloudMapModel(self.th)
+        cloud_maps.initialize(self.map_file)
+        weights = numpy.cos(numpy.radians([11.25, 33.75, 56.25, 78.75]))
+        expected = numpy.average([0.0625, 0.0625, 0.0625, 1.0], weights=weights)
+        self.assertAlmostEqual(cloud_maps.get_cloud(100.0), expected)
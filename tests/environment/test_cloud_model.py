@@ -1,6 +1,11 @@
+import numpy
 import os
 import sqlite3
 import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 import SALPY_scheduler
 
@@ -25,6 +30,26 @@ class TestCloudModel(unittest.TestCase):
         self.assertEqual(self.cloud.cloud_values.size, self.num_original_values)
         self.assertEqual(self.cloud.cloud_dates.size, self.num_original_values)
 
+    def test_information_from_shared_memory(self):
+        cloud1 = CloudModel(self.th, shared_memory=True)
+        cloud1.initialize()
+        self.cloud.initialize()
+        numpy.testing.assert_array_equal(cloud1.cloud_values, self.cloud.cloud_values)
+        self.assertEqual(cloud1.get_cloud(700000), 0.5)
+        cloud1.detach()
+        self.assertIsNone(cloud1.shared_columns)
+        self.assertIsNone(cloud1.cloud_values)
+
+    def test_streamed_information(self):
+        cloud1 = CloudModel(self.th)
+        cloud1.initialize(stream_window=30.0)
+        self.assertIsNone(cloud1.cloud_values)
+        self.assertEqual(cloud1.get_cloud(700000), 0.5)
+        self.assertEqual(cloud1.get_cloud(705000), 0.375)
+        self.assertEqual(cloud1.get_cloud(630684000), 0.0)
+        cloud1.detach()
+        self.assertIsNone(cloud1.stream)
+
     def test_get_clouds(self):
         self.cloud.initialize()
         self.assertEqual(self.cloud.get_cloud(700000), 0.5)
@@ -32,6 +57,13 @@ class TestCloudModel(unittest.TestCase):
         self.assertEqual(self.cloud.get_cloud(705000), 0.375)
         self.assertEqual(self.cloud.get_cloud(630684000), 0.0)
 
+    def test_get_clouds_for_times(self):
+        self.cloud.initialize()
+        times = numpy.array([700000, 701500, 705000, 630684000])
+        clouds = self.cloud.get_cloud_for_times(times)
+        numpy.testing.assert_array_equal(clouds, [0.5, 0.5, 0.375, 0.0])
+        self.assertListEqual(clouds.tolist(), [self.cloud.get_cloud(t) for t in times])
+
     def test_get_clouds_using_different_start_month(self):
         cloud1 = CloudModel(TimeHandler("2020-05-24"))
         self.assertEqual(cloud1.offset, 12441600)
@@ -41,6 +73,14 @@ class TestCloudModel(unittest.TestCase):
         self.assertEqual(cloud1.get_cloud(705000), 0.0)
         self.assertEqual(cloud1.get_cloud(630684000), 0.25)
 
+    def test_synthesize(self):
+        self.cloud.initialize()
+        duration = 20 * 365 * 24 * 3600.0
+        self.cloud.synthesize(duration, seed=42)
+        self.assertGreater(self.cloud.cloud_dates[-1], duration)
+        self.assertTrue(set(numpy.unique(self.cloud.cloud_values)).issubset(set(numpy.arange(9) / 8.0)))
+        self.assertIn(self.cloud.get_cloud(700000), numpy.arange(9) / 8.0)
+
     def test_alternate_db(self):
         cloud_dbfile = "alternate_cloud.db"
 
@@ -69,3 +109,36 @@ class TestCloudModel(unittest.TestCase):
         self.cloud.set_topic(self.th, cloud_topic)
         self.assertEqual(cloud_topic.timestamp, 1578528000.0)
         self.assertEqual(cloud_topic.cloud, 0.5)
+
+    def test_topic_setting_on_change(self):
+        cloud_topic = SALPY_scheduler.scheduler_cloudC()
+        self.th.update_time(8, "days")
+        self.cloud.initialize()
+        self.assertTrue(self.cloud.set_topic(self.th, cloud_topic, on_change=True))
+        self.assertEqual(cloud_topic.cloud, 0.5)
+        self.cloud.get_cloud = mock.Mock(return_value=0.5)
+        self.th.update_time(1, "seconds")
+        self.assertFalse(self.cloud.set_topic(self.th, cloud_topic, on_change=True))
+        self.assertEqual(self.cloud.get_cloud.call_count, 0)
+        self.th.update_time(4, "hours")
+        self.assertFalse(self.cloud.set_topic(self.th, cloud_topic, on_change=True))
+        self.assertEqual(self.cloud.get_cloud.call_count, 1)
+        self.cloud.get_cloud.return_value = 0.25
+        self.th.update_time(2, "hours")
+        self.assertTrue(self.cloud.set_topic(self.th, cloud_topic, on_change=True))
+        self.assertEqual(cloud_topic.cloud, 0.25)
+        self.assertEqual(self.cloud.topics_published, 2)
+        self.assertEqual(self.cloud.topics_unchanged, 2)
+
+    def test_get_sample_range(self):
+        self.cloud.initialize()
+        delta_time = 700000.0
+        start, end = self.cloud.get_sample_range(delta_time)
+        self.assertLessEqual(start, delta_time)
+        self.assertLess(delta_time, end)
+        idx = numpy.argmin(numpy.abs(self.cloud.cloud_dates - delta_time))
+        self.assertAlmostEqual(end - start, 0.5 * (self.cloud.cloud_dates[idx + 1] -
+                                                   self.cloud.cloud_dates[idx - 1]))
+        self.assertEqual(self.cloud.get_cloud(start), self.cloud.get_cloud(delta_time))
+        self.assertEqual(self.cloud.get_cloud(end - 1.0), self.cloud.get_cloud(delta_time))
+        self.assertEqual(self.cloud.get_sample_range(0.0), (0.0, 0.0))
@@ -0,0 +1,87 @@
+import numpy
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from lsst.sims.ocs.environment import ColumnCache
+
+class TestColumnCache(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.work_dir, "test_cloud.db")
+        self.query = "select c_date, cloud from Cloud order by c_date;"
+        self.names = ("c_date", "cloud")
+        with sqlite3.connect(self.db_file) as conn:
+            cur = conn.cursor()
+            cur.execute("create table Cloud (cloudId int, c_date int, cloud float);")
+            cur.executemany("insert into Cloud values (?, ?, ?);",
+                            [(1, 0, 0.5), (2, 1800, 0.25), (3, 3600, 0.0)])
+            conn.commit()
+            cur.close()
+        self.cache_dir = os.path.join(self.work_dir, "user_cache")
+        patcher = mock.patch.dict(os.environ, {ColumnCache.CACHE_DIR_ENV: self.cache_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ColumnCache(self.db_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.cache.db_file, self.db_file)
+        self.assertIsNone(self.cache.db_digest)
+        self.assertEqual(self.cache.cache_directory, self.cache_dir)
+
+    def test_load_creates_and_uses_cache(self):
+        dates, clouds = self.cache.load(self.query, self.names)
+        numpy.testing.assert_array_equal(dates, [0, 1800, 3600])
+        numpy.testing.assert_array_equal(clouds, [0.5, 0.25, 0.0])
+        cache_files = self.cache.cache_files(self.query, self.names)
+        for cache_file in cache_files:
+            self.assertTrue(os.path.exists(cache_file))
+        self.assertListEqual(sorted(os.listdir(self.work_dir)), ["test_cloud.db", "user_cache"])
+
+        with mock.patch.object(self.cache, "read_columns") as mock_read:
+            dates, clouds = self.cache.load(self.query, self.names)
+            self.assertEqual(mock_read.call_count, 0)
+        self.assertIsInstance(dates, numpy.memmap)
+        numpy.testing.assert_array_equal(clouds, [0.5, 0.25, 0.0])
+
+    def test_key_changes_with_database(self):
+        key1 = self.cache.get_key(self.query)
+        self.assertEqual(len(key1), 16)
+        self.assertNotEqual(self.cache.get_key("select cloud from Cloud;"), key1)
+        with sqlite3.connect(self.db_file) as conn:
+            conn.execute("insert into Cloud values (4, 5400, 0.125);")
+            conn.commit()
+        stat = os.stat(self.db_file)
+        os.utime(self.db_file, (stat.st_atime, stat.st_mtime + 10))
+        self.assertNotEqual(ColumnCache(self.db_file).get_key(self.query), key1)
+
+    def test_db_digest_uses_stored_hash(self):
+        digest = self.cache.get_db_digest()
+        digest_files = os.listdir(self.cache_dir)
+        self.assertEqual(len(digest_files), 1)
+        digest_file = os.path.join(self.cache_dir, digest_files[0])
+        with open(digest_file, "w") as ofile:
+            ofile.write("stored")
+        self.assertEqual(ColumnCache(self.db_file).get_db_digest(), "stored")
+
+        stat = os.stat(self.db_file)
+        os.utime(self.db_file, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(ColumnCache(self.db_file).get_db_digest(), digest)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_load_without_writable_cache(self):
+        with mock.patch.object(self.cache, "write_cache_files", side_effect=OSError("read-only")):
+            dates, clouds = self.cache.load(self.query, self.names)
+        self.assertNotIsInstance(dates, numpy.memmap)
+        numpy.testing.assert_array_equal(clouds, [0.5, 0.25, 0.0])
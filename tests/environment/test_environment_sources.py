@@ -0,0 +1,64 @@
+import numpy
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from lsst.sims.ocs.environment import CsvSource, NpySource, SqliteSource, make_source
+
+class TestEnvironmentSources(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.dates = numpy.arange(10) * 300.0 + 100.0
+        self.values = numpy.arange(10) / 10.0
+
+        self.db_file = os.path.join(self.work_dir, "seeing.db")
+        with sqlite3.connect(self.db_file) as conn:
+            conn.execute("create table Seeing (seeingId int, s_date int, seeing float);")
+            conn.executemany("insert into Seeing values (?, ?, ?);",
+                             [(i + 1, d, v) for i, (d, v) in enumerate(zip(self.dates, self.values))])
+            conn.commit()
+
+        self.csv_file = os.path.join(self.work_dir, "seeing.csv")
+        with open(self.csv_file, "w") as ofile:
+            ofile.write("s_date,seeing\n")
+            for d, v in zip(self.dates, self.values):
+                ofile.write("{},{}\n".format(d, v))
+
+        self.npy_file = os.path.join(self.work_dir, "seeing.npy")
+        data = numpy.zeros(self.dates.size, dtype=[("s_date", float), ("seeing", float)])
+        data["s_date"] = self.dates
+        data["seeing"] = self.values
+        numpy.save(self.npy_file, data)
+
+        self.sources = [SqliteSource(self.db_file, "Seeing", "s_date", "seeing"), CsvSource(self.csv_file),
+                        NpySource(self.npy_file, "s_date", "seeing")]
+
+    def tearDown(self):
+        for source in self.sources:
+            source.close()
+        shutil.rmtree(self.work_dir)
+
+    def test_get_last(self):
+        for source in self.sources:
+            self.assertEqual(source.get_last(), (2800.0, 0.9))
+
+    def test_read_window(self):
+        for source in self.sources:
+            dates, values = source.read_window(1000.0, 1600.0)
+            numpy.testing.assert_array_equal(dates, [700.0, 1000.0, 1300.0, 1600.0])
+            numpy.testing.assert_array_equal(values, [0.2, 0.3, 0.4, 0.5])
+            dates, values = source.read_window(1700.0, 2000.0)
+            numpy.testing.assert_array_equal(dates, [1600.0, 1900.0, 2200.0])
+            dates, values = source.read_window(0.0, 200.0)
+            numpy.testing.assert_array_equal(dates, [100.0, 400.0])
+            dates, values = source.read_window(2500.0, 5000.0)
+            numpy.testing.assert_array_equal(dates, [2200.0, 2500.0, 2800.0])
+            numpy.testing.assert_array_equal(values, [0.7, 0.8, 0.9])
+
+    def test_make_source(self):
+        self.assertIsInstance(make_source(self.db_file, "Seeing", "s_date", "seeing"), SqliteSource)
+        self.assertIsInstance(make_source(self.csv_file, "Seeing", "s_date", "seeing"), CsvSource)
+        self.assertIsInstance(make_source(self.npy_file, "Seeing", "s_date", "seeing"), NpySource)
@@ -1,3 +1,4 @@
+import numpy
 import os
 import sqlite3
 import unittest
@@ -38,6 +39,8 @@ class TestSeeingModel(unittest.TestCase):
         self.assertIsNone(self.seeing.environment_config)
         self.assertIsNone(self.seeing.filters_config)
         self.assertIsNone(self.seeing.seeing_fwhm_system_zenith)
+        self.assertIsNone(self.seeing.filter_wavelength_corrections)
+        self.assertIsNone(self.seeing.airmass_grid)
         self.assertEqual(self.seeing.offset, 0)
 
     def test_information_after_initialization(self):
@@ -47,6 +50,10 @@ class TestSeeingModel(unittest.TestCase):
         self.assertIsNotNone(self.seeing.environment_config)
         self.assertIsNotNone(self.seeing.filters_config)
         self.assertEqual(self.seeing.seeing_fwhm_system_zenith, 0.39862262855989494)
+        self.assertEqual(len(self.seeing.filter_wavelength_corrections), 6)
+        self.assertAlmostEqual(self.seeing.filter_wavelength_corrections["z"], (500 / 869.1)**0.3)
+        self.assertIsNone(self.seeing.airmass_grid)
+        self.assertIsNone(self.seeing.airmass_corrections)
 
     def test_get_seeing(self):
         self.initialize()
@@ -55,6 +62,13 @@ class TestSeeingModel(unittest.TestCase):
         self.assertEqual(self.seeing.get_seeing(63190400), 0.64860999584198)
         self.assertEqual(self.seeing.get_seeing(189424900), 0.699440002441406)
 
+    def test_get_seeing_for_times(self):
+        self.initialize()
+        times = numpy.array([75400, 76700, 63190400, 189424900])
+        seeing_values = self.seeing.get_seeing_for_times(times)
+        numpy.testing.assert_array_equal(seeing_values, [0.859431982040405, 0.646009027957916,
+                                                         0.64860999584198, 0.699440002441406])
+
     def test_get_seeing_using_different_start_month(self):
         seeing1 = SeeingModel(TimeHandler("2020-05-24"))
         self.assertEqual(seeing1.offset, 12441600)
@@ -94,6 +108,23 @@ class TestSeeingModel(unittest.TestCase):
         self.assertEqual(seeing_topic.timestamp, 1578528000.0)
         self.assertEqual(seeing_topic.seeing, 0.715884983539581)
 
+    def test_topic_setting_on_change(self):
+        seeing_topic = SALPY_scheduler.scheduler_seeingC()
+        self.th.update_time(8, "days")
+        self.initialize()
+        self.assertTrue(self.seeing.set_topic(self.th, seeing_topic, on_change=True))
+        self.assertEqual(seeing_topic.seeing, 0.715884983539581)
+        self.seeing.get_seeing = mock.Mock(return_value=0.715884983539581)
+        self.th.update_time(1, "seconds")
+        self.assertFalse(self.seeing.set_topic(self.th, seeing_topic, on_change=True))
+        self.assertEqual(self.seeing.get_seeing.call_count, 0)
+        self.seeing.get_seeing.return_value = 0.8
+        self.th.update_time(1, "hours")
+        self.assertTrue(self.seeing.set_topic(self.th, seeing_topic, on_change=True))
+        self.assertEqual(seeing_topic.seeing, 0.8)
+        self.assertEqual(self.seeing.topics_published, 2)
+        self.assertEqual(self.seeing.topics_unchanged, 1)
+
     def test_calculation_perfect_seeing_perfect_airmass_in_g_band(self):
         self.initialize()
         self.seeing.get_seeing = mock.MagicMock(return_value=0.0)
@@ -115,3 +146,35 @@ class TestSeeingModel(unittest.TestCase):
         self.initialize()
         seeing_values = self.seeing.calculate_seeing(self.elapsed_time, '', 1.5)
         self.compare_seeing(seeing_values, -1.0, -1.0, -1.0)
+
+    def test_calculation_for_times(self):
+        self.initialize()
+        times = numpy.array([self.elapsed_time, self.elapsed_time, 75400])
+        filters = numpy.array(['z', '', 'g'])
+        airmasses = numpy.array([1.5, 1.5, 1.1])
+        seeing_values = self.seeing.calculate_seeing_for_times(times, filters, airmasses)
+        self.assertEqual(len(seeing_values), 3)
+        for i in range(times.size):
+            truth_values = self.seeing.calculate_seeing(times[i], filters[i], airmasses[i])
+            self.compare_seeing([values[i] for values in seeing_values], *truth_values)
+
+    def test_calculation_for_times_with_unknown_filter(self):
+        self.initialize()
+        times = numpy.array([self.elapsed_time, self.elapsed_time])
+        airmasses = numpy.array([1.5, 1.5])
+        with self.assertRaises(KeyError):
+            self.seeing.calculate_seeing(self.elapsed_time, 'x', 1.5)
+        with self.assertRaises(KeyError):
+            self.seeing.calculate_seeing_for_times(times, numpy.array(['z', 'x']), airmasses)
+
+    def test_calculation_with_airmass_correction_table(self):
+        self.environment_config.airmass_correction_step = 0.001
+        self.initialize()
+        self.assertEqual(self.seeing.airmass_grid.size, 4001)
+        self.assertEqual(self.seeing.airmass_grid[-1], 5.0)
+        self.seeing.get_seeing = mock.MagicMock(return_value=0.7)
+        seeing_values = self.seeing.calculate_seeing(self.elapsed_time, 'g', 1.1)
+        self.assertEqual(seeing_values[0], 0.7)
+        self.assertAlmostEqual(seeing_values[1], 0.74916151132491315, places=6)
+        self.assertAlmostEqual(seeing_values[2], 1.0124922970058186, places=6)
+        self.assertEqual(self.seeing.get_airmass_correction(6.0), 6.0**0.6)
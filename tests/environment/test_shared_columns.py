@@ -0,0 +1,61 @@
+import numpy
+import os
+import unittest
+import uuid
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from lsst.sims.ocs.environment import SharedColumns
+
+@unittest.skipIf(not SharedColumns.available(), "POSIX shared memory is not available.")
+class TestSharedColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.key = uuid.uuid4().hex[:16]
+        self.dates = numpy.array([0.0, 1800.0, 3600.0])
+        self.values = numpy.array([0.5, 0.25, 0.0])
+        self.loader = mock.Mock(return_value=[self.dates, self.values])
+        self.shared = SharedColumns(self.key)
+
+    def tearDown(self):
+        if os.path.exists(self.shared.lock_file):
+            os.remove(self.shared.lock_file)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.shared.key, self.key)
+        self.assertEqual(self.shared.name, "socs_{}".format(self.key))
+        self.assertIsNone(self.shared.segment)
+
+    def test_attach_and_detach(self):
+        dates, values = self.shared.attach(self.loader)
+        self.assertEqual(self.loader.call_count, 1)
+        numpy.testing.assert_array_equal(dates, self.dates)
+        numpy.testing.assert_array_equal(values, self.values)
+        self.assertFalse(values.flags.writeable)
+
+        other = SharedColumns(self.key)
+        other_dates, other_values = other.attach(self.loader)
+        self.assertEqual(self.loader.call_count, 1)
+        numpy.testing.assert_array_equal(other_values, self.values)
+        self.assertEqual(self.shared.update_count(0), 2)
+
+        del dates, values
+        self.shared.detach()
+        self.assertIsNone(self.shared.segment)
+        self.assertEqual(other.update_count(0), 1)
+        numpy.testing.assert_array_equal(other_dates, self.dates)
+
+        del other_dates, other_values
+        other.detach()
+        self.assertRaises(OSError, self.shared.open_segment, False)
+
+    def test_attach_without_shared_memory(self):
+        with mock.patch.object(SharedColumns, "available", return_value=False):
+            dates, values = self.shared.attach(self.loader)
+        self.assertEqual(self.loader.call_count, 1)
+        self.assertIs(values, self.values)
+        self.assertIsNone(self.shared.segment)
+        self.shared.detach()
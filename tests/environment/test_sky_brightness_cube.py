@@ -0,0 +1,157 @@
+import numpy
+import os
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from lsst.sims.ocs.environment import SkyBrightnessCube
+
+class TestSkyBrightnessCube(unittest.TestCase):
+
+    def setUp(self):
+        self.cube_file = "test_sky_cube.dat"
+        self.timestamps = numpy.array([1000.0, 1300.0, 1600.0])
+        self.field_ids = [1, 2, 5]
+        self.moon_sun_info = {"moonRA": 0.5, "moonDec": 0.0, "moonAlt": [0.2], "moonAz": [2.0],
+                              "moonPhase": 30.0, "sunRA": 3.0, "sunDec": 0.0, "sunAlt": [-0.5],
+                              "sunAz": [4.5], "moonDist": [1.0], "solarElong": [2.0]}
+
+    def tearDown(self):
+        if os.path.exists(self.cube_file):
+            os.remove(self.cube_file)
+
+    def create_cube(self):
+        cube = SkyBrightnessCube.create(self.cube_file, self.timestamps, self.field_ids,
+                                        metadata={"time_step": 300.0})
+        for i in range(len(cube)):
+            sky_mags = {}
+            for j, filter_name in enumerate(SkyBrightnessCube.FILTERS):
+                sky_mags[filter_name] = numpy.array(self.field_ids) + 10.0 * i + j
+            cube.set_sky_brightness(i, sky_mags)
+            msi = {name: numpy.asarray(value) + i for name, value in self.moon_sun_info.items()}
+            cube.set_ephemeris(i, 1.0 + i, msi)
+        cube.flush()
+
+    def test_basic_information_after_creation(self):
+        cube = SkyBrightnessCube()
+        self.assertIsNone(cube.cube_file)
+        self.assertIsNone(cube.header)
+        self.assertIsNone(cube.sky_brightness)
+        self.assertEqual(len(cube), 0)
+
+    def test_information_after_initialization(self):
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        self.assertEqual(len(cube), 3)
+        self.assertEqual(cube.sky_brightness.shape, (3, 3, 6))
+        self.assertEqual(cube.ephemeris.shape, (3, 10))
+        self.assertListEqual(cube.timestamps.tolist(), self.timestamps.tolist())
+        self.assertEqual(cube.time_step, 300.0)
+        self.assertEqual(cube.header["metadata"]["time_step"], 300.0)
+
+    def test_bad_file(self):
+        with open(self.cube_file, "wb") as ofile:
+            ofile.write(b"NOTACUBEFILE")
+        cube = SkyBrightnessCube()
+        with self.assertRaises(ValueError):
+            cube.initialize(self.cube_file)
+
+    def test_get_sky_brightness(self):
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        sky_mags = cube.get_sky_brightness(1100.0, numpy.array([5, 1]))
+        self.assertListEqual(sky_mags["u"].tolist(), [5.0, 1.0])
+        self.assertListEqual(sky_mags["y"].tolist(), [10.0, 6.0])
+        sky_mags = cube.get_sky_brightness(1500.0, numpy.array([2]))
+        self.assertListEqual(sky_mags["g"].tolist(), [23.0])
+        sky_mags = cube.get_sky_brightness(800.0, numpy.array([2]))
+        self.assertListEqual(sky_mags["r"].tolist(), [4.0])
+        sky_mags = cube.get_sky_brightness(1800.0, numpy.array([2]))
+        self.assertListEqual(sky_mags["r"].tolist(), [24.0])
+
+    def test_get_sky_brightness_bad_lookups(self):
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        with self.assertRaises(ValueError):
+            cube.get_sky_brightness(500.0, numpy.array([2]))
+        with self.assertRaises(ValueError):
+            cube.get_sky_brightness(2000.0, numpy.array([2]))
+        for ids in ([1, 3], [6], [-1]):
+            with self.assertRaises(ValueError):
+                cube.get_sky_brightness(1300.0, numpy.array(ids))
+
+    def test_get_sky_brightness_in_grid_gap(self):
+        self.timestamps = numpy.array([1000.0, 1300.0, 1600.0, 5000.0, 5300.0])
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        self.assertEqual(cube.time_step, 300.0)
+        sky_mags = cube.get_sky_brightness(1850.0, numpy.array([2]))
+        self.assertListEqual(sky_mags["u"].tolist(), [22.0])
+        sky_mags = cube.get_sky_brightness(4750.0, numpy.array([2]))
+        self.assertListEqual(sky_mags["u"].tolist(), [32.0])
+        for timestamp in (1950.0, 3300.0, 4600.0):
+            with self.assertRaises(ValueError):
+                cube.get_sky_brightness(timestamp, numpy.array([2]))
+            with self.assertRaises(ValueError):
+                cube.get_moon_sun_info(timestamp, numpy.zeros(1), numpy.zeros(1))
+            with self.assertRaises(ValueError):
+                cube.get_target_information(timestamp, numpy.zeros(1), numpy.zeros(1), 0.0)
+
+    def test_get_moon_sun_info(self):
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        msi = cube.get_moon_sun_info(1350.0, numpy.array([0.5, 0.7]), numpy.array([0.0, 0.0]))
+        self.assertEqual(msi["moonRA"], 1.5)
+        self.assertEqual(msi["moonPhase"], 31.0)
+        msi = cube.get_moon_sun_info(1100.0, numpy.array([0.5, 0.7]), numpy.array([0.0, 0.0]))
+        self.assertEqual(set(msi.keys()), set(self.moon_sun_info.keys()))
+        self.assertEqual(msi["moonRA"], 0.5)
+        self.assertEqual(msi["moonPhase"], 30.0)
+        self.assertEqual(msi["sunRA"], 3.0)
+        self.assertListEqual(msi["moonAlt"].tolist(), [0.2, 0.2])
+        self.assertListEqual(msi["sunAz"].tolist(), [4.5, 4.5])
+        numpy.testing.assert_allclose(msi["moonDist"], [0.0, 0.2], atol=1e-12)
+        numpy.testing.assert_allclose(msi["solarElong"], [2.5, 2.3], atol=1e-12)
+
+    def test_get_target_information(self):
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        latitude = -0.5
+        # The LST stored at grid time 1000 is 1 radian.
+        lst = 1.0 + SkyBrightnessCube.SIDEREAL_RATE * 100.0
+        attrs = cube.get_target_information(1100.0, numpy.array([lst, lst, lst]),
+                                            numpy.array([latitude, latitude + 0.25, latitude - 0.25]),
+                                            latitude)
+        numpy.testing.assert_allclose(attrs["altitude"], [numpy.pi / 2.0, numpy.pi / 2.0 - 0.25,
+                                                          numpy.pi / 2.0 - 0.25])
+        numpy.testing.assert_allclose(attrs["azimuth"][1:], [0.0, numpy.pi], atol=1e-12)
+        numpy.testing.assert_allclose(attrs["airmass"], 1.0 / numpy.sin(attrs["altitude"]))
+        self.assertAlmostEqual(attrs["airmass"][0], 1.0)
+
+    def test_fill(self):
+        cube = SkyBrightnessCube.create(self.cube_file, self.timestamps, self.field_ids)
+        sky_model = mock.Mock()
+        sky_model.get_sky_brightness.return_value = {f: numpy.full(3, 20.0) for f in cube.FILTERS}
+        sky_model.get_moon_sun_info.return_value = self.moon_sun_info
+        sky_model.date_profile.lst_rad = 2.5
+        cube.fill(sky_model)
+        self.assertEqual(sky_model.update.call_count, 3)
+        self.assertTrue(numpy.all(cube.sky_brightness[:] == 20.0))
+        self.assertListEqual(cube.ephemeris[:, cube.ephemeris_index["lst"]].tolist(), [2.5] * 3)
+        self.assertListEqual(cube.ephemeris[:, cube.ephemeris_index["moonAz"]].tolist(), [2.0] * 3)
+
+    def test_sky_brightness_config(self):
+        self.create_cube()
+        cube = SkyBrightnessCube()
+        cube.initialize(self.cube_file)
+        config = cube.sky_brightness_config()
+        self.assertEqual(len(config), 3)
+        self.assertEqual(config[2], ("sky_brightness_cube/time_step", "300.0"))
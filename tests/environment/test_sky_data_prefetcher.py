@@ -0,0 +1,93 @@
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+from lsst.sims.ocs.environment import SkyDataPrefetcher
+
+class FakeSkyModelPre(object):
+
+    def __init__(self, data_dir):
+        self.files = []
+        for mjd_range in [(59000, 59002), (59002, 59004)]:
+            filename = os.path.join(data_dir, "{}_{}.npz".format(*mjd_range))
+            with open(filename, "wb") as ofile:
+                ofile.write(b"header")
+            self.files.append(filename)
+        self.mjd_left = numpy.array([59000.0, 59002.0])
+        self.mjd_right = numpy.array([59002.0, 59004.0])
+        self.loaded_range = numpy.array([-1])
+        self.sb = None
+        self.load_mjds = []
+
+    def _load_data(self, mjd):
+        index = numpy.where((mjd >= self.mjd_left) & (mjd <= self.mjd_right))[0].min()
+        with open(self.files[index], "rb") as ifile:
+            self.sb = ifile.read()
+        self.loaded_range = numpy.array([self.mjd_left[index], self.mjd_right[index]])
+        self.load_mjds = self.load_mjds + [mjd]
+
+class TestSkyDataPrefetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.prefetcher = SkyDataPrefetcher(FakeSkyModelPre(self.data_dir))
+        # Timestamp for MJD 59000
+        self.timestamp = (59000.0 - SkyDataPrefetcher.MJD_UNIX_EPOCH) * 86400.0
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.prefetcher.lookahead, 1.5)
+        self.assertEqual(self.prefetcher.prefetch_hits, 0)
+        self.assertEqual(self.prefetcher.prefetch_misses, 0)
+        self.assertEqual(self.prefetcher.stall_time, 0.0)
+        self.assertIsNone(self.prefetcher.current_chunk)
+
+    def test_chunk_index(self):
+        self.assertEqual(self.prefetcher.chunk_index(59001.0), 0)
+        self.assertEqual(self.prefetcher.chunk_index(59003.0), 1)
+        self.assertIsNone(self.prefetcher.chunk_index(59010.0))
+
+    def test_chunk_mjd(self):
+        self.assertEqual(self.prefetcher.chunk_mjd(1), 59003.0)
+
+    def test_prefetch_hit(self):
+        sky_brightness = self.prefetcher.sky_brightness
+        self.prefetcher.update(self.timestamp + 0.6 * 86400.0)
+        self.assertEqual(self.prefetcher.current_chunk, 0)
+        self.prefetcher.finalize()
+        self.assertEqual(self.prefetcher.prefetched[0], 1)
+        # The prefetch does not touch the sky model in use.
+        self.assertListEqual(sky_brightness.load_mjds, [])
+        self.prefetcher.update(self.timestamp + 2.5 * 86400.0)
+        self.assertEqual(self.prefetcher.current_chunk, 1)
+        self.assertEqual(self.prefetcher.prefetch_hits, 1)
+        self.assertEqual(self.prefetcher.prefetch_misses, 0)
+        self.assertIsNone(self.prefetcher.prefetched)
+        self.assertListEqual(sky_brightness.loaded_range.tolist(), [59002.0, 59004.0])
+        self.assertEqual(sky_brightness.sb, b"header")
+        self.assertListEqual(sky_brightness.load_mjds, [59003.0])
+
+    def test_prefetch_wait(self):
+        sky_brightness = self.prefetcher.sky_brightness
+        self.prefetcher.update(self.timestamp + 0.6 * 86400.0)
+        self.prefetcher.update(self.timestamp + 2.5 * 86400.0)
+        self.assertIsNone(self.prefetcher.thread)
+        self.assertEqual(self.prefetcher.prefetch_hits + self.prefetcher.prefetch_misses, 1)
+        self.assertListEqual(sky_brightness.loaded_range.tolist(), [59002.0, 59004.0])
+        self.assertListEqual(sky_brightness.load_mjds, [59003.0])
+
+    def test_prefetch_miss(self):
+        sky_brightness = self.prefetcher.sky_brightness
+        self.prefetcher.update(self.timestamp)
+        self.prefetcher.finalize()
+        self.assertIsNone(self.prefetcher.prefetched)
+        self.prefetcher.update(self.timestamp + 2.5 * 86400.0)
+        self.assertEqual(self.prefetcher.prefetch_hits, 0)
+        self.assertEqual(self.prefetcher.prefetch_misses, 1)
+        self.assertGreater(self.prefetcher.stall_time, 0.0)
+        self.assertListEqual(sky_brightness.loaded_range.tolist(), [59002.0, 59004.0])
+        self.assertListEqual(sky_brightness.load_mjds, [59002.5])
@@ -0,0 +1,74 @@
+import numpy
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from lsst.sims.ocs.environment import CsvSource, NpySource, SqliteSource, StreamedSeries
+
+class TestStreamedSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        random = numpy.random.RandomState(42)
+        self.dates = numpy.cumsum(random.randint(200, 400, size=2000)).astype(float)
+        self.values = random.uniform(0.3, 2.0, size=self.dates.size)
+
+        db_file = os.path.join(self.work_dir, "seeing.db")
+        with sqlite3.connect(db_file) as conn:
+            conn.execute("create table Seeing (seeingId int, s_date int, seeing float);")
+            conn.executemany("insert into Seeing values (?, ?, ?);",
+                             [(i + 1, d, v) for i, (d, v) in enumerate(zip(self.dates, self.values))])
+            conn.commit()
+        csv_file = os.path.join(self.work_dir, "seeing.csv")
+        numpy.savetxt(csv_file, numpy.column_stack((self.dates, self.values)), delimiter=",",
+                      fmt="%.17g")
+        npy_file = os.path.join(self.work_dir, "seeing.npy")
+        data = numpy.zeros(self.dates.size, dtype=[("s_date", float), ("seeing", float)])
+        data["s_date"] = self.dates
+        data["seeing"] = self.values
+        numpy.save(npy_file, data)
+
+        self.sources = [SqliteSource(db_file, "Seeing", "s_date", "seeing"), CsvSource(csv_file),
+                        NpySource(npy_file, "s_date", "seeing")]
+
+    def tearDown(self):
+        for source in self.sources:
+            source.close()
+        shutil.rmtree(self.work_dir)
+
+    def nearest(self, date):
+        date = date % self.dates[-1]
+        idx = numpy.searchsorted(self.dates, date)
+        left = self.dates[idx - 1]
+        right = self.dates[idx]
+        if date - left < right - date:
+            idx -= 1
+        return self.values[idx]
+
+    def test_basic_information_after_creation(self):
+        series = StreamedSeries(self.sources[0], 86400.0)
+        self.assertEqual(series.period, self.dates[-1])
+        self.assertEqual(series.last_value, self.values[-1])
+        self.assertIsNone(series.dates)
+        self.assertEqual(series.prefetch_hits, 0)
+        self.assertEqual(series.prefetch_misses, 0)
+
+    def test_nearest_values_match_full_series(self):
+        times = numpy.concatenate(([0.0, self.dates[0], self.dates[5]],
+                                   numpy.arange(0.0, 2.5 * self.dates[-1], 97.0)))
+        truth = numpy.array([self.nearest(t) for t in times])
+        for source in self.sources:
+            series = StreamedSeries(source, 20000.0)
+            values = numpy.array([series.get_values(t) for t in times])
+            numpy.testing.assert_array_equal(values, truth)
+            self.assertLess(series.dates.size, self.dates.size)
+            self.assertGreater(series.prefetch_hits, 0)
+            series.close()
+
+    def test_array_lookup(self):
+        series = StreamedSeries(self.sources[0], 20000.0, prefetch=False)
+        times = numpy.arange(50000.0, 150000.0, 1000.0)
+        numpy.testing.assert_array_equal(series.get_values(times), [self.nearest(t) for t in times])
+        self.assertIsNone(series.thread)
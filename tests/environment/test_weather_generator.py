@@ -0,0 +1,93 @@
+import numpy
+import time
+import unittest
+
+from lsst.sims.ocs.environment import WeatherGenerator
+
+class TestWeatherGenerator(unittest.TestCase):
+
+    def setUp(self):
+        # Two years of hourly information with a seasonal trend and strong time correlation.
+        random = numpy.random.RandomState(1234)
+        num_values = 2 * 365 * 24
+        self.dates = 3600.0 * numpy.arange(num_values)
+        scores = numpy.zeros(num_values)
+        noise = random.standard_normal(num_values) * numpy.sqrt(1.0 - 0.9 ** 2)
+        for i in range(1, num_values):
+            scores[i] = 0.9 * scores[i - 1] + noise[i]
+        season = numpy.sin(2.0 * numpy.pi * self.dates / WeatherGenerator.YEAR)
+        self.values = numpy.exp(-0.4 + 0.2 * season + 0.25 * scores)
+        self.generator = WeatherGenerator(seed=42)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.generator.seed, 42)
+        self.assertIsNone(self.generator.step)
+        self.assertIsNone(self.generator.phi)
+        self.assertIsNone(self.generator.quantiles)
+
+    def test_generate_before_fit(self):
+        self.assertRaises(RuntimeError, self.generator.generate, 86400.0)
+
+    def test_fit(self):
+        self.generator.fit(self.dates, self.values)
+        self.assertEqual(self.generator.step, 3600.0)
+        self.assertAlmostEqual(self.generator.phi, 0.9, delta=0.02)
+        self.assertEqual(self.generator.quantiles.shape, (12, 1000))
+        self.assertGreaterEqual(self.generator.quantiles.min(), self.values.min())
+        self.assertLessEqual(self.generator.quantiles.max(), self.values.max())
+
+    def test_fit_irregular_series(self):
+        # Ten jittered samples about an hour apart each night with a long daytime gap.
+        random = numpy.random.RandomState(5678)
+        num_nights = 2 * 365
+        night_offsets = numpy.cumsum(3600.0 + random.uniform(-300.0, 300.0, (num_nights, 10)), axis=1)
+        dates = (86400.0 * numpy.arange(num_nights)[:, numpy.newaxis] + night_offsets).flatten()
+        # Correlation of 0.9 per hour at the actual spacing of the samples.
+        correlations = 0.9 ** (numpy.diff(dates) / 3600.0)
+        scores = numpy.zeros(dates.size)
+        noise = random.standard_normal(dates.size)
+        for i in range(1, dates.size):
+            scores[i] = (correlations[i - 1] * scores[i - 1] +
+                         numpy.sqrt(1.0 - correlations[i - 1] ** 2) * noise[i])
+        values = numpy.exp(-0.4 + 0.25 * scores)
+        self.generator.fit(dates, values)
+        self.assertAlmostEqual(self.generator.step, 3600.0, delta=100.0)
+        self.assertAlmostEqual(self.generator.phi ** (3600.0 / self.generator.step), 0.9, delta=0.03)
+
+    def test_generate(self):
+        self.generator.fit(self.dates, self.values)
+        duration = 20 * WeatherGenerator.YEAR
+        start = time.time()
+        dates, values = self.generator.generate(duration)
+        self.assertLess(time.time() - start, 1.0)
+        self.assertEqual(dates.size, values.size)
+        self.assertGreaterEqual(dates[-1], duration)
+        self.assertEqual(dates[1] - dates[0], 3600.0)
+        self.assertAlmostEqual(WeatherGenerator.lag_correlation(values),
+                               WeatherGenerator.lag_correlation(self.values), delta=0.02)
+        self.assertAlmostEqual(numpy.median(values), numpy.median(self.values), delta=0.01)
+        summer = self.generator.get_season_bins(dates) == 3
+        winter = self.generator.get_season_bins(dates) == 9
+        self.assertGreater(values[summer].mean(), values[winter].mean())
+
+    def test_generate_is_reproducible(self):
+        self.generator.fit(self.dates, self.values)
+        other = WeatherGenerator(seed=42)
+        other.fit(self.dates, self.values)
+        numpy.testing.assert_array_equal(self.generator.generate(86400.0 * 30)[1],
+                                         other.generate(86400.0 * 30)[1])
+
+    def test_discrete_values_are_kept(self):
+        cloud = numpy.round(numpy.clip(self.values - 0.4, 0.0, 1.0) * 8.0) / 8.0
+        self.generator.fit(self.dates, cloud)
+        _, values = self.generator.generate(WeatherGenerator.YEAR)
+        self.assertTrue(set(numpy.unique(values)).issubset(set(numpy.unique(cloud))))
+
+    def test_transform_size(self):
+        self.assertEqual(WeatherGenerator.get_transform_size(7), 8)
+        self.assertEqual(WeatherGenerator.get_transform_size(1000), 1000)
+        self.assertEqual(WeatherGenerator.get_transform_size(1025), 1080)
+
+    def test_normal_cdf(self):
+        numpy.testing.assert_allclose(WeatherGenerator.normal_cdf(numpy.array([-1.96, 0.0, 1.0])),
+                                      [0.0249979, 0.5, 0.8413447], atol=1.0e-6)
@@ -1,4 +1,3 @@
-from builtins import range
 import logging
 try:
     from unittest import mock
@@ -33,12 +32,15 @@ class DowntimeHandlerTest(unittest.TestCase):
     def test_basic_information_after_creation(self):
         self.assertIsNotNone(self.dh.scheduled)
         self.assertIsNotNone(self.dh.unscheduled)
-        self.assertEqual(len(self.dh.downtime_days), 0)
+        self.assertEqual(self.dh.downtime_remaining.size, 0)
+        self.assertEqual(self.dh.downtime_cause.size, 0)
 
     def test_information_after_initialization(self):
         self.initialize()
         self.assertGreater(len(self.dh.scheduled), 0)
         self.assertGreater(len(self.dh.unscheduled), 0)
+        self.assertGreater(self.dh.downtime_remaining.size, 0)
+        self.assertEqual(self.dh.downtime_cause.size, self.dh.downtime_remaining.size)
 
     @mock.patch("time.time")
     def test_information_with_alternate_unscheduled_downtime_seed(self, mock_time):
@@ -50,106 +52,92 @@ class DowntimeHandlerTest(unittest.TestCase):
         self.assertGreater(len(self.dh.unscheduled), 0)
         self.assertEqual(self.conf.unscheduled_downtime_random_seed, alt_seed)
 
-    def test_no_more_downtime(self):
+    def set_downtimes(self, scheduled, unscheduled):
         self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = None
-        self.mock_unscheduled_downtime.return_value = None
+        self.mock_scheduled_downtime.downtimes = scheduled
+        self.mock_unscheduled_downtime.downtimes = unscheduled
+        self.dh.build_calendar()
+
+    def test_no_more_downtime(self):
+        self.set_downtimes([], [])
         self.assertEqual(self.dh.get_downtime(100), 0)
+        self.assertEqual(self.dh.get_downtime_cause(100), DowntimeHandler.NO_DOWNTIME)
 
     def test_no_downtime(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (110, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (130, 1, "minor event")
+        self.set_downtimes([(110, 7, "routine maintanence")], [(130, 1, "minor event")])
         self.assertEqual(self.dh.get_downtime(100), 0)
-        self.assertIsNone(self.dh.current_scheduled)
-        self.assertIsNotNone(self.dh.current_unscheduled)
+        self.assertEqual(self.dh.get_downtime(-1), 0)
+        self.assertEqual(self.dh.get_downtime(200), 0)
 
     def test_no_overlap_scheduled_before_unscheduled(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (100, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (130, 1, "minor event")
+        self.set_downtimes([(100, 7, "routine maintanence")], [(130, 1, "minor event")])
         self.assertEqual(self.dh.get_downtime(100), 7)
         self.assertEqual(self.dh.get_downtime(101), 6)
-        self.dh.downtime_days.difference_update(set(list(range(102, 107))))
+        self.assertEqual(self.dh.get_downtime(106), 1)
         self.assertEqual(self.dh.get_downtime(107), 0)
-        self.assertIsNone(self.dh.current_scheduled)
-        self.assertIsNotNone(self.dh.current_unscheduled)
+        self.assertEqual(self.dh.get_downtime(130), 1)
+        self.assertEqual(self.dh.get_downtime_cause(100), DowntimeHandler.SCHEDULED)
+        self.assertEqual(self.dh.get_downtime_cause(130), DowntimeHandler.UNSCHEDULED)
 
     def test_no_overlap_unscheduled_before_scheduled(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (110, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (100, 1, "minor event")
+        self.set_downtimes([(110, 7, "routine maintanence")], [(100, 1, "minor event")])
         self.assertEqual(self.dh.get_downtime(100), 1)
         self.assertEqual(self.dh.get_downtime(101), 0)
-        self.assertIsNotNone(self.dh.current_scheduled)
-        self.assertIsNone(self.dh.current_unscheduled)
+        self.assertEqual(self.dh.get_downtime(110), 7)
+
+    def test_touching_downtimes_stay_separate(self):
+        self.set_downtimes([(101, 7, "routine maintanence")], [(100, 1, "minor event")])
+        self.assertEqual(self.dh.get_downtime(100), 1)
+        self.assertEqual(self.dh.get_downtime(101), 7)
 
     def test_full_overlap_unscheduled_in_scheduled(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (100, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (102, 3, "intermediate event")
+        self.set_downtimes([(100, 7, "routine maintanence")], [(102, 3, "intermediate event")])
         self.assertEqual(self.dh.get_downtime(100), 7)
         self.assertEqual(self.dh.get_downtime(101), 6)
-        self.dh.downtime_days.difference_update(set(list(range(102, 107))))
         self.assertEqual(self.dh.get_downtime(107), 0)
-        self.assertIsNone(self.dh.current_scheduled)
-        self.assertIsNone(self.dh.current_unscheduled)
+        self.assertEqual(self.dh.get_downtime_cause(101), DowntimeHandler.SCHEDULED)
+        self.assertEqual(self.dh.get_downtime_cause(102),
+                         DowntimeHandler.SCHEDULED | DowntimeHandler.UNSCHEDULED)
 
     def test_full_overlap_scheduled_in_unscheduled(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (103, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (100, 14, "catastrophic event")
+        self.set_downtimes([(103, 7, "routine maintanence")], [(100, 14, "catastrophic event")])
         self.assertEqual(self.dh.get_downtime(100), 14)
         self.assertEqual(self.dh.get_downtime(101), 13)
-        self.dh.downtime_days.difference_update(set(list(range(102, 114))))
         self.assertEqual(self.dh.get_downtime(114), 0)
-        self.assertIsNone(self.dh.current_scheduled)
-        self.assertIsNone(self.dh.current_unscheduled)
 
     def test_partial_overlap_unscheduled_after_scheduled(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (100, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (106, 3, "intermediate event")
+        self.set_downtimes([(100, 7, "routine maintanence")], [(106, 3, "intermediate event")])
         self.assertEqual(self.dh.get_downtime(100), 9)
         self.assertEqual(self.dh.get_downtime(101), 8)
-        self.dh.downtime_days.difference_update(set(list(range(102, 109))))
+        self.assertEqual(self.dh.get_downtime(108), 1)
         self.assertEqual(self.dh.get_downtime(109), 0)
-        self.assertIsNone(self.dh.current_scheduled)
-        self.assertIsNone(self.dh.current_unscheduled)
 
     def test_partial_overlap_scheduled_after_unscheduled(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.return_value = (101, 7, "routine maintanence")
-        self.mock_unscheduled_downtime.return_value = (100, 3, "intermediate event")
+        self.set_downtimes([(101, 7, "routine maintanence")], [(100, 3, "intermediate event")])
         self.assertEqual(self.dh.get_downtime(100), 8)
         self.assertEqual(self.dh.get_downtime(101), 7)
         self.assertEqual(self.dh.get_downtime(102), 6)
-        self.dh.downtime_days.difference_update(set(list(range(103, 108))))
         self.assertEqual(self.dh.get_downtime(108), 0)
-        self.assertIsNone(self.dh.current_scheduled)
-        self.assertIsNone(self.dh.current_unscheduled)
 
     def test_downtime_cycling(self):
-        self.initialize_mocks()
-        self.mock_scheduled_downtime.side_effect = ((100, 7, "routine maintanence"),
-                                                    (122, 7, "routine maintanence"),
-                                                    None, None)
-        self.mock_unscheduled_downtime.side_effect = ((109, 1, "minor event"),
-                                                      (120, 3, "intermediate event"),
-                                                      None, None)
-
+        self.set_downtimes([(100, 7, "routine maintanence"), (122, 7, "routine maintanence")],
+                           [(109, 1, "minor event"), (120, 3, "intermediate event")])
         self.assertEqual(self.dh.get_downtime(100), 7)
         self.assertEqual(self.dh.get_downtime(101), 6)
-        self.dh.downtime_days.difference_update(set(list(range(102, 107))))
         self.assertEqual(self.dh.get_downtime(107), 0)
         self.assertEqual(self.dh.get_downtime(108), 0)
         self.assertEqual(self.dh.get_downtime(109), 1)
         self.assertEqual(self.dh.get_downtime(110), 0)
         self.assertEqual(self.dh.get_downtime(120), 9)
-        self.dh.downtime_days.difference_update(set(list(range(121, 129))))
+        self.assertEqual(self.dh.get_downtime(128), 1)
         self.assertEqual(self.dh.get_downtime(129), 0)
         self.assertEqual(self.dh.get_downtime(130), 0)
 
+    def test_scheduled_downtime_after_last_unscheduled(self):
+        self.set_downtimes([(100, 7, "routine maintanence"), (150, 7, "routine maintanence")],
+                           [(120, 1, "minor event")])
+        self.assertEqual(self.dh.get_downtime(150), 7)
+
     @mock.patch("lsst.sims.ocs.database.socs_db.SocsDatabase", spec=True)
     def test_database_write(self, mock_db):
         self.initialize()
@@ -59,6 +59,8 @@ class SequencerTest(unittest.TestCase):
         self.assertIsNotNone(self.seq.observatory_location)
         self.assertEqual(self.seq.targets_missed, 0)
         self.assertIsNotNone(self.seq.sky_model)
+        self.assertIsNone(self.seq.sky_cube)
+        self.assertIsNone(self.seq.sky_prefetcher)
 
     @mock.patch("lsst.sims.ocs.observatory.main_observatory.MainObservatory.configure")
     @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetryPub")
@@ -75,6 +77,44 @@ class SequencerTest(unittest.TestCase):
         self.seq.finalize()
         self.assertEqual(mock_logger_info.call_count, 3)
 
+    @mock.patch("logging.Logger.info")
+    @mock.patch("lsst.sims.ocs.kernel.sequencer.SkyDataPrefetcher", spec=True)
+    def test_prefetch_sky_data(self, mock_prefetcher, mock_logger_info):
+        mock_prefetcher.return_value.prefetch_hits = 1
+        mock_prefetcher.return_value.prefetch_misses = 0
+        mock_prefetcher.return_value.stall_time = 0.0
+        self.seq = Sequencer(ObservingSite(), Survey().idle_delay, sky_prefetch=True)
+        self.assertIsNotNone(self.seq.sky_prefetcher)
+        self.seq.prefetch_sky_data(1664582400.0)
+        mock_prefetcher.return_value.update.assert_called_once_with(1664582400.0)
+        self.seq.finalize()
+        self.assertTrue(mock_prefetcher.return_value.finalize.called)
+        self.assertEqual(mock_logger_info.call_count, 6)
+
+    def test_get_slew_activity_statistics(self):
+        self.assertListEqual(self.seq.get_slew_activity_statistics(1), [])
+        self.seq = Sequencer(ObservingSite(), Survey().idle_delay, aggregate_slew_activities=True)
+        self.seq.observatory_model.slew_activity_aggregator.add("telalt", 2.0, True)
+        statistics = self.seq.get_slew_activity_statistics(1)
+        self.assertEqual(len(statistics), 1)
+        self.assertEqual(statistics[0].night, 1)
+        self.assertListEqual(self.seq.get_slew_activity_statistics(2), [])
+
+    @mock.patch("logging.Logger.info")
+    @mock.patch("lsst.sims.ocs.observatory.SlewTimeCache.write")
+    def test_slew_time_cache(self, mock_cache_write, mock_logger_info):
+        cache_file = "/path/to/slew_times.npz"
+        self.seq = Sequencer(ObservingSite(), Survey().idle_delay, slew_time_cache_file=cache_file)
+        self.assertIsNotNone(self.seq.observatory_model.slew_time_cache)
+        self.initialize_sequencer()
+        config_hash = self.seq.observatory_model.slew_time_cache.config_hash
+        self.assertNotEqual(config_hash, "")
+        self.seq.initialize(self.sal, Observatory(), fields=[(1, 3.5, 0.0, -30.0, 0.0, 0.0, 0.0, 0.0)])
+        self.assertNotEqual(self.seq.observatory_model.slew_time_cache.config_hash, config_hash)
+        self.seq.finalize()
+        mock_cache_write.assert_called_once_with(cache_file)
+        self.assertEqual(mock_logger_info.call_count, 4)
+
     @mock.patch("logging.Logger.log")
     @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetrySub")
     @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetryPub")
@@ -95,6 +135,35 @@ class SequencerTest(unittest.TestCase):
         self.assertEqual(len(slew), 5)
         self.assertEqual(len(exposures), 2)
 
+    @mock.patch("logging.Logger.log")
+    @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetrySub")
+    @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetryPub")
+    @mock.patch("lsst.sims.ocs.kernel.sequencer.SkyBrightnessCube", spec=True)
+    def test_observe_target_with_sky_cube(self, mock_sky_cube, mock_sal_telemetry_pub,
+                                          mock_sal_telemetry_sub, mock_logger_log):
+        mock_sky_cube.return_value.get_sky_brightness.return_value = {'i': [18.5]}
+        mock_sky_cube.return_value.get_target_information.return_value = {'airmass': [1.2],
+                                                                          'altitude': [0.6],
+                                                                          'azimuth': [0.4]}
+        mock_sky_cube.return_value.get_moon_sun_info.return_value = MOON_SUN_INFO
+        self.seq = Sequencer(ObservingSite(), Survey().idle_delay, sky_cube_file="sky_cube.dat")
+        self.assertIsNotNone(self.seq.sky_cube)
+        mock_sky_cube.return_value.initialize.assert_called_once_with("sky_cube.dat")
+        self.initialize_sequencer()
+        target, time_handler = self.create_objects()
+        self.set_values_for_sky_model()
+
+        observation, slew, exposures = self.seq.observe_target(target, time_handler)
+
+        self.assertEqual(observation.sky_brightness, 18.5)
+        self.assertEqual(observation.airmass, 1.2)
+        self.assertEqual(observation.moon_phase, 0.3)
+        self.assertFalse(self.mock_astro_sky.return_value.get_sky_brightness.called)
+        self.assertFalse(self.mock_astro_sky.return_value.update.called)
+        self.assertFalse(self.mock_astro_sky.return_value.get_target_information.called)
+        self.assertFalse(self.mock_astro_sky.return_value.get_moon_sun_info.called)
+        self.assertGreater(target.request_mjd, 0.0)
+
     @mock.patch("logging.Logger.log")
     @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetrySub")
     @mock.patch("SALPY_scheduler.SAL_scheduler.salTelemetryPub")
@@ -1,6 +1,7 @@
 from __future__ import division
 from builtins import range
 from datetime import datetime
+import numpy
 import unittest
 
 try:
@@ -12,7 +13,6 @@ from lsst.sims.ocs.configuration.sim_config import SimulationConfig
 from lsst.sims.ocs.kernel.simulator import Simulator
 import SALPY_scheduler
 
-from tests.database.topic_helpers import exposure_coll1, exposure_coll2, exposure_coll3, exposure_coll4
 from tests.database.topic_helpers import slew_activity_coll
 from tests.helpers import CONFIG_COMM_PUT_CALLS, NUM_GEN_PROPS, NUM_SEQ_PROPS
 from tests.helpers import MOON_SUN_INFO, SKY_BRIGHTNESS, SKY_BRIGHTNESS_PRE_HEADER, TARGET_INFO
@@ -39,11 +39,20 @@ class SimulatorTest(unittest.TestCase):
         import collections
 
         self.options = collections.namedtuple("options", ["frac_duration", "no_scheduler",
-                                                          "scheduler_version", "scheduler_timeout"])
+                                                          "scheduler_version", "scheduler_timeout",
+                                                          "sky_cube", "sky_prefetch",
+                                                          "slew_time_cache", "aggregate_slew_activities",
+                                                          "shared_environment", "environment_on_change"])
         self.options.frac_duration = 0.5
         self.options.no_scheduler = True
         self.options.scheduler_version = "v0.8"
         self.options.scheduler_timeout = 60.0
+        self.options.sky_cube = None
+        self.options.sky_prefetch = False
+        self.options.slew_time_cache = None
+        self.options.aggregate_slew_activities = False
+        self.options.shared_environment = False
+        self.options.environment_on_change = False
 
         self.configuration = SimulationConfig()
         self.configuration.load_proposals()
@@ -87,6 +96,7 @@ class SimulatorTest(unittest.TestCase):
     def test_finalization(self, mock_salmanager_final):
         self.sim.finalize()
         self.assertEqual(mock_salmanager_final.call_count, 1)
+        self.assertEqual(self.mock_socs_db.finalize.call_count, 1)
 
     def short_run(self, wait_for_sched):
         self.mock_salmanager_pub_topic.side_effect = self.topic_get
@@ -116,8 +126,9 @@ class SimulatorTest(unittest.TestCase):
             (self.starting_timestamp, self.starting_timestamp + 360.0)
         self.sim.seq.observatory_model.slew = mock.Mock(return_value=((6.0, "seconds")))
         self.sim.seq.observatory_model.calculate_visit_time = mock.Mock(return_value=((34.0, "seconds")))
-        self.sim.seq.observatory_model.target_exposure_list = [exposure_coll1, exposure_coll2]
-        self.sim.seq.observatory_model.observation_exposure_list = [exposure_coll3, exposure_coll4]
+        self.sim.seq.observatory_model.visit_exposure_rows = {"target_exposures": slice(0, 2),
+                                                              "observation_exposures": slice(0, 2)}
+        self.sim.seq.observatory_model.visit_exposure_times = numpy.array([15.0, 15.0])
         self.sim.seq.observatory_model.slew_activities_list = [slew_activity_coll]
         self.sim.dh.write_downtime_to_db = mock.Mock()
         self.sim.cloud_model.write_to_db = mock.Mock()
@@ -170,8 +181,8 @@ class SimulatorTest(unittest.TestCase):
         self.sim.sal.get_topic = mock.MagicMock(side_effect=filter_swap_side_effect)
 
         # TargetHistory, ObsHistory, SlewHistory, SlewActivity, SlewInitialState, SlewFinalState
-        # SlewMaxSpeeds, 2 * TargetExposures, 2 * ObsExposures, TargetProposalHistory, ObsProposalHistory
-        DATABASE_APPEND_DATA_CALLS = 13
+        # SlewMaxSpeeds, TargetProposalHistory, ObsProposalHistory
+        DATABASE_APPEND_DATA_CALLS = 9
 
         self.sim.run()
 
@@ -184,6 +195,8 @@ class SimulatorTest(unittest.TestCase):
         self.assertEqual(self.mock_socs_db.clear_data.call_count, self.num_nights)
         self.assertEqual(self.mock_socs_db.append_data.call_count,
                          self.num_visits * DATABASE_APPEND_DATA_CALLS)
+        # TargetExposures, ObsExposures
+        self.assertEqual(self.mock_socs_db.append_columns.call_count, 2 * self.num_nights)
         self.assertEqual(self.mock_socs_db.write.call_count, self.num_nights)
 
     @mock.patch("SALPY_scheduler.SAL_scheduler")
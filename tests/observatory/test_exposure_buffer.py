@@ -0,0 +1,48 @@
+import numpy
+import unittest
+
+from lsst.sims.ocs.observatory import ExposureBuffer
+
+class ExposureBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = ExposureBuffer([("exposureId", numpy.int64), ("exposureTime", numpy.float64),
+                                      ("ObsHistory_observationId", numpy.int64)], initial_size=2)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(len(self.buffer), 0)
+        self.assertListEqual(self.buffer.column_names, ["exposureId", "exposureTime",
+                                                        "ObsHistory_observationId"])
+
+    def test_append(self):
+        rows = self.buffer.append(exposureId=numpy.array([1, 2]), exposureTime=numpy.array([15.0, 15.0]),
+                                  ObsHistory_observationId=1)
+        self.assertEqual(rows, slice(0, 2))
+        rows = self.buffer.append(exposureId=numpy.array([3]), exposureTime=numpy.array([30.0]),
+                                  ObsHistory_observationId=2)
+        self.assertEqual(rows, slice(2, 3))
+        self.assertEqual(len(self.buffer), 3)
+        self.assertEqual(self.buffer.columns["exposureId"].size, 4)
+        columns = self.buffer.get_columns()
+        self.assertListEqual(columns["exposureId"].tolist(), [1, 2, 3])
+        self.assertListEqual(columns["exposureTime"].tolist(), [15.0, 15.0, 30.0])
+        self.assertListEqual(columns["ObsHistory_observationId"].tolist(), [1, 1, 2])
+        self.assertListEqual(self.buffer.get_columns(rows)["exposureId"].tolist(), [3])
+
+    def test_append_no_rows(self):
+        self.buffer.append(exposureId=numpy.array([], dtype=int), exposureTime=numpy.array([]),
+                           ObsHistory_observationId=1)
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_append_scalars_only(self):
+        rows = self.buffer.append(exposureId=1, exposureTime=15.0, ObsHistory_observationId=1)
+        self.assertEqual(rows, slice(0, 0))
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_clear(self):
+        self.buffer.append(exposureId=numpy.array([1]), exposureTime=numpy.array([15.0]),
+                           ObsHistory_observationId=1)
+        columns = self.buffer.get_columns()
+        self.buffer.clear()
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(columns["exposureId"][0], 1)
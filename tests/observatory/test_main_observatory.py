@@ -1,12 +1,17 @@
 import logging
 import math
+import numpy
 import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
-from SALPY_scheduler import scheduler_observationC
+from SALPY_scheduler import scheduler_observationC, scheduler_targetC
 
 from lsst.sims.ocs.configuration import Observatory, ObservingSite
 from lsst.sims.ocs.kernel import TimeHandler
-from lsst.sims.ocs.observatory import MainObservatory
+from lsst.sims.ocs.observatory import MainObservatory, StateSnapshot
 
 from tests.database import topic_helpers
 
@@ -38,8 +43,9 @@ class MainObservatoryTest(unittest.TestCase):
         self.assertFalse(self.observatory.model.park_state.tracking)
         self.assertEqual(len(self.observatory.model.current_state.mountedfilters), 5)
         self.assertEqual(self.observatory.exposures_made, 0)
-        self.assertIsNone(self.observatory.target_exposure_list)
-        self.assertIsNone(self.observatory.observation_exposure_list)
+        self.assertEqual(len(self.observatory.target_exposures), 0)
+        self.assertEqual(len(self.observatory.observation_exposures), 0)
+        self.assertIsNone(self.observatory.visit_exposure_rows)
         self.assertIsNone(self.observatory.slew_history)
         self.assertIsNone(self.observatory.slew_final_state)
         self.assertIsNone(self.observatory.slew_initial_state)
@@ -47,6 +53,8 @@ class MainObservatoryTest(unittest.TestCase):
         self.assertEqual(self.observatory.slew_activities_done, 0)
         self.assertIsNone(self.observatory.slew_maxspeeds)
         self.assertIsNone(self.observatory.variational_model)
+        self.assertIsNone(self.observatory.slew_time_cache)
+        self.assertIsNone(self.observatory.current_field_id)
 
     def test_information_after_configuration(self):
         self.observatory_configure()
@@ -91,8 +99,10 @@ class MainObservatoryTest(unittest.TestCase):
         self.assertIsNotNone(slew_info["slew_maxspeeds"])
         self.assertEqual(self.observatory.exposures_made, 2)
         self.assertEqual(len(exposures), 2)
-        self.assertEqual(len(exposures["target_exposures"]), 2)
-        self.assertEqual(len(exposures["observation_exposures"]), 2)
+        self.assertEqual(exposures["target_exposures"], slice(0, 2))
+        self.assertEqual(exposures["observation_exposures"], slice(0, 2))
+        self.assertEqual(len(self.observatory.target_exposures), 2)
+        self.assertEqual(len(self.observatory.observation_exposures), 2)
 
     def test_visit_time(self):
         self.observatory_configure()
@@ -101,6 +111,39 @@ class MainObservatoryTest(unittest.TestCase):
         time_handler = TimeHandler("1970-01-01")
         visit_time = self.observatory.calculate_visit_time(target, time_handler)
         self.assertEqual(visit_time[0], 34.0)
+        columns = self.observatory.observation_exposures.get_columns()
+        self.assertListEqual(columns["exposureId"].tolist(), [1, 2])
+        self.assertListEqual(columns["exposureNum"].tolist(), [1, 2])
+        self.assertListEqual(columns["exposureStartTime"].tolist(), [0.0, 18.0])
+        self.assertListEqual(columns["ObsHistory_observationId"].tolist(), [0, 0])
+        columns = self.observatory.target_exposures.get_columns()
+        self.assertListEqual(columns["TargetHistory_targetId"].tolist(), [target.targetId] * 2)
+
+    def test_visit_time_no_exposures(self):
+        self.observatory_configure()
+        target = topic_helpers.target
+        num_exposures = target.num_exposures
+        target.num_exposures = 0
+        try:
+            visit_time = self.observatory.calculate_visit_time(target, TimeHandler("1970-01-01"))
+        finally:
+            target.num_exposures = num_exposures
+        self.assertEqual(visit_time[0], 0.0)
+        self.assertEqual(self.observatory.exposures_made, 0)
+        self.assertEqual(len(self.observatory.target_exposures), 0)
+        self.assertEqual(len(self.observatory.observation_exposures), 0)
+        self.assertEqual(self.observatory.visit_exposure_rows["observation_exposures"], slice(0, 0))
+
+    def test_get_exposure_columns(self):
+        self.observatory_configure()
+        time_handler = TimeHandler("1970-01-01")
+        self.observatory.calculate_visit_time(topic_helpers.target, time_handler)
+        self.observatory.calculate_visit_time(topic_helpers.target, time_handler)
+        exposure_columns = self.observatory.get_exposure_columns()
+        self.assertEqual(exposure_columns["target_exposures"]["exposureId"].size, 4)
+        self.assertEqual(exposure_columns["observation_exposures"]["exposureId"].size, 4)
+        self.assertEqual(len(self.observatory.target_exposures), 0)
+        self.assertEqual(len(self.observatory.observation_exposures), 0)
 
     def test_get_slew_state(self):
         self.observatory_configure()
@@ -117,12 +160,52 @@ class MainObservatoryTest(unittest.TestCase):
         # No slew performed
         self.assertEquals(len(self.observatory.slew_activities_list), 0)
 
+    def test_get_slew_activities_aggregated(self):
+        self.observatory = MainObservatory(ObservingSite(), aggregate_slew_activities=True)
+        self.observatory_configure()
+        self.observatory.slew(topic_helpers.target)
+        self.assertEqual(len(self.observatory.slew_activities_list), 0)
+        self.assertEqual(self.observatory.slew_activities_done, 0)
+        statistics = self.observatory.slew_activity_aggregator.get_statistics(1)
+        self.assertEqual(len(statistics), 9)
+        self.assertEqual(statistics[0].numActivities, 1)
+
     def test_start_night(self):
         self.observatory_configure()
         self.observatory_variational_model_configure()
         self.assertAlmostEqual(math.degrees(self.observatory.model.params.telaz_maxspeed_rad), 3.5,
                                delta=1.0e-3)
 
+    def test_start_night_matches_full_configure(self):
+        self.observatory_configure()
+        self.observatory.variational_model.config.obs_var.tolerance = 0.0
+        self.observatory_variational_model_configure()
+
+        # Configure the whole model from the modified configuration, the way all nights used to.
+        observatory = MainObservatory(ObservingSite())
+        observatory.configure(Observatory())
+        obs_conf = observatory.config.toDict()
+        for sub_system in ("telescope", "dome"):
+            observatory.variational_model.change_speeds_and_accelerations(obs_conf[sub_system], 80.0,
+                                                                          2281 / 3650.0)
+        observatory.model.configure(obs_conf)
+
+        self.assertDictEqual(vars(self.observatory.model.params), vars(observatory.model.params))
+        target = topic_helpers.target
+        self.assertEqual(self.observatory.slew(target)[0], observatory.slew(target)[0])
+
+    @mock.patch("lsst.ts.observatory.model.ObservatoryModel.configure_dome")
+    @mock.patch("lsst.ts.observatory.model.ObservatoryModel.configure_telescope")
+    def test_start_night_below_tolerance(self, mock_configure_telescope, mock_configure_dome):
+        self.observatory_configure()
+        self.observatory.variational_model.config.obs_var.tolerance = 1.0
+        self.observatory_variational_model_configure()
+        self.assertEqual(mock_configure_telescope.call_count, 1)
+        self.assertEqual(mock_configure_dome.call_count, 1)
+        self.observatory.start_night(2282, 3650)
+        self.assertEqual(mock_configure_telescope.call_count, 1)
+        self.assertEqual(mock_configure_dome.call_count, 1)
+
     def test_slew_with_variational_model(self):
         self.observatory_configure()
         self.observatory_variational_model_configure()
@@ -130,6 +213,60 @@ class MainObservatoryTest(unittest.TestCase):
         slew_time = self.observatory.slew(target)
         self.assertAlmostEqual(slew_time[0], 89.91106077358576, delta=1.0e-3)
 
+    def test_evaluate_slews(self):
+        self.observatory_configure()
+        target = topic_helpers.target
+        self.observatory.slew(target)
+        initial_state = StateSnapshot(self.observatory.model.current_state)
+        last_critical_path = self.observatory.model.lastslew_criticalpath
+
+        ra = numpy.array([target.ra, 30.0, 10.0, 350.0])
+        dec = numpy.array([target.dec, -20.0, -45.0, -10.0])
+        angle = numpy.array([target.angle, 0.0, 45.0, 10.0])
+        filters = [target.filter, "r", "z", "g"]
+        slew_times, critical_paths = self.observatory.evaluate_slews(ra, dec, angle, filters)
+        self.assertEqual(slew_times.size, 4)
+        self.assertEqual(len(critical_paths), 4)
+
+        final_state = StateSnapshot(self.observatory.model.current_state)
+        for name in StateSnapshot.__slots__:
+            self.assertEqual(getattr(final_state, name), getattr(initial_state, name))
+        self.assertIs(self.observatory.model.lastslew_criticalpath, last_critical_path)
+
+        for i in range(ra.size):
+            observatory = MainObservatory(ObservingSite())
+            observatory.configure(Observatory())
+            observatory.slew(target)
+            candidate = scheduler_targetC()
+            candidate.fieldId = target.fieldId + i
+            candidate.ra, candidate.dec = ra[i], dec[i]
+            candidate.angle, candidate.filter = angle[i], filters[i]
+            slew_time = observatory.slew(candidate)
+            self.assertAlmostEqual(slew_times[i], slew_time[0], delta=1.0e-6)
+            self.assertListEqual(critical_paths[i], list(observatory.model.lastslew_criticalpath))
+
+    def test_evaluate_slews_bad_lengths(self):
+        self.observatory_configure()
+        with self.assertRaises(ValueError):
+            self.observatory.evaluate_slews([1.0, 2.0], [-3.0], [0.0, 0.0], ["r", "g"])
+
+    def test_slew_time_cache(self):
+        self.observatory = MainObservatory(ObservingSite(), slew_time_cache=True)
+        self.observatory_configure()
+        target = topic_helpers.target
+        self.assertIsNone(self.observatory.current_field_id)
+        self.assertIsNone(self.observatory.estimate_slew_time(target))
+        self.observatory.slew(target)
+        self.assertEqual(self.observatory.current_field_id, target.fieldId)
+        self.assertEqual(len(self.observatory.slew_time_cache), 0)
+        slew_time = self.observatory.slew(target)
+        self.assertEqual(len(self.observatory.slew_time_cache), 1)
+        self.assertEqual(self.observatory.estimate_slew_time(target), slew_time[0])
+        self.observatory.park()
+        self.assertIsNone(self.observatory.current_field_id)
+        self.observatory_variational_model_configure()
+        self.assertEqual(len(self.observatory.slew_time_cache), 0)
+
     def test_swap_filter(self):
         self.observatory_configure()
         current_mounted_filters = ['g', 'r', 'i', 'z', 'y']
@@ -0,0 +1,39 @@
+import unittest
+
+from lsst.sims.ocs.observatory import SlewActivityAggregator
+
+class SlewActivityAggregatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.aggregator = SlewActivityAggregator(bin_width=2.0, num_bins=5)
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.aggregator.bin_width, 2.0)
+        self.assertEqual(self.aggregator.num_bins, 5)
+        self.assertEqual(len(self.aggregator.statistics), 0)
+        self.assertEqual(self.aggregator.statistics_made, 0)
+
+    def test_add_and_get_statistics(self):
+        self.aggregator.add("telalt", 1.5, False)
+        self.aggregator.add("telalt", 3.0, True)
+        self.aggregator.add("telalt", 25.0, True)
+        self.aggregator.add("readout", 2.0, True)
+        statistics = self.aggregator.get_statistics(3)
+        self.assertEqual(len(statistics), 2)
+        self.assertEqual(statistics[0].activity, "readout")
+        self.assertEqual(statistics[1].slewActivityStatId, 2)
+        self.assertEqual(statistics[1].night, 3)
+        self.assertEqual(statistics[1].numActivities, 3)
+        self.assertEqual(statistics[1].numCriticalPath, 2)
+        self.assertEqual(statistics[1].totalDelay, 29.5)
+        self.assertEqual(statistics[1].maxDelay, 25.0)
+        self.assertEqual(statistics[1].histogramBinWidth, 2.0)
+        self.assertEqual(statistics[1].delayHistogram, "1,1,0,0,0,1")
+
+    def test_clear(self):
+        self.aggregator.add("telalt", 1.5, False)
+        self.aggregator.get_statistics(1)
+        self.aggregator.clear()
+        self.assertEqual(len(self.aggregator.get_statistics(2)), 0)
+        self.aggregator.add("telalt", 1.5, False)
+        self.assertEqual(self.aggregator.get_statistics(2)[0].slewActivityStatId, 2)
@@ -1,6 +1,7 @@
 import unittest
 
-from lsst.sims.ocs.observatory import SlewActivity, SlewHistory, SlewMaxSpeeds, SlewState
+from lsst.sims.ocs.observatory import SlewActivity, SlewActivityStatistics, SlewHistory, SlewMaxSpeeds
+from lsst.sims.ocs.observatory import SlewState
 
 class SlewInformationTest(unittest.TestCase):
 
@@ -44,6 +45,13 @@ class SlewInformationTest(unittest.TestCase):
         self.assertEqual(sa.inCriticalPath, "False")
         self.assertEqual(sa.SlewHistory_slewCount, 1)
 
+    def test_slew_activity_statistics_information(self):
+        sas = SlewActivityStatistics(1, 2, "telalt", 10, 4, 25.0, 5.5, 1.0, "1,2,3,2,1,1")
+        self.assertEqual(len(sas._fields), 9)
+        self.assertEqual(sas.night, 2)
+        self.assertEqual(sas.numActivities, 10)
+        self.assertEqual(sas.delayHistogram, "1,2,3,2,1,1")
+
     def test_slew_maxspeeds_information(self):
         sm = SlewMaxSpeeds(1, 1.0, 2.3, 0.5, 1.1, 0.1, 1)
         self.assertEqual(len(sm._fields), 7)
@@ -0,0 +1,58 @@
+import logging
+import numpy
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from lsst.sims.ocs.configuration import Observatory, ObservingSite
+from lsst.sims.ocs.observatory import SlewReplay
+
+class SlewReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.getLogger().setLevel(logging.WARN)
+        self.replay = SlewReplay(ObservingSite(), Observatory())
+        self.visits = {"observationId": numpy.array([1, 2, 3, 4]),
+                       "night": numpy.array([1, 1, 2, 2]),
+                       "fieldId": numpy.array([300, 301, 300, 302]),
+                       "slew_start": numpy.array([1664580000.0, 1664580100.0, 1664666400.0, 1664666500.0]),
+                       "ra": numpy.array([1.0, 5.0, 1.0, 10.0]),
+                       "dec": numpy.array([-3.0, -10.0, -3.0, -20.0]),
+                       "angle": numpy.array([0.5, 0.0, 0.5, 0.0]),
+                       "filter": numpy.array(["z", "r", "z", "u"])}
+
+    def test_basic_information_after_creation(self):
+        self.assertIsNotNone(self.replay.observatory)
+        self.assertIsNotNone(self.replay.obs_config)
+
+    def test_mount_filters(self):
+        self.replay.mount_filters(["g", "u", "z"])
+        current_state = self.replay.observatory.model.current_state
+        self.assertIn("u", current_state.mountedfilters)
+        self.assertIn("z", current_state.mountedfilters)
+        self.assertListEqual(current_state.unmountedfilters, ["y"])
+
+    def test_replay_night(self):
+        night_visits = {key: value[:2] for key, value in self.visits.items()}
+        slew_times = self.replay.replay_night(night_visits)
+        self.assertEqual(slew_times.size, 2)
+        self.assertTrue((slew_times > 0).all())
+        self.assertListEqual(list(self.replay.replay_night(night_visits)), list(slew_times))
+
+    @mock.patch("lsst.sims.ocs.observatory.SlewReplay.replay_night")
+    def test_replay_splits_nights(self, mock_replay_night):
+        mock_replay_night.side_effect = lambda visits: numpy.ones(len(visits["observationId"]))
+        slew_times = self.replay.replay(self.visits)
+        self.assertEqual(mock_replay_night.call_count, 2)
+        self.assertListEqual(list(mock_replay_night.call_args_list[1][0][0]["observationId"]), [3, 4])
+        self.assertEqual(slew_times.size, 4)
+
+    def test_summarize(self):
+        summary = SlewReplay.summarize(numpy.array([10.0, 20.0]), numpy.array([12.0, 23.0]))
+        self.assertEqual(summary["num_visits"], 2)
+        self.assertEqual(summary["original_total_slew_time"], 30.0)
+        self.assertEqual(summary["total_slew_time"], 35.0)
+        self.assertEqual(summary["max_slew_time_increase"], 3.0)
+        self.assertAlmostEqual(summary["total_slew_time_change_percent"], 16.6667, delta=1.0e-4)
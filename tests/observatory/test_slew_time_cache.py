@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lsst.sims.ocs.observatory import SlewTimeCache
+
+class SlewTimeCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SlewTimeCache()
+
+    def test_basic_information_after_creation(self):
+        self.assertEqual(self.cache.rotator_bucket, 10.0)
+        self.assertEqual(self.cache.lst_bucket, 15.0)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_make_key(self):
+        key = self.cache.make_key(10, 20, 0, -35.0, 375.0)
+        self.assertEqual(key, (10, 20, False, -4, 1))
+
+    def test_add_and_get(self):
+        self.assertIsNone(self.cache.get_slew_time(10, 20, False, 5.0, 30.0))
+        self.assertEqual(self.cache.misses, 1)
+        self.cache.add(10, 20, False, 5.0, 30.0, 4.0)
+        self.cache.add(10, 20, False, 6.0, 31.0, 6.0)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get_slew_time(10, 20, False, 9.0, 44.0), 5.0)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertIsNone(self.cache.get_slew_time(10, 20, True, 5.0, 30.0))
+        self.assertIsNone(self.cache.get_slew_time(20, 10, False, 5.0, 30.0))
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_clear(self):
+        self.cache.add(10, 20, False, 5.0, 30.0, 4.0)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_write_and_read(self):
+        save_dir = tempfile.mkdtemp()
+        cache_file = os.path.join(save_dir, "slew_times.npz")
+        self.cache.add(10, 20, False, 5.0, 30.0, 4.0)
+        self.cache.add(10, 20, False, 5.0, 30.0, 6.0)
+        self.cache.add(20, 30, True, -85.0, 200.0, 120.0)
+        self.cache.write(cache_file)
+
+        cache = SlewTimeCache(rotator_bucket=1.0, lst_bucket=1.0)
+        cache.read(cache_file)
+        self.assertEqual(cache.rotator_bucket, 10.0)
+        self.assertEqual(cache.lst_bucket, 15.0)
+        self.assertDictEqual(cache.slew_times, self.cache.slew_times)
+        self.assertEqual(cache.get_slew_time(10, 20, False, 5.0, 30.0), 5.0)
+        self.assertEqual(cache.get_slew_time(20, 30, True, -85.0, 200.0), 120.0)
+        shutil.rmtree(save_dir)
+
+    def test_write_keeps_file_name(self):
+        save_dir = tempfile.mkdtemp()
+        cache_file = os.path.join(save_dir, "slew_times.cache")
+        self.cache.add(10, 20, False, 5.0, 30.0, 4.0)
+        self.cache.write(cache_file)
+        self.assertListEqual(os.listdir(save_dir), ["slew_times.cache"])
+
+        cache = SlewTimeCache()
+        cache.read(cache_file)
+        self.assertDictEqual(cache.slew_times, self.cache.slew_times)
+        shutil.rmtree(save_dir)
+
+    def test_set_config_hash(self):
+        fields = [(1, 3.5, 0.0, -30.0, 0.0, 0.0, 0.0, 0.0), (2, 3.5, 10.0, -30.0, 0.0, 0.0, 0.0, 0.0)]
+        self.cache.set_config_hash({"park": {"telescope_altitude": 86.5}}, fields)
+        config_hash = self.cache.config_hash
+        self.cache.set_config_hash({"park": {"telescope_altitude": 86.5}}, reversed(fields))
+        self.assertEqual(self.cache.config_hash, config_hash)
+        self.cache.set_config_hash({"park": {"telescope_altitude": 80.0}}, fields)
+        self.assertNotEqual(self.cache.config_hash, config_hash)
+        self.cache.set_config_hash({"park": {"telescope_altitude": 86.5}}, fields[:1])
+        self.assertNotEqual(self.cache.config_hash, config_hash)
+
+    def test_read_with_different_configuration(self):
+        save_dir = tempfile.mkdtemp()
+        cache_file = os.path.join(save_dir, "slew_times.npz")
+        fields = [(1, 3.5, 0.0, -30.0, 0.0, 0.0, 0.0, 0.0)]
+        self.cache.set_config_hash({"slew": {"tel_optics_ol_slope": 1.0 / 3.5}}, fields)
+        self.cache.add(10, 20, False, 5.0, 30.0, 4.0)
+        self.cache.write(cache_file)
+
+        cache = SlewTimeCache()
+        cache.set_config_hash({"slew": {"tel_optics_ol_slope": 1.0 / 3.5}}, fields)
+        self.assertTrue(cache.read(cache_file))
+        self.assertEqual(len(cache), 1)
+
+        cache = SlewTimeCache()
+        cache.add(20, 30, True, -85.0, 200.0, 120.0)
+        cache.set_config_hash({"slew": {"tel_optics_ol_slope": 1.0 / 4.0}}, fields)
+        self.assertFalse(cache.read(cache_file))
+        self.assertEqual(len(cache), 0)
+
+        cache = SlewTimeCache()
+        self.assertFalse(cache.read(cache_file))
+        self.assertEqual(len(cache), 0)
+        shutil.rmtree(save_dir)
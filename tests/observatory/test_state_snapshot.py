@@ -0,0 +1,39 @@
+import copy
+import logging
+import unittest
+
+from lsst.sims.ocs.configuration import Observatory, ObservingSite
+from lsst.sims.ocs.observatory import MainObservatory, StateSnapshot
+
+from tests.database import topic_helpers
+
+class StateSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.getLogger().setLevel(logging.WARN)
+        self.observatory = MainObservatory(ObservingSite())
+        self.observatory.configure(Observatory())
+
+    def test_snapshot_matches_deepcopy(self):
+        self.observatory.slew(topic_helpers.target)
+        current_state = self.observatory.model.current_state
+        snapshot = StateSnapshot(current_state)
+        state_copy = copy.deepcopy(current_state)
+        for name in StateSnapshot.__slots__:
+            self.assertEqual(getattr(snapshot, name), getattr(state_copy, name))
+
+    def test_snapshot_is_independent(self):
+        snapshot = StateSnapshot(self.observatory.model.current_state)
+        telalt = snapshot.telalt
+        self.observatory.slew(topic_helpers.target)
+        self.assertEqual(snapshot.telalt, telalt)
+        self.assertNotEqual(self.observatory.model.current_state.telalt, telalt)
+
+    def test_snapshot_has_no_dict(self):
+        snapshot = StateSnapshot(self.observatory.model.current_state)
+        with self.assertRaises(AttributeError):
+            snapshot.extra = 1.0
+
+    def test_string_representation(self):
+        snapshot = StateSnapshot(self.observatory.model.current_state)
+        self.assertIn("filter=z", str(snapshot))
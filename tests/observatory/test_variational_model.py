@@ -19,11 +19,26 @@ class VariationalModelTest(unittest.TestCase):
         self.assertIsNotNone(self.var.config)
         self.assertFalse(self.var.active)
 
-    def test_modify_parameters(self):
+    def test_update_parameters(self):
         self.set_change_config()
-        mod_dict = self.var.modify_parameters(2281, 3650)
+        self.var.config.obs_var.dome_change = 0.0
+        mod_dict = self.var.update_parameters(2281, 3650)
+        self.assertListEqual(list(mod_dict.keys()), ["telescope"])
         self.assertAlmostEqual(mod_dict["telescope"]["azimuth_maxspeed"], 3.5, delta=self.tolerance)
-        self.assertAlmostEqual(mod_dict["dome"]["altitude_maxspeed"], 0.875, delta=self.tolerance)
+        self.assertEqual(mod_dict["telescope"]["altitude_minpos"], 20.0)
+        self.assertEqual(self.var.config.telescope.azimuth_maxspeed, 7.0)
+        self.assertAlmostEqual(self.var.current_scales["telescope"], 0.5, delta=self.tolerance)
+        self.assertEqual(self.var.current_scales["dome"], 1.0)
+        self.assertDictEqual(self.var.update_parameters(2281, 3650), {})
+
+    def test_update_parameters_with_tolerance(self):
+        self.set_change_config()
+        self.var.config.obs_var.tolerance = 0.5
+        self.assertDictEqual(self.var.update_parameters(1, 3650), {})
+        mod_dict = self.var.update_parameters(30, 3650)
+        self.assertEqual(len(mod_dict), 2)
+        self.assertDictEqual(self.var.update_parameters(31, 3650), {})
+        self.assertEqual(len(self.var.update_parameters(60, 3650)), 2)
 
     def test_change_speeds_and_accelerations(self):
         self.set_change_config()
@@ -28,8 +28,19 @@ class ArgParserTest(unittest.TestCase):
         self.assertIsNone(args.sqlite_save_dir)
         self.assertIsNone(args.sqlite_session_save_dir)
         self.assertIsNone(args.session_id_start)
+        self.assertFalse(args.sqlite_columnar)
+        self.assertIsNone(args.sqlite_bulk_load)
+        self.assertFalse(args.sqlite_async)
+        self.assertFalse(args.sqlite_columnar_output)
+        self.assertFalse(args.sqlite_defer_indexes)
         self.assertFalse(args.profile)
         self.assertIsNone(args.scheduler_timeout)
+        self.assertIsNone(args.sky_cube)
+        self.assertFalse(args.sky_prefetch)
+        self.assertIsNone(args.slew_time_cache)
+        self.assertFalse(args.aggregate_slew_activities)
+        self.assertFalse(args.shared_environment)
+        self.assertFalse(args.environment_on_change)
 
     def test_fractional_duration_flag(self):
         args = self.parser.parse_args(["--frac-duration", "0.0027397260273972603"])
@@ -88,6 +99,26 @@ class ArgParserTest(unittest.TestCase):
         args = self.parser.parse_args(["-s", "1100"])
         self.assertEqual(args.session_id_start, "1100")
 
+    def test_sqlite_columnar(self):
+        args = self.parser.parse_args(["--columnar-buffers"])
+        self.assertTrue(args.sqlite_columnar)
+
+    def test_sqlite_bulk_load(self):
+        args = self.parser.parse_args(["--bulk-load", "wal"])
+        self.assertEqual(args.sqlite_bulk_load, "wal")
+
+    def test_sqlite_async(self):
+        args = self.parser.parse_args(["--async-writes"])
+        self.assertTrue(args.sqlite_async)
+
+    def test_sqlite_columnar_output(self):
+        args = self.parser.parse_args(["--columnar-output"])
+        self.assertTrue(args.sqlite_columnar_output)
+
+    def test_sqlite_defer_indexes(self):
+        args = self.parser.parse_args(["--defer-indexes"])
+        self.assertTrue(args.sqlite_defer_indexes)
+
     def test_profile(self):
         args = self.parser.parse_args(["--profile"])
         self.assertTrue(args.profile)
@@ -101,3 +132,29 @@ class ArgParserTest(unittest.TestCase):
         timeout = "180.0"
         args = self.parser.parse_args(["--scheduler-timeout", timeout])
         self.assertEqual(args.scheduler_timeout, timeout)
+
+    def test_sky_cube(self):
+        cube_file = "/path/to/sky_cube.dat"
+        args = self.parser.parse_args(["--sky-cube", cube_file])
+        self.assertEqual(args.sky_cube, cube_file)
+
+    def test_sky_prefetch(self):
+        args = self.parser.parse_args(["--sky-prefetch"])
+        self.assertTrue(args.sky_prefetch)
+
+    def test_slew_time_cache(self):
+        cache_file = "/path/to/slew_times.npz"
+        args = self.parser.parse_args(["--slew-time-cache", cache_file])
+        self.assertEqual(args.slew_time_cache, cache_file)
+
+    def test_aggregate_slew_activities(self):
+        args = self.parser.parse_args(["--aggregate-slew-activities"])
+        self.assertTrue(args.aggregate_slew_activities)
+
+    def test_shared_environment(self):
+        args = self.parser.parse_args(["--shared-environment"])
+        self.assertTrue(args.shared_environment)
+
+    def test_environment_on_change(self):
+        args = self.parser.parse_args(["--environment-on-change"])
+        self.assertTrue(args.environment_on_change)